@@ -20,9 +20,16 @@ from src.models import (
     UserProfile,
     Exercise,
     WorkoutPlan,
+    WeeklyPlan,
+    WorkoutTemplate,
+    PlanDictionary,
     WorkoutLog,
     NutritionPlan,
     ChatSession,
+    ChatSummary,
+    LLMUsageRecord,
+    BodyWeightEntry,
+    WeightTrend,
 )
 
 # this is the Alembic Config object, which provides
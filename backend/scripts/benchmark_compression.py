@@ -0,0 +1,114 @@
+"""
+Benchmark Script - Response compression ratio and CPU per encoding level
+Used to choose COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_QUALITY / COMPRESSION_ZSTD_LEVEL
+
+Usage:
+    python scripts/benchmark_compression.py [--iterations N]
+"""
+import argparse
+import gzip
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.seed_exercises import EXERCISES_DATA
+from src.core.encoding import encode_json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark response compression levels")
+    parser.add_argument("--iterations", type=int, default=2000, help="Compressions timed per level")
+    return parser.parse_args()
+
+
+def sample_payloads() -> dict:
+    """Plan detail and a full (30-item) history list, encoded as the API sends them"""
+    blocks = [
+        {
+            "musculo": data["muscle_groups"][0],
+            "ejercicio": data["name"],
+            "series": 4,
+            "repeticiones": "8-12",
+            "rpe_objetivo": 7,
+            "descanso_segundos": 90,
+            "notas_seguridad": data["safety_notes"],
+        }
+        for data in EXERCISES_DATA[:8]
+    ]
+    now = datetime.utcnow()
+    detail = {
+        "id": 1,
+        "user_id": 1,
+        "workout_plan": blocks,
+        "fatiga_score_usado": 55,
+        "ajuste_aplicado": None,
+        "disclaimer_medico": "Consulta a un profesional de la salud antes de comenzar cualquier programa.",
+        "created_at": now,
+    }
+    history = [
+        {
+            "id": index,
+            "created_at": now - timedelta(days=index),
+            "fatigue_score_used": 40 + index % 50,
+            "exercise_count": 8,
+        }
+        for index in range(30)
+    ]
+    return {"detail": encode_json(detail), "history": encode_json(history)}
+
+
+def codecs() -> dict:
+    """(name, level) -> compress function for every available encoding"""
+    available = {
+        ("gzip", level): (lambda body, lv=level: gzip.compress(body, compresslevel=lv, mtime=0))
+        for level in (1, 3, 5, 6, 9)
+    }
+    if brotli is not None:
+        for quality in (1, 4, 5, 6, 11):
+            available[("br", quality)] = lambda body, q=quality: brotli.compress(body, quality=q)
+    if zstandard is not None:
+        for level in (1, 3, 6, 12):
+            available[("zstd", level)] = zstandard.ZstdCompressor(level=level).compress
+    return available
+
+
+def main():
+    """Main benchmark function"""
+    args = parse_args()
+    payloads = sample_payloads()
+
+    if brotli is None:
+        print("⚠️  brotli not installed, skipping br")
+    if zstandard is None:
+        print("⚠️  zstandard not installed, skipping zstd")
+
+    for name, body in payloads.items():
+        print(f"\n📦 {name}: {len(body)} bytes")
+        for (encoding, level), compress in codecs().items():
+            compressed = compress(body)
+            start = time.process_time()
+            for _ in range(args.iterations):
+                compress(body)
+            elapsed = (time.process_time() - start) / args.iterations * 1e6
+            print(
+                f"   {encoding:<5} {level:>2}  {len(compressed):>6} B  "
+                f"x{len(body) / len(compressed):>5.2f}  {elapsed:>7.1f} µs"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark Script - Compare JSON vs compressed plan storage
+Copies a sample of stored plans into scratch tables and measures size, write and read latency
+
+Usage:
+    python scripts/benchmark_plan_storage.py [--rows N] [--batch-size N]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import Column, Integer, JSON, MetaData, Table, func, insert, select
+
+from src.core.compressed_json import CompressedJSON, compression_dictionaries
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal, engine
+from src.models.workout_plan import WorkoutPlan
+from src.services.plan_codec import plan_exercise_count
+from src.services.plan_compression_service import PlanCompressionService, train_dictionary
+
+# Scratch dictionary id, never persisted
+BENCHMARK_DICTIONARY_ID = 0xFFFE
+
+metadata = MetaData()
+VARIANTS = {
+    "json": Table(
+        "bench_plans_json", metadata,
+        Column("id", Integer, primary_key=True), Column("plan_data", JSON, nullable=False),
+    ),
+    "zlib": Table(
+        "bench_plans_zlib", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("plan_data", CompressedJSON(count_key="blocks"), nullable=False),
+    ),
+    "zlib+dict": Table(
+        "bench_plans_zlib_dict", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("plan_data", CompressedJSON(count_key="blocks"), nullable=False),
+    ),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark plan storage formats")
+    parser.add_argument("--rows", type=int, default=5000, help="Rows written per variant")
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows per INSERT")
+    return parser.parse_args()
+
+
+async def load_samples(limit: int):
+    async with AsyncSessionLocal() as db:
+        if settings.PLAN_STORAGE_COMPRESSED:
+            await PlanCompressionService.load_dictionaries(db)
+        result = await db.execute(
+            select(WorkoutPlan.plan_data).order_by(WorkoutPlan.id.desc()).limit(limit)
+        )
+        return [dict(plan_data) for plan_data in result.scalars().all()]
+
+
+async def run_variant(name: str, table: Table, rows: list, batch_size: int) -> dict:
+    # Dictionary only applies to the "+dict" variant
+    saved_current = compression_dictionaries.current_id
+    compression_dictionaries.current_id = BENCHMARK_DICTIONARY_ID if name == "zlib+dict" else 0
+
+    try:
+        start = time.perf_counter()
+        async with engine.begin() as conn:
+            for offset in range(0, len(rows), batch_size):
+                await conn.execute(insert(table), rows[offset:offset + batch_size])
+        write_seconds = time.perf_counter() - start
+
+        async with engine.connect() as conn:
+            start = time.perf_counter()
+            result = await conn.execute(select(table.c.plan_data))
+            counts = [plan_exercise_count(plan_data) for plan_data in result.scalars().all()]
+            count_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = await conn.execute(select(table.c.plan_data))
+            blocks = sum(len(plan_data["blocks"]) for plan_data in result.scalars().all())
+            read_seconds = time.perf_counter() - start
+
+            size = await conn.scalar(select(func.pg_total_relation_size(table.name)))
+    finally:
+        compression_dictionaries.current_id = saved_current
+
+    assert sum(counts) == blocks
+    return {
+        "size_kb": size / 1024,
+        "write_us": write_seconds / len(rows) * 1e6,
+        "read_count_us": count_seconds / len(rows) * 1e6,
+        "read_full_us": read_seconds / len(rows) * 1e6,
+    }
+
+
+async def main():
+    """Main benchmark function"""
+    args = parse_args()
+
+    samples = [sample for sample in await load_samples(args.rows) if "blocks" in sample]
+    if not samples:
+        print("❌ No compact plans found. Generate plans or run scripts/migrate_plan_storage.py first.")
+        return
+
+    # Train on one half, benchmark the other half (repeated up to --rows)
+    training, holdout = samples[::2], samples[1::2] or samples
+    compression_dictionaries.register(
+        BENCHMARK_DICTIONARY_ID, train_dictionary(training, settings.PLAN_DICTIONARY_SIZE)
+    )
+    rows = [{"id": i + 1, "plan_data": holdout[i % len(holdout)]} for i in range(args.rows)]
+
+    print(f"⏱️  Benchmarking {len(rows)} rows ({len(samples)} distinct plans sampled)...")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+
+    try:
+        results = {}
+        for name, table in VARIANTS.items():
+            results[name] = await run_variant(name, table, rows, args.batch_size)
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.drop_all)
+
+    print(f"{'variant':<10} {'size KB':>10} {'write µs':>10} {'count µs':>10} {'read µs':>10}")
+    for name, r in results.items():
+        print(
+            f"{name:<10} {r['size_kb']:>10.0f} {r['write_us']:>10.1f} "
+            f"{r['read_count_us']:>10.1f} {r['read_full_us']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
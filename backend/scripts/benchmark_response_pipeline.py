@@ -0,0 +1,111 @@
+"""
+Benchmark Script - Per-request CPU of the workout/profile response pipelines
+Compares model rebuild + response_model validation + jsonable encoding against
+encoding pre-validated content directly
+
+Usage:
+    python scripts/benchmark_response_pipeline.py [--iterations N]
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from scripts.seed_exercises import EXERCISES_DATA
+from src.core.encoding import encode_json
+from src.models.exercise import Exercise
+from src.schemas.workout import WorkoutPlanResponse, WorkoutPlanDetail
+from src.services.exercise_catalog import exercise_catalog
+from src.services.plan_codec import compact_plan_data, expand_plan_data
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark response encoding pipelines")
+    parser.add_argument("--iterations", type=int, default=5000, help="Requests simulated per case")
+    return parser.parse_args()
+
+
+def sample_plan() -> WorkoutPlanResponse:
+    """Eight-block plan using catalog exercises, as the LLM would return it"""
+    blocks = [
+        {
+            "musculo": data["muscle_groups"][0],
+            "ejercicio": data["name"],
+            "series": 4,
+            "repeticiones": "8-12",
+            "rpe_objetivo": 7,
+            "descanso_segundos": 90,
+            "notas_seguridad": data["safety_notes"],
+        }
+        for data in EXERCISES_DATA[:8]
+    ]
+    return WorkoutPlanResponse(workout_plan=blocks, fatiga_score_usado=55, ajuste_aplicado=None)
+
+
+ADAPTERS = {
+    WorkoutPlanResponse: TypeAdapter(WorkoutPlanResponse),
+    WorkoutPlanDetail: TypeAdapter(WorkoutPlanDetail),
+}
+
+
+def fastapi_response_model(model_type, content) -> bytes:
+    """What FastAPI does for a `response_model` route returning `content`"""
+    if hasattr(content, "model_dump"):
+        content = content.model_dump()
+    adapter = ADAPTERS[model_type]
+    validated = adapter.validate_python(content)
+    return json.dumps(
+        jsonable_encoder(adapter.dump_python(validated, mode="json")),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def cpu_per_call(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main():
+    """Main benchmark function"""
+    args = parse_args()
+
+    exercise_catalog.replace(
+        [Exercise(id=index, **data) for index, data in enumerate(EXERCISES_DATA, start=1)]
+    )
+    plan = sample_plan()
+    stored = compact_plan_data(plan)
+    created_at = datetime.utcnow()
+
+    cases = {
+        "generate (before)": lambda: fastapi_response_model(
+            WorkoutPlanResponse, WorkoutPlanResponse(**expand_plan_data(stored))
+        ),
+        "generate (after)": lambda: encode_json(expand_plan_data(stored)),
+        "detail (before)": lambda: fastapi_response_model(
+            WorkoutPlanDetail,
+            WorkoutPlanDetail(id=1, user_id=1, created_at=created_at, **expand_plan_data(stored)),
+        ),
+        "detail (after)": lambda: encode_json(
+            {"id": 1, "user_id": 1, **expand_plan_data(stored), "created_at": created_at}
+        ),
+    }
+
+    print(f"⏱️  CPU per request over {args.iterations} iterations")
+    for name, fn in cases.items():
+        fn()  # Warm-up
+        print(f"   {name:<20} {cpu_per_call(fn, args.iterations):>8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
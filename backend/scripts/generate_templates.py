@@ -0,0 +1,59 @@
+"""
+Template Script - Pre-generate workout plan templates per profile bucket
+Run off-peak (e.g. weekly) so most /workouts/generate requests skip the LLM
+(served only with WORKOUT_TEMPLATES_ENABLED=true)
+
+Usage:
+    python scripts/generate_templates.py [--min-profiles N] [--limit N] [--concurrency N] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.database import AsyncSessionLocal
+from src.services.template_service import TemplateService, BAND_REFERENCE_SCORES
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pre-generate workout plan templates")
+    parser.add_argument(
+        "--min-profiles", type=int, default=1, help="Skip buckets with fewer profiles"
+    )
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Only the N most populated buckets"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Maximum concurrent LLM generations"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report the buckets that would be generated"
+    )
+    return parser.parse_args()
+
+
+async def main():
+    """Main template generation function"""
+    args = parse_args()
+
+    if args.dry_run:
+        async with AsyncSessionLocal() as db:
+            buckets = await TemplateService.enumerate_buckets(db, args.min_profiles, args.limit)
+        for bucket, profiles in buckets:
+            print(f"📦 {bucket.key('*')} ({len(profiles)} profiles)")
+        print(f"📋 {len(buckets)} buckets x {len(BAND_REFERENCE_SCORES)} fatigue bands")
+        return
+
+    print("🧩 Generating workout templates...")
+    stats = await TemplateService.generate_templates(
+        min_profiles=args.min_profiles, limit=args.limit, concurrency=args.concurrency
+    )
+    print(f"📋 {stats['buckets']} buckets")
+    print(f"✅ Generated {stats['generated']} templates ({stats['failed']} failed)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,313 @@
+"""
+Load Test Script - End-to-end user journeys against a running or freshly booted API
+
+Each virtual user runs: register -> login -> create profile -> generate -> history -> view plan.
+By default the script creates the tables, seeds exercises and boots uvicorn with the
+fake LLM (LLM_MODE=fake) and auth rate limits disabled, then reports throughput and
+p50/p95/p99 latency per endpoint as JSON.
+
+Usage:
+    python scripts/load_test.py [--users N] [--concurrency N] [--workers N]
+        [--database-url URL] [--url http://host:port] [--llm-latency SECONDS]
+        [--output results.json] [--baseline baseline.json] [--threshold 0.15]
+
+    --database-url accepts PostgreSQL (postgresql+asyncpg://...) or SQLite
+    (sqlite+aiosqlite:///./loadtest.db, requires aiosqlite)
+    --url targets an already running server instead of booting one
+    --baseline exits with status 1 if p95 latency or throughput regressed beyond --threshold
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+STEPS = ["register", "login", "create_profile", "generate", "history", "view_plan"]
+
+PROFILE = {
+    "age": 30,
+    "weight_kg": 78.5,
+    "height_cm": 178,
+    "objective": "hypertrophy",
+    "experience_level": "intermediate",
+    "training_days_per_week": 4,
+    "equipment_available": ["barra", "mancuernas", "máquinas"],
+    "injury_history": [],
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run end-to-end load test journeys")
+    parser.add_argument("--users", type=int, default=100, help="Journeys to run (one new user each)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Journeys running at the same time")
+    parser.add_argument("--workers", type=int, default=1, help="Uvicorn workers when booting the server")
+    parser.add_argument("--port", type=int, default=8765, help="Port when booting the server")
+    parser.add_argument(
+        "--database-url", default=os.environ.get("DATABASE_URL"), help="Database to boot against"
+    )
+    parser.add_argument("--url", default=None, help="Target an already running server")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Fake LLM latency in seconds")
+    parser.add_argument("--output", type=Path, default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=None, help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative regression")
+    return parser.parse_args()
+
+
+# ----------------------------------------------------------------------
+# Server lifecycle
+# ----------------------------------------------------------------------
+
+
+def server_env(args) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "DATABASE_URL": args.database_url,
+            "ANTHROPIC_API_KEY": env.get("ANTHROPIC_API_KEY", "load-test"),
+            "JWT_SECRET_KEY": env.get("JWT_SECRET_KEY", "load-test-secret"),
+            "LLM_MODE": "fake",
+            "LLM_FAKE_LATENCY_SECONDS": str(args.llm_latency),
+            "LLM_DAILY_GENERATION_LIMIT": "1000000",
+            "LLM_DAILY_TOKEN_LIMIT": "1000000000",
+            "RATE_LIMIT_ENABLED": "false",
+            "DEBUG": "false",
+        }
+    )
+    return env
+
+
+def boot_server(args) -> subprocess.Popen:
+    """Create tables, seed exercises and start uvicorn"""
+    env = server_env(args)
+    subprocess.run(
+        [sys.executable, "scripts/seed_exercises.py"], cwd=BACKEND_DIR, env=env, check=True
+    )
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.main:app",
+            f"--port={args.port}",
+            f"--workers={args.workers}",
+            "--log-level=warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+# ----------------------------------------------------------------------
+# Journeys
+# ----------------------------------------------------------------------
+
+
+class Recorder:
+    """Latencies and errors per step"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {step: [] for step in STEPS}
+        self.errors: Dict[str, int] = {step: 0 for step in STEPS}
+        self.journeys_completed = 0
+        self.journeys_failed = 0
+
+    async def call(self, step: str, request) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[step] += 1
+            return None
+        self.latencies[step].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[step] += 1
+            return None
+        return response
+
+
+async def journey(client: httpx.AsyncClient, recorder: Recorder, run_id: str, index: int) -> bool:
+    """One new user: register, login, create profile, generate, history, view plan"""
+    credentials = {"email": f"load-{run_id}-{index}@example.com", "password": "LoadTest123!"}
+
+    if await recorder.call("register", client.post("/api/v1/auth/register", json=credentials)) is None:
+        return False
+    response = await recorder.call("login", client.post("/api/v1/auth/login", json=credentials))
+    if response is None:
+        return False
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await recorder.call(
+        "create_profile", client.post("/api/v1/profile/create", json=PROFILE, headers=headers)
+    )
+    if response is None:
+        return False
+    response = await recorder.call(
+        "generate",
+        client.post("/api/v1/workouts/generate", json={"fatigue_score": 50}, headers=headers),
+    )
+    if response is None:
+        return False
+    response = await recorder.call("history", client.get("/api/v1/workouts/history", headers=headers))
+    if response is None or not response.json():
+        return False
+
+    plan_id = response.json()[0]["id"]
+    response = await recorder.call("view_plan", client.get(f"/api/v1/workouts/{plan_id}", headers=headers))
+    return response is not None
+
+
+async def run_load(base_url: str, users: int, concurrency: int) -> dict:
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as client:
+
+        async def _run(index: int):
+            async with semaphore:
+                if await journey(client, recorder, run_id, index):
+                    recorder.journeys_completed += 1
+                else:
+                    recorder.journeys_failed += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_run(index) for index in range(users)))
+        elapsed = time.perf_counter() - started
+
+    return build_report(recorder, elapsed, users, concurrency)
+
+
+# ----------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def build_report(recorder: Recorder, elapsed: float, users: int, concurrency: int) -> dict:
+    endpoints = {}
+    for step in STEPS:
+        values = sorted(recorder.latencies[step])
+        endpoints[step] = {
+            "count": len(values),
+            "errors": recorder.errors[step],
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+        }
+    return {
+        "config": {"users": users, "concurrency": concurrency},
+        "duration_seconds": round(elapsed, 3),
+        "journeys": {
+            "completed": recorder.journeys_completed,
+            "failed": recorder.journeys_failed,
+            "per_second": round(recorder.journeys_completed / elapsed, 3),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> List[str]:
+    """Regressions of p95 latency or throughput beyond the threshold"""
+    regressions = []
+    for step, base in baseline["endpoints"].items():
+        current = report["endpoints"].get(step)
+        if not current or not base["count"]:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{step}: p95 {base['p95_ms']} ms -> {current['p95_ms']} ms")
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{step}: throughput {base['throughput_rps']} -> {current['throughput_rps']} req/s"
+            )
+    if report["journeys"]["failed"] > baseline["journeys"]["failed"]:
+        regressions.append(
+            f"failed journeys {baseline['journeys']['failed']} -> {report['journeys']['failed']}"
+        )
+    return regressions
+
+
+def print_report(report: dict):
+    print(
+        f"\n🏁 {report['journeys']['completed']} journeys in {report['duration_seconds']} s "
+        f"({report['journeys']['per_second']}/s, {report['journeys']['failed']} failed)"
+    )
+    print(f"   {'endpoint':<16}{'count':>7}{'err':>6}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for step, stats in report["endpoints"].items():
+        print(
+            f"   {step:<16}{stats['count']:>7}{stats['errors']:>6}{stats['throughput_rps']:>9}"
+            f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        )
+
+
+async def main():
+    """Main load test function"""
+    args = parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        if not args.database_url:
+            sys.exit("❌ --database-url (or DATABASE_URL) is required to boot the server")
+        print(f"🚀 Booting API with fake LLM ({args.llm_latency}s latency, {args.workers} workers)...")
+        server = boot_server(args)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        await wait_until_ready(base_url)
+        print(f"🏋️  Running {args.users} journeys, {args.concurrency} concurrent, against {base_url}")
+        report = await run_load(base_url, args.users, args.concurrency)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"💾 Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"\n❌ Regressions beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Migration Script - Convert stored workout plans to the compact format
+Rewrites legacy plan_data rows in id-ordered chunks; safe to re-run (compact rows are skipped)
+
+Usage:
+    python scripts/migrate_plan_storage.py [--chunk-size N] [--dry-run]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pydantic import ValidationError
+from sqlalchemy import select, update
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.models.workout_plan import WorkoutPlan
+from src.schemas.workout import WorkoutPlanResponse
+from src.services.exercise_catalog import exercise_catalog
+from src.services.plan_codec import compact_plan_data, is_compact
+from src.services.plan_compression_service import PlanCompressionService
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Convert workout plans to compact storage")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Rows per transaction")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report savings without writing"
+    )
+    return parser.parse_args()
+
+
+def _size(plan_data: dict) -> int:
+    return len(json.dumps(plan_data, ensure_ascii=False).encode("utf-8"))
+
+
+async def main():
+    """Main migration function"""
+    args = parse_args()
+    stats = {"scanned": 0, "converted": 0, "skipped": 0, "invalid": 0, "bytes_before": 0, "bytes_after": 0}
+
+    print("📦 Converting workout plans to compact storage...")
+    if settings.PLAN_STORAGE_COMPRESSED:
+        async with AsyncSessionLocal() as db:
+            await PlanCompressionService.load_dictionaries(db)
+
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            await exercise_catalog.ensure_loaded(db)
+
+            # Keyset pagination: each chunk is a short transaction on an indexed range
+            result = await db.execute(
+                select(WorkoutPlan.id, WorkoutPlan.plan_data)
+                .where(WorkoutPlan.id > last_id)
+                .order_by(WorkoutPlan.id)
+                .limit(args.chunk_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            updates = []
+            for plan_id, plan_data in rows:
+                stats["scanned"] += 1
+                if is_compact(plan_data):
+                    stats["skipped"] += 1
+                    continue
+                try:
+                    compact = compact_plan_data(WorkoutPlanResponse(**dict(plan_data)))
+                except ValidationError:
+                    stats["invalid"] += 1
+                    continue
+
+                stats["bytes_before"] += _size(dict(plan_data))
+                stats["bytes_after"] += _size(compact)
+                updates.append({"id": plan_id, "plan_data": compact})
+
+            if updates and not args.dry_run:
+                await db.execute(update(WorkoutPlan), updates)
+                await db.commit()
+            stats["converted"] += len(updates)
+
+        print(f"   ... up to id {last_id}: {stats['converted']} converted")
+
+    ratio = stats["bytes_before"] / stats["bytes_after"] if stats["bytes_after"] else 0
+    print(
+        f"✅ {stats['converted']} converted, {stats['skipped']} already compact, "
+        f"{stats['invalid']} invalid (left unchanged)"
+    )
+    print(f"📉 {stats['bytes_before']} -> {stats['bytes_after']} bytes ({ratio:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
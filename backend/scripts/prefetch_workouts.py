@@ -0,0 +1,56 @@
+"""
+Prefetch Script - Pre-generate next-day workout plans off-peak
+Run nightly (e.g. cron at 02:00) so the morning /workouts/generate peak becomes a DB read
+
+Usage:
+    python scripts/prefetch_workouts.py [--date YYYY-MM-DD] [--concurrency N] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.services.prefetch_service import PrefetchService
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pre-generate next-day workout plans")
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="Training day to prefetch for (default: tomorrow, UTC)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=None, help="Maximum concurrent LLM generations"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report how many users are due"
+    )
+    return parser.parse_args()
+
+
+async def main():
+    """Main prefetch function"""
+    args = parse_args()
+
+    print("🌙 Prefetching next-day workout plans...")
+    stats = await PrefetchService.run(
+        target_date=args.date, concurrency=args.concurrency, dry_run=args.dry_run
+    )
+
+    print(f"🧹 Purged {stats['purged']} expired pending plans")
+    print(f"📋 {stats['due']} users due")
+    if not args.dry_run:
+        print(
+            f"✅ Generated {stats['generated']} plans "
+            f"({stats['skipped']} skipped, {stats['failed']} failed)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+Rebuild Script - Recompute adaptive-TDEE weight trends from the full body-weight series
+Needed after changing ADAPTIVE_TDEE_HALF_LIFE_DAYS (the stored sums depend on it) or to
+repair trend rows. Users are processed in id-ordered chunks with one vectorized fit per
+chunk; run scripts/recompute_nutrition.py afterwards to refresh nutrition plans
+
+Usage:
+    python scripts/rebuild_weight_trends.py [--chunk-size N] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, insert, select
+
+from src.core.database import AsyncSessionLocal
+from src.models.body_weight_entry import BodyWeightEntry
+from src.models.weight_trend import WeightTrend
+from src.services.weight_trend import fit, fit_all, numpy
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rebuild weight trends from body-weight entries")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Users per transaction")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Fit without writing"
+    )
+    return parser.parse_args()
+
+
+async def main():
+    """Main rebuild function"""
+    args = parse_args()
+    stats = {"users": 0, "points": 0, "fitted": 0}
+    fit_seconds = 0.0
+
+    print(f"📈 Rebuilding weight trends ({'numpy' if numpy is not None else 'incremental'} path)...")
+    last_user_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(BodyWeightEntry.user_id)
+                .where(BodyWeightEntry.user_id > last_user_id)
+                .group_by(BodyWeightEntry.user_id)
+                .order_by(BodyWeightEntry.user_id)
+                .limit(args.chunk_size)
+            )
+            user_ids = result.scalars().all()
+            if not user_ids:
+                break
+            last_user_id = user_ids[-1]
+
+            # Primary key order: (user_id, recorded_on), as fit_all expects
+            result = await db.execute(
+                select(
+                    BodyWeightEntry.user_id,
+                    BodyWeightEntry.recorded_on,
+                    BodyWeightEntry.weight_hg,
+                    BodyWeightEntry.intake_kcal,
+                )
+                .where(BodyWeightEntry.user_id.in_(user_ids))
+                .order_by(BodyWeightEntry.user_id, BodyWeightEntry.recorded_on)
+            )
+            rows = result.all()
+
+            started = time.perf_counter()
+            states = fit_all(
+                [row.user_id for row in rows],
+                [row.recorded_on.toordinal() for row in rows],
+                [row.weight_hg / 10 for row in rows],
+                [row.intake_kcal for row in rows],
+            )
+            fit_seconds += time.perf_counter() - started
+
+            stats["users"] += len(states)
+            stats["points"] += len(rows)
+            stats["fitted"] += sum(fit(WeightTrend(**state)) is not None for state in states)
+
+            if not args.dry_run:
+                await db.execute(delete(WeightTrend).where(WeightTrend.user_id.in_(user_ids)))
+                await db.execute(insert(WeightTrend), states)
+                await db.commit()
+
+        print(f"   ... up to user {last_user_id}: {stats['users']} trends")
+
+    print(
+        f"✅ {stats['users']} users, {stats['points']} weigh-ins, {stats['fitted']} with a usable trend"
+        f"{' (dry run, nothing written)' if args.dry_run else ''}"
+    )
+    print(f"⏱️  Fitting: {fit_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Recompute Script - Recalculate nutrition plans for all profiles (after formula changes)
+Profiles are processed in id-ordered chunks: targets (adaptive TDEE where the weight
+trend allows it) are computed column-wise for the whole chunk and a new NutritionPlan
+is inserted only where they differ from the user's latest plan; safe to re-run
+
+Usage:
+    python scripts/recompute_nutrition.py [--chunk-size N] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import insert, select
+
+from src.core.database import AsyncSessionLocal
+from src.models.nutrition_plan import NutritionPlan
+from src.models.user_profile import UserProfile
+from src.models.weight_trend import WeightTrend
+from src.services.nutrition_service import (
+    NutritionService,
+    calculate_targets_bulk,
+    numpy,
+    plan_targets,
+    profile_inputs,
+)
+from src.services.weight_trend import adaptive_tdee
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Recompute nutrition plans for all profiles")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Profiles per transaction")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report changes without writing"
+    )
+    return parser.parse_args()
+
+
+async def main():
+    """Main recompute function"""
+    args = parse_args()
+    stats = {"profiles": 0, "new": 0, "changed": 0, "unchanged": 0}
+    compute_seconds = 0.0
+
+    print(f"🥗 Recomputing nutrition plans ({'numpy' if numpy is not None else 'memoized scalar'} path)...")
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            # Keyset pagination: each chunk is a short transaction on an indexed range
+            result = await db.execute(
+                select(UserProfile).where(UserProfile.id > last_id).order_by(UserProfile.id).limit(args.chunk_size)
+            )
+            profiles = result.scalars().all()
+            if not profiles:
+                break
+            last_id = profiles[-1].id
+
+            user_ids = [profile.user_id for profile in profiles]
+            result = await db.execute(select(WeightTrend).where(WeightTrend.user_id.in_(user_ids)))
+            trends = {trend.user_id: trend for trend in result.scalars()}
+
+            started = time.perf_counter()
+            inputs = [profile_inputs(profile) for profile in profiles]
+            formula = calculate_targets_bulk(inputs)
+            measured = [
+                adaptive_tdee(trends.get(profile.user_id), target.tdee)
+                for profile, target in zip(profiles, formula)
+            ]
+            measured = [None if value is None else float(round(value)) for value in measured]
+            targets = calculate_targets_bulk(inputs, measured)
+            compute_seconds += time.perf_counter() - started
+
+            latest = await NutritionService.get_latest_plans(db, user_ids)
+            rows = []
+            for profile, target, tdee in zip(profiles, targets, measured):
+                stats["profiles"] += 1
+                plan = latest.get(profile.user_id)
+                if plan is not None and plan_targets(plan) == target:
+                    stats["unchanged"] += 1
+                    continue
+                stats["new" if plan is None else "changed"] += 1
+                source = "formula" if tdee is None else "adaptive"
+                rows.append({"user_id": profile.user_id, "tdee_source": source, **target._asdict()})
+
+            if rows and not args.dry_run:
+                await db.execute(insert(NutritionPlan), rows)
+                await db.commit()
+
+        print(f"   ... up to profile {last_id}: {stats['new'] + stats['changed']} plans to write")
+
+    print(
+        f"✅ {stats['profiles']} profiles: {stats['new']} new, {stats['changed']} changed, "
+        f"{stats['unchanged']} unchanged{' (dry run, nothing written)' if args.dry_run else ''}"
+    )
+    print(f"⏱️  Target computation: {compute_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""
+Dictionary Script - Train a compression dictionary on stored workout plans
+Restart API workers afterwards so new plans are written with it
+
+Usage:
+    python scripts/train_plan_dictionary.py [--sample-size N] [--size BYTES]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.services.plan_compression_service import PlanCompressionService
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train a plan compression dictionary")
+    parser.add_argument(
+        "--sample-size", type=int, default=2000, help="Most recent plans to train on"
+    )
+    parser.add_argument(
+        "--size", type=int, default=settings.PLAN_DICTIONARY_SIZE, help="Dictionary size in bytes"
+    )
+    return parser.parse_args()
+
+
+async def main():
+    """Main training function"""
+    args = parse_args()
+
+    print("📚 Training plan compression dictionary...")
+    async with AsyncSessionLocal() as db:
+        # Existing compressed rows must be readable to be used as samples
+        await PlanCompressionService.load_dictionaries(db)
+        try:
+            dictionary = await PlanCompressionService.create_dictionary(
+                db, sample_size=args.sample_size, size=args.size
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+
+    print(
+        f"✅ Stored dictionary {dictionary.id} "
+        f"({len(dictionary.dictionary)} bytes, {dictionary.sample_size} plans)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+Chat API Endpoints
+POST /api/v1/chat/ask - Ask a technical question (answer streamed as NDJSON)
+GET /api/v1/chat/history - Get chat history
+"""
+import json
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import get_db
+from src.middleware.auth_middleware import get_current_user
+from src.middleware.llm_admission import check_llm_capacity
+from src.models.user import User
+from src.schemas.chat import ChatRequest, ChatResponse
+from src.services.chat_service import ChatService
+from src.services.llm_scheduler import LLMOverloadedError
+from src.services.usage_service import BudgetExceededError
+
+router = APIRouter(prefix="/api/v1/chat", tags=["chat"])
+
+
+@router.post("/ask")
+async def ask_question(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Ask a technique, equipment or training-concept question
+
+    - Questions about pain or injuries get a referral to a health professional
+    - The answer is streamed as newline-delimited JSON: {"type": "delta", "text"}
+      lines as Claude generates it, then one {"type": "done"} line with the
+      stored exchange's id, question_category and created_at
+    - Earlier exchanges are used as context (recent ones verbatim, older ones summarized)
+
+    Answered questions count against CHAT_DAILY_MESSAGE_LIMIT (referrals count
+    against nothing). Errors before the first line are regular HTTP errors (429 +
+    Retry-After when over budget or the queue is full, 503 + Retry-After when
+    overloaded); later failures end the stream with a {"type": "error"} line
+
+    Requires authentication
+    """
+    category = ChatService.classify_question(request.question)
+    if ChatService.needs_llm(category):
+        check_llm_capacity()
+
+    events = ChatService.stream_answer(db, current_user, request.question, category)
+    try:
+        first = await anext(events)
+    except BudgetExceededError as e:
+        await events.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except LLMOverloadedError as e:
+        await events.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ValueError as e:
+        await events.aclose()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        await events.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to answer question: {str(e)}",
+        )
+
+    async def _stream():
+        yield json.dumps(first, ensure_ascii=False) + "\n"
+        try:
+            async for event in events:
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": f"Failed to answer question: {str(e)}"}) + "\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        _stream(), media_type="application/x-ndjson", headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.get("/history", response_model=List[ChatResponse])
+async def get_chat_history(
+    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+):
+    """
+    Get user's chat history (last CHAT_HISTORY_DAYS days, newest first)
+
+    Requires authentication
+    """
+    return await ChatService.get_history(db, current_user)
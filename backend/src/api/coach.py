@@ -0,0 +1,40 @@
+"""
+Coach API Endpoints
+POST /api/v1/coach/workouts/generate - Generate plans for a cohort of clients (NDJSON stream)
+"""
+import json
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from src.middleware.auth_middleware import require_role
+from src.models.user import User, UserRole
+from src.schemas.coach import CohortGenerateRequest
+from src.services.coach_service import CoachService
+
+router = APIRouter(prefix="/api/v1/coach", tags=["coach"])
+
+
+@router.post("/workouts/generate")
+async def generate_cohort_workouts(
+    request: CohortGenerateRequest,
+    coach: User = Depends(require_role(UserRole.COACH, UserRole.ADMIN)),
+):
+    """
+    Generate workout plans for many clients concurrently
+
+    - Coaches may only target their assigned clients (users.coach_id), admins any user
+    - Identical profiles share one Claude call, its tokens split across them
+    - Each plan counts against the client's own budget (clients over budget get an error line)
+    - Progress is streamed as newline-delimited JSON, one line per client,
+      followed by a summary line with "status": "done"
+
+    Requires coach or admin role
+    """
+    fatigue_score = request.fatigue_score if request.fatigue_score is not None else 50
+
+    async def _stream():
+        async for event in CoachService.generate_cohort(coach, request.user_ids, fatigue_score):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
@@ -0,0 +1,60 @@
+"""
+Debug API Endpoints (admin only)
+GET /api/v1/debug/profiles - List saved request profiles
+GET /api/v1/debug/profiles/{name} - Download a profile (speedscope JSON, open in speedscope.app)
+GET /api/v1/debug/loop - Event-loop stalls by call site
+"""
+from datetime import datetime
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from src.core.loop_watchdog import loop_watchdog
+from src.middleware.auth_middleware import require_role
+from src.middleware.profiling import get_profile_path, list_profiles
+from src.models.user import UserRole
+
+router = APIRouter(
+    prefix="/api/v1/debug",
+    tags=["debug"],
+    dependencies=[Depends(require_role(UserRole.ADMIN))],
+)
+
+
+@router.get("/profiles")
+async def get_profiles() -> List[dict]:
+    """
+    List request profiles, newest first
+
+    Profiles are recorded for admin requests sent with `X-Profile: 1`
+    (the response carries `X-Profile-Id`) and for PROFILE_SAMPLE_RATE of all requests
+    """
+    return [
+        {
+            "name": path.name,
+            "size_bytes": stat.st_size,
+            "created_at": datetime.utcfromtimestamp(stat.st_mtime).isoformat(),
+        }
+        for path in list_profiles()
+        for stat in (path.stat(),)
+    ]
+
+
+@router.get("/profiles/{name}")
+async def get_profile(name: str):
+    """Download one profile"""
+    path = get_profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=name)
+
+
+@router.get("/loop")
+async def get_loop_stalls() -> dict:
+    """
+    Event-loop stalls aggregated by call site (LOOP_WATCHDOG_ENABLED)
+
+    Includes stack samples of the blocking code, hence admin only
+    """
+    return loop_watchdog.stats()
@@ -0,0 +1,107 @@
+"""
+Exercises API Endpoints
+GET /api/v1/exercises/search - Fuzzy, accent-insensitive exercise search
+GET /api/v1/exercises/{exercise_id}/alternatives - Get equipment/injury-aware alternatives
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import get_db
+from src.middleware.auth_middleware import get_current_user
+from src.models.user import User
+from src.models.user_profile import UserProfile
+from src.schemas.exercise import ExerciseAlternative, ExerciseAlternativesResponse, ExerciseSearchResult
+from src.services.exercise_catalog import exercise_catalog
+from src.services.search_service import SearchService
+from src.services.substitution_service import SubstitutionService
+
+router = APIRouter(prefix="/api/v1/exercises", tags=["exercises"])
+
+
+@router.get("/search", response_model=List[ExerciseSearchResult])
+async def search_exercises(
+    q: str = Query(..., min_length=2, max_length=100, description="Search text"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Search the exercise catalog
+
+    - Accent-insensitive ("bulgara" finds "Búlgara")
+    - Tolerates typos and partial words ("sentadila", "press incl")
+    - Also matches muscle groups, ranked below name matches
+
+    Requires authentication
+    """
+    await exercise_catalog.ensure_loaded(db)
+
+    return [
+        ExerciseSearchResult(
+            id=entry.id,
+            name=entry.name,
+            muscle_groups=list(entry.muscle_groups),
+            equipment=entry.equipment,
+            score=round(score, 3),
+        )
+        for entry, score in SearchService.search(q, limit)
+    ]
+
+
+@router.get("/{exercise_id}/alternatives", response_model=ExerciseAlternativesResponse)
+async def get_exercise_alternatives(
+    exercise_id: int,
+    equipment: Optional[str] = Query(
+        None, description="Comma-separated available equipment (default: profile equipment)"
+    ),
+    limit: int = Query(5, ge=1, le=20),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get alternatives for an exercise (FR-024)
+
+    - Ranked by muscle-group similarity, computed locally (no LLM call)
+    - Filtered by equipment (query parameter, or the user's profile equipment)
+    - Exercises contraindicated by the user's injury history are excluded
+
+    Requires authentication
+    """
+    await exercise_catalog.ensure_loaded(db)
+
+    result = await db.execute(select(UserProfile).where(UserProfile.user_id == current_user.id))
+    profile = result.scalar_one_or_none()
+
+    if equipment is not None:
+        available = [item for item in equipment.split(",") if item.strip()]
+    else:
+        available = profile.equipment_available if profile else None
+
+    try:
+        alternatives = SubstitutionService.alternatives(
+            exercise_id,
+            equipment=available,
+            injury_history=profile.injury_history if profile else None,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    exercise = exercise_catalog.get(exercise_id)
+    return ExerciseAlternativesResponse(
+        exercise_id=exercise.id,
+        name=exercise.name,
+        equipment=exercise.equipment,
+        alternatives=[
+            ExerciseAlternative(
+                id=entry.id,
+                name=entry.name,
+                muscle_groups=list(entry.muscle_groups),
+                equipment=entry.equipment,
+                similarity=round(similarity, 3),
+            )
+            for entry, similarity in alternatives
+        ],
+    )
@@ -0,0 +1,120 @@
+"""
+Nutrition API Endpoints
+GET /api/v1/nutrition/calculate - TDEE and macro targets for the current profile
+POST /api/v1/nutrition/weight - Log a body-weight measurement
+GET /api/v1/nutrition/weight - Body-weight series and fitted trend
+"""
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import get_db
+from src.middleware.auth_middleware import get_current_user
+from src.models.user import User
+from src.models.nutrition_plan import NutritionPlan
+from src.schemas.nutrition import (
+    NutritionPlanResponse,
+    WeightEntryResponse,
+    WeightHistoryResponse,
+    WeightLogRequest,
+)
+from src.schemas.profile import UserProfileUpdate
+from src.services.body_weight_service import BodyWeightService
+from src.services.nutrition_service import DISCLAIMER, NutritionService
+from src.services.profile_service import ProfileService
+
+router = APIRouter(prefix="/api/v1/nutrition", tags=["nutrition"])
+
+
+def _plan_response(plan: NutritionPlan) -> NutritionPlanResponse:
+    return NutritionPlanResponse(
+        tdee=plan.tdee,
+        tdee_source=plan.tdee_source,
+        target_calories=plan.target_calories,
+        protein_g=plan.protein_g,
+        carbs_g=plan.carbs_g,
+        fat_g=plan.fat_g,
+        calculated_at=plan.created_at,
+        disclaimer=DISCLAIMER,
+    )
+
+
+async def _require_profile(db: AsyncSession, user: User):
+    profile = await ProfileService.get_user_profile(db, user)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found. Please create profile first.",
+        )
+    return profile
+
+
+@router.get("/calculate", response_model=NutritionPlanResponse)
+async def calculate_nutrition(
+    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+):
+    """
+    Calculate TDEE and macro targets for the user's objective
+
+    TDEE comes from Mifflin-St Jeor until enough weigh-ins exist, then from the
+    body-weight trend (tdee_source "adaptive"). Returns the latest stored plan;
+    a new one is only written when the targets differ from it (profile updates
+    and weigh-ins recalculate automatically)
+
+    Requires authentication
+    """
+    profile = await _require_profile(db, current_user)
+    plan = await NutritionService.sync_plan(db, profile)
+    return _plan_response(plan)
+
+
+@router.post("/weight", response_model=NutritionPlanResponse)
+async def log_weight(
+    request: WeightLogRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Log body weight (recorded_on defaults to today; one value per day)
+
+    Today's weight also updates the profile. Returns the recalculated plan
+
+    Requires authentication
+    """
+    profile = await _require_profile(db, current_user)
+    day = request.recorded_on or datetime.utcnow().date()
+    try:
+        if day == datetime.utcnow().date():
+            # The profile update logs the weigh-in and already syncs the plan
+            await ProfileService.update_user_profile(
+                db, current_user, UserProfileUpdate(weight_kg=request.weight_kg)
+            )
+            plan = await NutritionService.get_latest_plan(db, current_user.id)
+        else:
+            await BodyWeightService.log_weight(db, profile, request.weight_kg, day)
+            plan = await NutritionService.sync_plan(db, profile)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return _plan_response(plan)
+
+
+@router.get("/weight", response_model=WeightHistoryResponse)
+async def get_weight_history(
+    days: int = Query(90, ge=1, le=730),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the body-weight series of the last `days` days with the fitted trend
+
+    Requires authentication
+    """
+    entries = await BodyWeightService.get_history(db, current_user.id, days)
+    trend = await BodyWeightService.get_trend(db, current_user.id)
+    return WeightHistoryResponse(
+        entries=[WeightEntryResponse(recorded_on=entry.recorded_on, weight_kg=entry.weight_kg) for entry in entries],
+        trend_weight_kg=round(trend[0], 1) if trend else None,
+        trend_kg_per_week=round(trend[1], 2) if trend else None,
+    )
@@ -4,10 +4,15 @@ GET /api/v1/profile/me - Get current user's profile
 POST /api/v1/profile/create - Create user profile (onboarding)
 PUT /api/v1/profile/update - Update user profile
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import settings
 from src.core.database import get_db
+from src.core.encoding import encode_json
+from src.core.http_cache import make_etag, etag_matches, http_date, not_modified_since, not_modified
+from src.core.response_cache import response_cache, json_bytes_response
 from src.middleware.auth_middleware import get_current_user
 from src.models.user import User
 from src.schemas.profile import UserProfileCreate, UserProfileUpdate, UserProfileResponse
@@ -16,24 +21,69 @@ from src.services.profile_service import ProfileService
 router = APIRouter(prefix="/api/v1/profile", tags=["profile"])
 
 
+def _profile_content(profile) -> dict:
+    """UserProfileResponse fields read straight from the ORM row (no re-validation)"""
+    return {field: getattr(profile, field) for field in UserProfileResponse.model_fields}
+
+
+def _profile_cache_headers(user: User, updated_at) -> dict:
+    """Validators derived from updated_at (clients must revalidate before reuse)"""
+    return {
+        "ETag": make_etag("profile", user.id, updated_at.isoformat()),
+        "Last-Modified": http_date(updated_at),
+        "Cache-Control": "private, no-cache",
+    }
+
+
 @router.get("/me", response_model=UserProfileResponse)
 async def get_profile(
-    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get current user's profile
 
+    Supports conditional requests: If-None-Match / If-Modified-Since are
+    answered with 304 from updated_at alone, without loading the profile.
+    Encoded bodies are cached per user and updated_at
+
     Requires authentication
     """
-    profile = await ProfileService.get_user_profile(db, current_user)
+    updated_at = await ProfileService.get_profile_updated_at(db, current_user)
 
+    if not updated_at:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found. Please create profile first.",
+        )
+
+    headers = _profile_cache_headers(current_user, updated_at)
+    # If-None-Match takes precedence over If-Modified-Since
+    if if_none_match:
+        if etag_matches(if_none_match, headers["ETag"]):
+            return not_modified(headers)
+    elif not_modified_since(if_modified_since, updated_at):
+        return not_modified(headers)
+
+    cache_key = ("profile", current_user.id, updated_at.isoformat())
+    if settings.RESPONSE_CACHE_ENABLED:
+        body = response_cache.get(cache_key)
+        if body is not None:
+            return json_bytes_response(body, headers)
+
+    profile = await ProfileService.get_user_profile(db, current_user)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found. Please create profile first.",
         )
 
-    return profile
+    body = encode_json(_profile_content(profile))
+    if settings.RESPONSE_CACHE_ENABLED:
+        response_cache.put(cache_key, body)
+    return json_bytes_response(body, _profile_cache_headers(current_user, profile.updated_at))
 
 
 @router.post("/create", response_model=UserProfileResponse, status_code=status.HTTP_201_CREATED)
@@ -59,7 +109,9 @@ async def create_profile(
     """
     try:
         profile = await ProfileService.create_user_profile(db, current_user, request)
-        return profile
+        return json_bytes_response(
+            encode_json(_profile_content(profile)), status_code=status.HTTP_201_CREATED
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
@@ -79,6 +131,6 @@ async def update_profile(
     """
     try:
         profile = await ProfileService.update_user_profile(db, current_user, request)
-        return profile
+        return json_bytes_response(encode_json(_profile_content(profile)))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
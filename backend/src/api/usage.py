@@ -0,0 +1,29 @@
+"""
+Usage API Endpoints
+GET /api/v1/usage/me - Get current user's LLM token usage and budget
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import get_db
+from src.middleware.auth_middleware import get_current_user
+from src.models.user import User
+from src.schemas.usage import UsageSummaryResponse
+from src.services.usage_service import UsageService
+
+router = APIRouter(prefix="/api/v1/usage", tags=["usage"])
+
+
+@router.get("/me", response_model=UsageSummaryResponse)
+async def get_my_usage(
+    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+):
+    """
+    Get current user's LLM usage
+
+    Returns generations, tokens and estimated cost in the rolling 24h window
+    together with the configured limits and lifetime totals (billing)
+
+    Requires authentication
+    """
+    return await UsageService.get_usage_summary(db, current_user.id)
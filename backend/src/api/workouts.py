@@ -2,27 +2,42 @@
 Workouts API Endpoints
 POST /api/v1/workouts/generate - Generate new workout plan (calls Claude AI)
 GET /api/v1/workouts/history - Get workout history
+POST /api/v1/workouts/weekly/generate - Generate weekly plan (one concurrent Claude call per day)
+GET /api/v1/workouts/weekly/{weekly_plan_id} - Get weekly plan
 GET /api/v1/workouts/{workout_plan_id} - Get specific workout plan
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import settings
 from src.core.database import get_db
+from src.core.encoding import encode_json
+from src.core.http_cache import make_etag, etag_matches, not_modified
+from src.core.response_cache import response_cache, json_bytes_response
 from src.middleware.auth_middleware import get_current_user
+from src.middleware.llm_admission import admit_llm_request
 from src.models.user import User
+from src.models.weekly_plan import WeeklyPlan
 from src.schemas.workout import (
     WorkoutGenerateRequest,
     WorkoutPlanResponse,
     WorkoutHistoryItem,
     WorkoutPlanDetail,
+    WeeklyPlanResponse,
 )
+from src.services.exercise_catalog import exercise_catalog
+from src.services.llm_scheduler import LLMOverloadedError
+from src.services.plan_codec import expand_plan_data
+from src.services.usage_service import BudgetExceededError
 from src.services.workout_service import WorkoutService
 
 router = APIRouter(prefix="/api/v1/workouts", tags=["workouts"])
 
 
-@router.post("/generate", response_model=WorkoutPlanResponse)
+@router.post(
+    "/generate", response_model=WorkoutPlanResponse, dependencies=[Depends(admit_llm_request)]
+)
 async def generate_workout(
     request: WorkoutGenerateRequest,
     current_user: User = Depends(get_current_user),
@@ -38,14 +53,29 @@ async def generate_workout(
 
     This endpoint calls Anthropic Claude API and may take 5-10 seconds
 
+    Budget: LLM_DAILY_GENERATION_LIMIT per rolling 24h (429 + Retry-After when exceeded)
+
     Requires authentication
     """
     try:
         workout_plan = await WorkoutService.generate_workout_plan(db, current_user, request)
 
-        # Return the plan_data as WorkoutPlanResponse
-        return WorkoutPlanResponse(**workout_plan.plan_data)
+        # plan_data was validated when the LLM output was parsed: encode it as is
+        await exercise_catalog.ensure_loaded(db)
+        return json_bytes_response(encode_json(expand_plan_data(workout_plan.plan_data)))
 
+    except BudgetExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except LLMOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -62,21 +92,157 @@ async def get_workout_history(
     """
     Get user's workout plan history (last 30 plans)
 
+    Days of a weekly plan are not listed (see /weekly/{weekly_plan_id})
+
     Returns list of workout summaries with:
     - id
     - created_at
     - fatigue_score_used
     - exercise_count
 
+    Cached as encoded bytes, keyed by the user's plan count and newest plan
+
     Requires authentication
     """
+    cache_key = None
+    if settings.RESPONSE_CACHE_ENABLED:
+        version = await WorkoutService.get_history_version(db, current_user)
+        cache_key = ("history", current_user.id, *version)
+        body = response_cache.get(cache_key)
+        if body is not None:
+            return json_bytes_response(body)
+
     history = await WorkoutService.get_workout_history(db, current_user, limit=30)
-    return history
+    body = encode_json(history)
+
+    if cache_key is not None:
+        response_cache.put(cache_key, body)
+    return json_bytes_response(body)
+
+
+def _weekly_plan_response(weekly_plan: WeeklyPlan) -> Response:
+    """
+    Encode the weekly plan (WeeklyPlanResponse shape) from the stored day plans
+
+    Day plans were validated when generated, so no model is rebuilt here
+    (catalog must be loaded)
+    """
+    day_data = [expand_plan_data(day_plan.plan_data) for day_plan in weekly_plan.day_plans]
+    days = [
+        {
+            "day_index": day_plan.day_index,
+            "focus": weekly_plan.split_days[day_plan.day_index],
+            "workout_plan_id": day_plan.id,
+            "workout_plan": plan_data.get("workout_plan", []),
+            "ajuste_aplicado": plan_data.get("ajuste_aplicado"),
+        }
+        for day_plan, plan_data in zip(weekly_plan.day_plans, day_data)
+    ]
+    disclaimer = ""
+    if day_data:
+        disclaimer = day_data[0].get("disclaimer_medico", "")
+
+    return json_bytes_response(
+        encode_json(
+            {
+                "id": weekly_plan.id,
+                "split_days": weekly_plan.split_days,
+                "weekly_volume": weekly_plan.weekly_volume,
+                "days": days,
+                "disclaimer_medico": disclaimer,
+                "fatiga_score_usado": weekly_plan.fatigue_score_used,
+                "created_at": weekly_plan.created_at,
+            }
+        )
+    )
+
+
+@router.post(
+    "/weekly/generate",
+    response_model=WeeklyPlanResponse,
+    dependencies=[Depends(admit_llm_request)],
+)
+async def generate_weekly_workout(
+    request: WorkoutGenerateRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Generate a weekly plan (FR-005)
+
+    - Split chosen from training_days_per_week and experience level
+    - One Claude call per training day, issued concurrently; each counts
+      against LLM_DAILY_GENERATION_LIMIT (429 + Retry-After when the week does not fit)
+    - Weekly sets per muscle group capped by experience level
+
+    Wall-clock time is close to a single /generate call
+
+    Requires authentication
+    """
+    try:
+        weekly_plan = await WorkoutService.generate_weekly_plan(db, current_user, request)
+        await exercise_catalog.ensure_loaded(db)
+        return _weekly_plan_response(weekly_plan)
+
+    except BudgetExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except LLMOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate weekly plan: {str(e)}",
+        )
+
+
+@router.get("/weekly/{weekly_plan_id}", response_model=WeeklyPlanResponse)
+async def get_weekly_plan(
+    weekly_plan_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get weekly plan by ID with all day sessions
+
+    Requires authentication and plan ownership
+    """
+    weekly_plan = await WorkoutService.get_weekly_plan_by_id(db, current_user, weekly_plan_id)
+
+    if not weekly_plan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Weekly plan not found or you don't have access",
+        )
+
+    await exercise_catalog.ensure_loaded(db)
+    return _weekly_plan_response(weekly_plan)
+
+
+def _plan_cache_headers(workout_plan_id: int) -> dict:
+    """
+    Plans never change once ready; the body only varies with the exercise
+    catalog it is rehydrated from, which is part of the ETag
+    """
+    return {
+        "ETag": make_etag("workout_plan", workout_plan_id, exercise_catalog.version),
+        "Cache-Control": f"private, max-age={settings.WORKOUT_PLAN_CACHE_MAX_AGE_SECONDS}, immutable",
+    }
 
 
 @router.get("/{workout_plan_id}", response_model=WorkoutPlanDetail)
 async def get_workout_plan(
     workout_plan_id: int,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -85,8 +251,28 @@ async def get_workout_plan(
 
     Returns full workout plan with all exercise details
 
+    Cacheable: strong ETag + Cache-Control immutable. If-None-Match is
+    answered with 304 from a primary key check, without loading the plan.
+    Encoded bodies are cached per user, plan and catalog version
+
     Requires authentication and plan ownership
     """
+    await exercise_catalog.ensure_loaded(db)
+    headers = _plan_cache_headers(workout_plan_id)
+    cache_key = ("plan", current_user.id, workout_plan_id, exercise_catalog.version)
+
+    # A cached body implies ownership was already checked
+    if etag_matches(if_none_match, headers["ETag"]):
+        if cache_key in response_cache or await WorkoutService.workout_plan_exists(
+            db, current_user, workout_plan_id
+        ):
+            return not_modified(headers)
+
+    if settings.RESPONSE_CACHE_ENABLED:
+        body = response_cache.get(cache_key)
+        if body is not None:
+            return json_bytes_response(body, headers)
+
     workout_plan = await WorkoutService.get_workout_plan_by_id(db, current_user, workout_plan_id)
 
     if not workout_plan:
@@ -95,14 +281,20 @@ async def get_workout_plan(
             detail="Workout plan not found or you don't have access",
         )
 
-    # Build response
-    plan_data = workout_plan.plan_data
-    return WorkoutPlanDetail(
-        id=workout_plan.id,
-        user_id=workout_plan.user_id,
-        workout_plan=plan_data.get("workout_plan", []),
-        disclaimer_medico=plan_data.get("disclaimer_medico", ""),
-        fatiga_score_usado=workout_plan.fatigue_score_used,
-        ajuste_aplicado=plan_data.get("ajuste_aplicado"),
-        created_at=workout_plan.created_at,
+    # Build response (blocks rehydrated from the cached catalog)
+    plan_data = expand_plan_data(workout_plan.plan_data)
+    body = encode_json(
+        {
+            "id": workout_plan.id,
+            "user_id": workout_plan.user_id,
+            "workout_plan": plan_data.get("workout_plan", []),
+            "disclaimer_medico": plan_data.get("disclaimer_medico", ""),
+            "fatiga_score_usado": workout_plan.fatigue_score_used,
+            "ajuste_aplicado": plan_data.get("ajuste_aplicado"),
+            "created_at": workout_plan.created_at,
+        }
     )
+
+    if settings.RESPONSE_CACHE_ENABLED:
+        response_cache.put(cache_key, body)
+    return json_bytes_response(body, headers)
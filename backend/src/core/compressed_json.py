@@ -0,0 +1,164 @@
+"""
+Compressed JSON Column Type - zlib with shared preset dictionaries
+Values are stored as binary and only decompressed when a field is actually read
+"""
+import json
+import struct
+import zlib
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+# Header: magic, format version, dictionary id (0 = none), top-level list length hint
+_HEADER = struct.Struct(">cBHH")
+_MAGIC = b"Z"
+_FORMAT = 1
+COMPRESSION_LEVEL = 6
+UNKNOWN_COUNT = 0xFFFF
+
+
+class CompressionDictionaryRegistry:
+    """
+    In-memory zlib preset dictionaries by id (loaded at startup)
+
+    Dictionaries are append-only: rows keep referencing the id they were written with
+    """
+
+    def __init__(self):
+        self._dictionaries: Dict[int, bytes] = {}
+        self.current_id = 0  # 0 = compress without a dictionary
+
+    def register(self, dictionary_id: int, dictionary: bytes, current: bool = False):
+        self._dictionaries[dictionary_id] = dictionary
+        if current or dictionary_id > self.current_id:
+            self.current_id = dictionary_id
+
+    def get(self, dictionary_id: int) -> Optional[bytes]:
+        if dictionary_id == 0:
+            return None
+        try:
+            return self._dictionaries[dictionary_id]
+        except KeyError:
+            raise LookupError(f"Compression dictionary {dictionary_id} is not loaded")
+
+
+# Global registry instance
+compression_dictionaries = CompressionDictionaryRegistry()
+
+
+def compress_json(value: dict, count_key: Optional[str] = None) -> bytes:
+    """
+    Serialize and compress a JSON object with the current dictionary
+
+    Args:
+        value: JSON-serializable dict
+        count_key: Top-level list whose length is kept in the header (readable without decompressing)
+
+    Returns:
+        Header + compressed payload
+    """
+    raw = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    dictionary_id = compression_dictionaries.current_id
+    dictionary = compression_dictionaries.get(dictionary_id)
+
+    compressor = (
+        zlib.compressobj(COMPRESSION_LEVEL, zdict=dictionary)
+        if dictionary
+        else zlib.compressobj(COMPRESSION_LEVEL)
+    )
+    payload = compressor.compress(raw) + compressor.flush()
+
+    count = UNKNOWN_COUNT
+    if count_key and isinstance(value.get(count_key), list):
+        count = min(len(value[count_key]), UNKNOWN_COUNT - 1)
+    return _HEADER.pack(_MAGIC, _FORMAT, dictionary_id, count) + payload
+
+
+def decompress_json(blob: bytes) -> dict:
+    """Inverse of compress_json"""
+    magic, _version, dictionary_id, _count = _HEADER.unpack_from(blob)
+    if magic != _MAGIC:
+        raise ValueError("Not a compressed JSON value")
+
+    dictionary = compression_dictionaries.get(dictionary_id)
+    decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+    raw = decompressor.decompress(blob[_HEADER.size:]) + decompressor.flush()
+    return json.loads(raw)
+
+
+class LazyJSON(Mapping):
+    """
+    Read-only mapping over a compressed value, decompressed on first key access
+
+    `item_count` comes from the header, so list sizes (e.g. exercise counts in
+    history) need no decompression
+    """
+
+    __slots__ = ("blob", "_data")
+
+    def __init__(self, blob: bytes):
+        self.blob = bytes(blob)
+        self._data: Optional[dict] = None
+
+    @property
+    def item_count(self) -> Optional[int]:
+        count = _HEADER.unpack_from(self.blob)[3]
+        return None if count == UNKNOWN_COUNT else count
+
+    @property
+    def decoded(self) -> bool:
+        return self._data is not None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            self._data = decompress_json(self.blob)
+        return self._data
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __eq__(self, other):
+        if isinstance(other, LazyJSON):
+            return self.blob == other.blob
+        return self._load() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<LazyJSON({len(self.blob)} bytes, decoded={self.decoded})>"
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON object stored as zlib-compressed binary (bytea)
+
+    Args:
+        count_key: Top-level list whose length is stored in the header
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, count_key: Optional[str] = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, LazyJSON):
+            return value.blob  # Unchanged value, no re-compression
+        return compress_json(value, self.count_key)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return LazyJSON(value)
@@ -24,6 +24,108 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    PASSWORD_HASH_WORKERS: int = 4  # bcrypt threads per worker process
+    RATE_LIMIT_ENABLED: bool = True  # Auth endpoint limits (disable only for load tests)
+
+    # LLM usage accounting and admission control
+    LLM_MODEL: str = "claude-3-5-sonnet-20241022"
+    LLM_MODE: str = "live"  # "live", "fake" (local canned plans), "record" or "replay" (cassettes)
+    LLM_FAKE_LATENCY_SECONDS: float = 1.0
+    LLM_CASSETTE_DIR: str = "cassettes"
+    LLM_REPLAY_TIMING_SCALE: float = 1.0  # Recorded latency multiplier on replay (0 = instant)
+    LLM_INPUT_COST_PER_MTOK: float = 3.0  # USD per million input tokens
+    LLM_OUTPUT_COST_PER_MTOK: float = 15.0  # USD per million output tokens
+    LLM_DAILY_GENERATION_LIMIT: int = 20  # Generations per user per rolling 24h
+    LLM_DAILY_TOKEN_LIMIT: int = 200000  # Input + output tokens per user per rolling 24h
+    LLM_BUDGET_RESERVATION_TTL_SECONDS: int = 3900  # Unsettled holds stop counting (batch deadline + call)
+
+    # LLM scheduling (per worker): concurrency, queue bounds and deadlines per priority class
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_QUEUE_INTERACTIVE: int = 64
+    LLM_QUEUE_PREFETCH: int = 256
+    LLM_QUEUE_BATCH: int = 1024
+    LLM_DEADLINE_INTERACTIVE_SECONDS: float = 30.0
+    LLM_DEADLINE_PREFETCH_SECONDS: float = 600.0
+    LLM_DEADLINE_BATCH_SECONDS: float = 3600.0
+
+    # Nightly prefetch of next-day workout plans
+    WORKOUT_PREFETCH_MAX_AGE_HOURS: int = 36  # Pending plans older than this are not served
+    WORKOUT_PREFETCH_CONCURRENCY: int = 4
+    SPECULATIVE_FIRST_PLAN: bool = True  # Generate the first plan in background on profile creation
+
+    # Template store (populated by scripts/generate_templates.py). Off by default: every
+    # user of a profile bucket is served the same plan on every /generate
+    WORKOUT_TEMPLATES_ENABLED: bool = False
+
+    # Exercise catalog cache (substitution matrix, search index)
+    EXERCISE_CATALOG_REFRESH_SECONDS: int = 300  # How often the cached catalog is checked for changes
+
+    # HTTP caching (plan bodies also depend on the exercise catalog version)
+    WORKOUT_PLAN_CACHE_MAX_AGE_SECONDS: int = 3600
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Encoded bodies per worker
+
+    # Response compression (levels chosen with scripts/benchmark_compression.py)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller bodies are sent as is
+    COMPRESSION_GZIP_LEVEL: int = 5
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_CACHE_MAX_BYTES: int = 8 * 1024 * 1024  # Compressed GET bodies per worker (own LRU)
+
+    # Metrics (Prometheus text at /metrics, admin only; set PROMETHEUS_MULTIPROC_DIR when running several workers)
+    METRICS_ENABLED: bool = True
+    METRICS_PORT: int = 0  # Unauthenticated internal listener for scrapers (0 = off)
+    METRICS_BIND_ADDRESS: str = "127.0.0.1"
+    METRICS_SAMPLE_INTERVAL_SECONDS: float = 5.0  # Refresh of in-process gauges (caches, queues)
+
+    # Event-loop watchdog (lag histogram plus stack samples of blocking code)
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_INTERVAL_SECONDS: float = 0.05  # Heartbeat period
+    LOOP_WATCHDOG_THRESHOLD_SECONDS: float = 0.1  # Lag that counts as a stall
+    LOOP_WATCHDOG_LOG_INTERVAL_SECONDS: float = 60.0  # Per call site
+
+    # SQL statistics (per-request counts, N+1 warnings, slow-query log)
+    SQL_STATS_ENABLED: bool = True
+    SQL_SERVER_TIMING: bool = False  # Add a Server-Timing header with DB time per response
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # Identical statements per request before warning
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_EXPLAIN_SAMPLE_RATE: float = 0.0  # Share of slow SELECTs re-run with EXPLAIN (ANALYZE, BUFFERS)
+
+    # Request profiling (admin `X-Profile: 1` header or random sample, requires pyinstrument)
+    PROFILING_ENABLED: bool = False
+    PROFILE_SAMPLE_RATE: float = 0.0  # Share of all requests profiled
+    PROFILE_INTERVAL_SECONDS: float = 0.001
+    PROFILE_OUTPUT_DIR: str = "profiles"  # Relative to the working directory (git-ignored)
+    PROFILE_MAX_FILES: int = 100
+
+    # Plan storage (compressed binary column; switching requires rewriting workout_plans)
+    PLAN_STORAGE_COMPRESSED: bool = False
+    PLAN_DICTIONARY_SIZE: int = 16384  # Bytes (zlib uses at most 32 KB)
+
+    # Coach cohort generation
+    COACH_BATCH_MAX_USERS: int = 500
+    COACH_BATCH_CONCURRENCY: int = 8
+    COACH_BATCH_INSERT_CHUNK: int = 50
+
+    # Technical consultation chat (FR-022 to FR-027)
+    CHAT_MAX_TOKENS: int = 800  # Answer length
+    CHAT_DAILY_MESSAGE_LIMIT: int = 100  # Answered questions per user per rolling 24h (own budget, shared tokens)
+    CHAT_CONTEXT_TOKEN_BUDGET: int = 1500  # Recent turns resent verbatim (estimated tokens)
+    CHAT_CONTEXT_MAX_TURNS: int = 10  # Rows loaded per turn, whatever the budget
+    CHAT_SUMMARY_MAX_TOKENS: int = 300  # Rolling summary of older turns
+    CHAT_SUMMARY_BATCH_TURNS: int = 10  # Turns folded into the summary per summarization call
+    CHAT_HISTORY_DAYS: int = 30
+
+    # Nutrition (Mifflin-St Jeor TDEE and macro targets, FR-018 to FR-020)
+    NUTRITION_CACHE_SIZE: int = 4096  # Memoized distinct input combinations
+
+    # Adaptive TDEE (exponentially weighted trend of logged body weight)
+    ADAPTIVE_TDEE_ENABLED: bool = True
+    ADAPTIVE_TDEE_HALF_LIFE_DAYS: float = 14.0  # Age at which a weigh-in counts half
+    ADAPTIVE_TDEE_MIN_POINTS: int = 7
+    ADAPTIVE_TDEE_MIN_DAYS: int = 14  # Series span before the trend is used (fully at twice this)
+    ADAPTIVE_TDEE_MAX_ADJUSTMENT: float = 0.25  # Max deviation from the formula TDEE
 
     class Config:
         env_file = ".env"
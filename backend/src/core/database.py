@@ -2,18 +2,52 @@
 Database Configuration and Session Management
 SQLAlchemy 2.0 async engine
 """
+import time
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.core.config import settings
+from src.core.metrics import DB_POOL_CHECKED_OUT, DB_POOL_HELD, DB_POOL_OVERFLOW, DB_POOL_WAIT
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Default async queue pool, recording how long each checkout waits for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
 
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
+    poolclass=InstrumentedQueuePool,
 )
 
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info["checked_out_at"] = time.perf_counter()
+    DB_POOL_CHECKED_OUT.inc()
+    DB_POOL_OVERFLOW.set(max(0, engine.sync_engine.pool.overflow()))
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    checked_out_at = connection_record.info.pop("checked_out_at", None)
+    if checked_out_at is not None:
+        DB_POOL_CHECKED_OUT.dec()
+        DB_POOL_HELD.observe(time.perf_counter() - checked_out_at)
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
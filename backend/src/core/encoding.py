@@ -0,0 +1,49 @@
+"""
+JSON Encoding - Fast native encoder for pre-validated response content
+Uses orjson when installed, stdlib json otherwise
+"""
+import enum
+import json
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any):
+    """Types the native encoders do not handle"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Mapping):  # e.g. LazyJSON plan_data
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """
+    Encode trusted content (dicts, lists, models, datetimes, enums) to JSON bytes
+
+    Content is not validated: callers pass data that was validated at the trust
+    boundary (LLM output, user input) or read back from the database
+
+    Args:
+        content: Content to encode
+
+    Returns:
+        UTF-8 JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
@@ -0,0 +1,174 @@
+"""
+Loop Watchdog - Event-loop lag measurement and stack capture of blocking code
+
+A heartbeat task on the loop measures scheduling lag. A watcher thread notices when
+the heartbeat stops and samples the loop thread's Python stack while it is still
+blocked, so the log shows the code that blocked (sync SDK calls, bcrypt, CPU work)
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.core.config import settings
+from src.core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+# Frames under this directory are preferred as the reported call site
+APP_ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+def call_site(stack: traceback.StackSummary) -> str:
+    """
+    Innermost application frame of a stack ("services/x.py:42 in fn")
+
+    Falls back to the innermost frame when the stack has no application code
+    """
+    for frame in reversed(stack):
+        if frame.filename.startswith(APP_ROOT) and frame.filename != __file__:
+            return f"{Path(frame.filename).relative_to(APP_ROOT)}:{frame.lineno} in {frame.name}"
+    frame = stack[-1]
+    return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+class _Site:
+    """Aggregated stalls of one call site"""
+
+    __slots__ = ("count", "max_stall", "last_logged", "suppressed", "stack")
+
+    def __init__(self):
+        self.count = 0
+        self.max_stall = 0.0
+        self.last_logged = 0.0
+        self.suppressed = 0
+        self.stack = ""
+
+
+class LoopWatchdog:
+    """
+    Event-loop lag watchdog (one per worker)
+
+    - Lag of every heartbeat goes to the event_loop_lag_seconds histogram
+    - One stack sample per stall longer than `threshold`, aggregated by call site
+    - Each site is logged at most once per `log_interval`, with the count of
+      stalls suppressed since its last report
+    """
+
+    def __init__(self, interval: float, threshold: float, log_interval: float):
+        self.interval = interval
+        self.threshold = threshold
+        self.log_interval = log_interval
+
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._sites: Dict[str, _Site] = {}
+        self.stalls = 0
+
+    def start(self):
+        """Start heartbeat and watcher (call from the running loop)"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._thread = None
+
+    def stats(self) -> dict:
+        """Stalls per call site, worst first"""
+        with self._lock:
+            sites: List[dict] = [
+                {
+                    "site": name,
+                    "count": site.count,
+                    "max_stall_ms": round(site.max_stall * 1000, 1),
+                    "stack": site.stack,
+                }
+                for name, site in self._sites.items()
+            ]
+        sites.sort(key=lambda item: (item["count"], item["max_stall_ms"]), reverse=True)
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "stalls": self.stalls,
+            "sites": sites,
+        }
+
+    async def _beat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            EVENT_LOOP_LAG.observe(max(0.0, now - expected))
+            self._heartbeat = now
+
+    def _watch(self):
+        captured_beat = None
+        while not self._stop.wait(self.interval):
+            beat = self._heartbeat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.threshold or beat == captured_beat:
+                continue
+
+            # One sample per stall: the loop is still inside the blocking call
+            captured_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._record(traceback.extract_stack(frame), stalled)
+
+    def _record(self, stack: traceback.StackSummary, stalled: float):
+        name = call_site(stack)
+        now = time.monotonic()
+        EVENT_LOOP_STALLS.inc()
+
+        with self._lock:
+            self.stalls += 1
+            site = self._sites.get(name)
+            if site is None:
+                site = self._sites[name] = _Site()
+            site.count += 1
+            site.max_stall = max(site.max_stall, stalled)
+            site.stack = "".join(stack.format())
+
+            if now - site.last_logged < self.log_interval:
+                site.suppressed += 1
+                return
+            suppressed, site.suppressed = site.suppressed, 0
+            site.last_logged = now
+
+        logger.warning(
+            "Event loop blocked for at least %.0f ms at %s (%d similar stalls since last report)\n%s",
+            stalled * 1000,
+            name,
+            suppressed,
+            site.stack,
+        )
+
+
+# Global loop watchdog instance
+loop_watchdog = LoopWatchdog(
+    interval=settings.LOOP_WATCHDOG_INTERVAL_SECONDS,
+    threshold=settings.LOOP_WATCHDOG_THRESHOLD_SECONDS,
+    log_interval=settings.LOOP_WATCHDOG_LOG_INTERVAL_SECONDS,
+)
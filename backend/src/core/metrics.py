@@ -0,0 +1,201 @@
+"""
+Metrics - Prometheus instruments shared by middleware, services and the /metrics endpoint
+
+Multiple uvicorn/gunicorn workers: set PROMETHEUS_MULTIPROC_DIR (an empty, writable
+directory) before the workers start. Every worker then writes its samples to mmap files
+there and /metrics aggregates them, whichever worker answers the scrape.
+
+/metrics on the API port is admin only. For scrapers, set METRICS_PORT to serve the same
+text on a separate listener (METRICS_BIND_ADDRESS, loopback by default) kept off the
+public network.
+"""
+import os
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+# Bucket boundaries (seconds)
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+LLM_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0, 120.0)
+
+# HTTP (route is the path template, e.g. /api/v1/workouts/{workout_plan_id})
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status",
+    ["route", "method", "status"],
+    buckets=HTTP_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being processed",
+    multiprocess_mode="livesum",
+)
+
+# Database connection pool
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to obtain a pooled connection (queueing plus connect for new connections)",
+    buckets=DB_BUCKETS,
+)
+DB_POOL_HELD = Histogram(
+    "db_pool_checkout_held_seconds",
+    "Time a connection stays checked out of the pool",
+    buckets=HTTP_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+
+# LLM
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "Claude API call latency (excluding scheduler queueing)",
+    ["model", "outcome"],
+    buckets=LLM_BUCKETS,
+)
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Streamed Claude calls: time from request to the first text chunk",
+    ["model"],
+    buckets=LLM_BUCKETS,
+)
+CHAT_PROMPT_TOKENS = Histogram(
+    "chat_prompt_tokens",
+    "Estimated prompt size of chat turns (system, summary and history included)",
+    buckets=(250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens consumed by Claude API calls",
+    ["model", "kind"],
+)
+LLM_IN_FLIGHT = Gauge(
+    "llm_scheduler_in_flight",
+    "LLM calls holding a scheduler slot",
+    multiprocess_mode="livesum",
+)
+LLM_QUEUE_DEPTH = Gauge(
+    "llm_scheduler_queue_depth",
+    "LLM calls waiting for a scheduler slot",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+LLM_SHED = Counter(
+    "llm_scheduler_shed_total",
+    "LLM requests rejected by the scheduler",
+    ["priority"],
+)
+
+# Password hashing thread pool
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "bcrypt operations waiting for a hashing thread",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash/verify time including queueing",
+    ["operation"],
+    buckets=HTTP_BUCKETS,
+)
+
+# Event loop (see core/loop_watchdog.py)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a heartbeat's scheduled and actual wake-up",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Stalls longer than LOOP_WATCHDOG_THRESHOLD_SECONDS (stack sampled and logged)",
+)
+
+# In-process state (sampled periodically, see services/metrics_service.py)
+RATE_LIMITER_KEYS = Gauge(
+    "rate_limiter_keys",
+    "Identifiers tracked by the in-memory rate limiter",
+    multiprocess_mode="livesum",
+)
+RESPONSE_CACHE_ENTRIES = Gauge(
+    "response_cache_entries",
+    "Encoded response bodies in the response cache",
+    multiprocess_mode="livesum",
+)
+RESPONSE_CACHE_BYTES = Gauge(
+    "response_cache_bytes",
+    "Approximate memory used by the response cache",
+    multiprocess_mode="livesum",
+)
+RESPONSE_CACHE_REQUESTS = Counter(
+    "response_cache_requests_total",
+    "Response cache lookups",
+    ["result"],
+)
+RESPONSE_CACHE_EVICTIONS = Counter(
+    "response_cache_evictions_total",
+    "Response cache entries evicted by the byte cap",
+)
+
+
+def multiprocess_enabled() -> bool:
+    """True when workers share metrics through PROMETHEUS_MULTIPROC_DIR"""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format
+
+    Returns:
+        Tuple of (body, content type)
+    """
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def _registry() -> CollectorRegistry:
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def start_metrics_server(port: int, addr: str) -> bool:
+    """
+    Serve metrics on an internal listener (a daemon thread of this worker)
+
+    With several workers only the first one to start binds the port; the others
+    get False. In multiprocess mode that worker reports all of them.
+
+    Returns:
+        True if this worker serves the port
+    """
+    try:
+        start_http_server(port, addr=addr, registry=_registry())
+    except OSError:
+        return False
+    return True
+
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the shared directory (call on shutdown)"""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,132 @@
+"""
+Query Stats - Per-request SQL statement counting, N+1 detection and slow-query log
+
+Engine events time every statement. Inside a request (see middleware/query_stats.py)
+they are added to that request's QueryStats; slow statements are logged everywhere.
+A sample of slow SELECTs is re-run with EXPLAIN (ANALYZE, BUFFERS) after the response
+is sent, on a separate connection that is rolled back.
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import event
+
+from src.core.config import settings
+from src.core.database import engine
+
+logger = logging.getLogger("src.sql")
+slow_logger = logging.getLogger("src.sql.slow")
+
+# Longest statement text written to logs
+MAX_LOGGED_STATEMENT = 2000
+
+
+class QueryStats:
+    """SQL statements issued while handling one request"""
+
+    __slots__ = ("count", "total_time", "statements", "explain")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.statements: Counter = Counter()
+        self.explain: List[Tuple[str, object]] = []
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times (N+1 candidates)"""
+        return [(statement, count) for statement, count in self.statements.items() if count >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Background EXPLAIN tasks (kept referenced until done)
+_explain_tasks: Set[asyncio.Task] = set()
+
+
+def begin_request() -> Tuple[QueryStats, object]:
+    """Start collecting statements for the current request"""
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > MAX_LOGGED_STATEMENT:
+        return statement[:MAX_LOGGED_STATEMENT] + "..."
+    return statement
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 < settings.SQL_SLOW_QUERY_MS:
+        return
+
+    slow_logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, _shorten(statement))
+    if (
+        stats is not None
+        and not executemany
+        and conn.dialect.name == "postgresql"
+        and statement.lstrip()[:6].upper() == "SELECT"
+        and random.random() < settings.SQL_EXPLAIN_SAMPLE_RATE
+    ):
+        stats.explain.append((statement, parameters))
+
+
+def report_request(stats: QueryStats, method: str, path: str):
+    """
+    Log the request's SQL summary and N+1 warnings, schedule sampled EXPLAINs
+
+    Args:
+        stats: Statements collected for the request
+        method: HTTP method
+        path: Request path
+    """
+    logger.debug("%s %s: %d queries, %.1f ms", method, path, stats.count, stats.total_time * 1000)
+
+    for statement, count in stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+        logger.warning(
+            "Possible N+1 in %s %s: statement executed %d times: %s", method, path, count, _shorten(statement)
+        )
+
+    if stats.explain:
+        task = asyncio.create_task(_explain(stats.explain))
+        _explain_tasks.add(task)
+        task.add_done_callback(_explain_tasks.discard)
+
+
+async def _explain(queries: List[Tuple[str, object]]):
+    """EXPLAIN (ANALYZE, BUFFERS) slow statements with their original parameters"""
+    for statement, parameters in queries:
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                plan = "\n".join(row[0] for row in result)
+                await conn.rollback()
+        except Exception as e:
+            slow_logger.info("EXPLAIN failed for %s: %s", _shorten(statement), e)
+            continue
+        slow_logger.warning("Query plan for %s\n%s", _shorten(statement), plan)
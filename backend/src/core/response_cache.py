@@ -0,0 +1,110 @@
+"""
+Response Cache - LRU cache of encoded JSON response bodies (per worker)
+Hits are returned as raw bytes, skipping ORM loading, Pydantic validation and encoding
+"""
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+from fastapi import Response
+
+from src.core.config import settings
+
+# Approximate per-entry overhead (key tuple, OrderedDict node, bytes header)
+ENTRY_OVERHEAD_BYTES = 200
+
+CacheKey = Tuple[Hashable, ...]  # (kind, user_id, *version)
+
+
+class ResponseCache:
+    """
+    Byte-capped LRU of response bodies
+
+    Keys are (kind, user_id, *version): the version part (plan id + catalog version,
+    history row count + newest plan, profile updated_at) comes from the database,
+    so a stale entry is never served even if another worker changed the data.
+    `invalidate` additionally frees a user's superseded entries right away.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._owners: Dict[Tuple[Hashable, Hashable], Set[CacheKey]] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+    def put(self, key: CacheKey, body: bytes):
+        size = len(body) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._discard(key)
+
+        self._entries[key] = body
+        self._owners.setdefault(key[:2], set()).add(key)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def invalidate(self, kind: str, user_id: int) -> int:
+        """
+        Drop all entries of one kind for a user
+
+        Returns:
+            Number of entries removed
+        """
+        keys = self._owners.pop((kind, user_id), set())
+        for key in keys:
+            body = self._entries.pop(key, None)
+            if body is not None:
+                self._bytes -= len(body) + ENTRY_OVERHEAD_BYTES
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._owners.clear()
+        self._bytes = 0
+
+    def _discard(self, key: CacheKey):
+        body = self._entries.pop(key)
+        self._bytes -= len(body) + ENTRY_OVERHEAD_BYTES
+        owners = self._owners.get(key[:2])
+        if owners is not None:
+            owners.discard(key)
+            if not owners:
+                del self._owners[key[:2]]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def json_bytes_response(body: bytes, headers: Optional[dict] = None, status_code: int = 200) -> Response:
+    """Response for an already encoded JSON body"""
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+# Global cache instance
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_BYTES)
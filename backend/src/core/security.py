@@ -1,13 +1,20 @@
 """
 Security Utilities - Password hashing and JWT token generation
 """
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from src.core.config import settings
+from src.core.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_QUEUE_DEPTH
+
+T = TypeVar("T")
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -40,6 +47,47 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHashPool:
+    """
+    Dedicated threads for bcrypt so hashing never blocks the event loop
+    A small pool also caps how much CPU login/register bursts can take
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.queue_depth = 0
+
+    async def run(self, operation: str, fn: Callable[..., T], *args) -> T:
+        started = time.perf_counter()
+        with self._lock:
+            self.queue_depth += 1
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+
+        def _task():
+            with self._lock:
+                self.queue_depth -= 1
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+            return fn(*args)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, _task)
+        finally:
+            PASSWORD_HASH_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+    async def hash(self, password: str) -> str:
+        """Async hash_password"""
+        return await self.run("hash", hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Async verify_password"""
+        return await self.run("verify", verify_password, plain_password, hashed_password)
+
+
+# Global password hashing pool
+password_hash_pool = PasswordHashPool(max_workers=settings.PASSWORD_HASH_WORKERS)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
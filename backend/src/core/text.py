@@ -0,0 +1,18 @@
+"""
+Text Utilities - Accent-insensitive normalization for Spanish names
+"""
+import unicodedata
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase and strip accents ("Sentadilla Búlgara" -> "sentadilla bulgara")
+
+    Args:
+        text: Input text
+
+    Returns:
+        Normalized text
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
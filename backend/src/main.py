@@ -1,13 +1,35 @@
 """
 Smart AI Gym Coach - FastAPI Application
 """
-from fastapi import FastAPI
+import logging
+
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
 from src.api.auth import router as auth_router
 from src.api.profile import router as profile_router
 from src.api.workouts import router as workouts_router
+from src.api.usage import router as usage_router
+from src.api.coach import router as coach_router
+from src.api.exercises import router as exercises_router
+from src.api.debug import router as debug_router
+from src.api.nutrition import router as nutrition_router
+from src.api.chat import router as chat_router
+from src.core.database import AsyncSessionLocal
+from src.core.loop_watchdog import loop_watchdog
+from src.core.metrics import mark_process_dead, render_metrics, start_metrics_server
+from src.middleware.auth_middleware import require_role
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.profiling import ProfilingMiddleware
+from src.middleware.query_stats import QueryStatsMiddleware
+from src.models.user import UserRole
+from src.services.llm_scheduler import llm_scheduler
+from src.services.metrics_service import metrics_sampler
+from src.services.plan_compression_service import PlanCompressionService
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -26,10 +48,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (preflight responses are below the size threshold)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# On-demand request profiling (covers dependencies, handler and serialization)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, sample_rate=settings.PROFILE_SAMPLE_RATE)
+
+# SQL statements and DB time per request
+if settings.SQL_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware, server_timing=settings.SQL_SERVER_TIMING)
+
+# Request metrics (outermost, so latency includes every other middleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(profile_router)
 app.include_router(workouts_router)
+app.include_router(usage_router)
+app.include_router(coach_router)
+app.include_router(exercises_router)
+app.include_router(nutrition_router)
+app.include_router(chat_router)
+app.include_router(debug_router)
+
+
+@app.on_event("startup")
+async def load_plan_dictionaries():
+    """Register compression dictionaries before any compressed plan is read"""
+    if settings.PLAN_STORAGE_COMPRESSED:
+        async with AsyncSessionLocal() as db:
+            await PlanCompressionService.load_dictionaries(db)
+
+
+@app.on_event("startup")
+async def start_metrics_sampler():
+    """Refresh sampled gauges (caches, queues) in this worker"""
+    if settings.METRICS_ENABLED:
+        metrics_sampler.start()
+        if settings.METRICS_PORT and start_metrics_server(settings.METRICS_PORT, settings.METRICS_BIND_ADDRESS):
+            logger.info("Serving metrics on %s:%d", settings.METRICS_BIND_ADDRESS, settings.METRICS_PORT)
+
+
+@app.on_event("shutdown")
+async def stop_metrics_sampler():
+    """Stop sampling and drop this worker's live gauges"""
+    if settings.METRICS_ENABLED:
+        await metrics_sampler.stop()
+        mark_process_dead()
+
+
+@app.on_event("startup")
+async def start_loop_watchdog():
+    """Measure event-loop lag and sample stacks of blocking code"""
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+
+
+@app.on_event("shutdown")
+async def stop_loop_watchdog():
+    await loop_watchdog.stop()
 
 
 @app.get("/")
@@ -46,3 +127,18 @@ async def root():
 async def health_check():
     """Health check for monitoring"""
     return {"status": "healthy"}
+
+
+@app.get("/health/llm", dependencies=[Depends(require_role(UserRole.ADMIN))])
+async def llm_health_check():
+    """LLM scheduler gauges: in-flight calls, queue depth and wait time per priority class"""
+    return llm_scheduler.stats()
+
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_role(UserRole.ADMIN))])
+async def metrics():
+    """Prometheus metrics (all workers when PROMETHEUS_MULTIPROC_DIR is set); scrapers use METRICS_PORT"""
+    if settings.METRICS_ENABLED:
+        metrics_sampler.sample()
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -8,7 +8,7 @@ from sqlalchemy import select
 
 from src.core.database import get_db
 from src.core.security import decode_token
-from src.models.user import User
+from src.models.user import User, UserRole
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
@@ -67,3 +67,33 @@ async def get_current_user(
         )
 
     return user
+
+
+def require_role(*roles: UserRole):
+    """
+    Dependency factory for routes restricted to specific roles
+
+    Usage:
+        @router.post("/cohort", dependencies=[Depends(require_role(UserRole.COACH))])
+        async def cohort(...):
+            ...
+
+    Args:
+        roles: Roles allowed to access the route
+
+    Returns:
+        Dependency returning the current user
+
+    Raises:
+        HTTPException: 403 if the user's role is not allowed
+    """
+
+    async def _require_role(current_user: User = Depends(get_current_user)) -> User:
+        if current_user.role not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions",
+            )
+        return current_user
+
+    return _require_role
@@ -0,0 +1,174 @@
+"""
+Compression Middleware - Negotiated gzip / brotli / zstd response compression
+Complete JSON/text responses above a size threshold are compressed; streams pass through
+"""
+import gzip
+import hashlib
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.response_cache import ResponseCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional encoding
+    zstandard = None
+
+# Content types worth compressing (prefix match, parameters ignored)
+COMPRESSIBLE_TYPES = ("application/json", "application/problem+json", "text/html", "text/plain", "text/css")
+
+# Never buffered or compressed here: progress must reach the client as it is produced
+STREAMING_TYPES = ("text/event-stream", "application/x-ndjson")
+
+# Compressed variants of GET bodies, keyed by content digest. A separate LRU, so one-off
+# bodies never compete with the per-user entries of the response cache for its byte cap
+compressed_cache = ResponseCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """Available encodings in server preference order (levels from scripts/benchmark_compression.py)"""
+    compressors: Dict[str, Callable[[bytes], bytes]] = {}
+    if brotli is not None:
+        compressors["br"] = lambda body: brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    if zstandard is not None:
+        zstd = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL)
+        compressors["zstd"] = zstd.compress
+    compressors["gzip"] = lambda body: gzip.compress(
+        body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0
+    )
+    return compressors
+
+
+def negotiate_encoding(accept_encoding: str, available) -> Optional[str]:
+    """
+    Pick the best available encoding for an Accept-Encoding header
+
+    Highest q-value wins; ties go to the server preference order of `available`
+
+    Returns:
+        Encoding name, or None for identity
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete responses
+
+    - Only allowlisted content types at or above COMPRESSION_MIN_SIZE
+    - Responses sent in several body chunks (streaming, SSE, NDJSON) pass through
+    - Strong ETags become weak (the encoded bytes differ, the representation does not)
+    - Compressed GET bodies are kept in a small LRU keyed by content digest, so
+      repeatedly served (cached) responses are not recompressed on every hit;
+      POST results such as /generate are one-off and never stored
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressors = _compressors()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, self.compressors) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        reusable = scope["method"] == "GET"
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message  # Held until the first body chunk
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            passthrough = True  # Anything after the first chunk is forwarded unchanged
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+
+            if message.get("more_body", False) or not self._eligible(headers, body):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = self._compress(encoding, body, reusable)
+            headers.add_vary_header("Accept-Encoding")
+            if len(compressed) >= len(body):
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _eligible(self, headers: MutableHeaders, body: bytes) -> bool:
+        if len(body) < self.minimum_size or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type in STREAMING_TYPES:
+            return False
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compress(self, encoding: str, body: bytes, reusable: bool) -> bytes:
+        if not (reusable and settings.RESPONSE_CACHE_ENABLED):
+            return self.compressors[encoding](body)
+
+        key = ("encoded", encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = compressed_cache.get(key)
+        if compressed is None:
+            compressed = self.compressors[encoding](body)
+            compressed_cache.put(key, compressed)
+        return compressed
@@ -0,0 +1,47 @@
+"""
+LLM Admission Control
+Rejects LLM-bound requests early when the worker's queue is exhausted
+
+Per-user budgets are reserved by the services right before calling Claude
+(UsageService.reserve), once they know how many calls a request needs and
+whether it needs any; routers map BudgetExceededError to 429.
+
+Routes that only sometimes call Claude (chat: refusals are canned) call
+check_llm_capacity themselves once they know they will.
+"""
+from fastapi import Depends, HTTPException, status
+
+from src.middleware.auth_middleware import get_current_user
+from src.models.user import User
+from src.services.llm_scheduler import Priority, llm_scheduler
+
+
+async def admit_llm_request(current_user: User = Depends(get_current_user)):
+    """
+    Admission control for endpoints that call Claude
+
+    Usage:
+        @router.post("/generate", dependencies=[Depends(admit_llm_request)])
+        async def generate(...):
+            ...
+
+    Raises:
+        HTTPException: 429 with Retry-After if the interactive queue is full
+    """
+    check_llm_capacity()
+
+
+def check_llm_capacity():
+    """
+    Reject an interactive LLM request if the worker's queue is already full
+
+    Raises:
+        HTTPException: 429 with Retry-After if the interactive queue is full
+    """
+    if llm_scheduler.is_saturated(Priority.INTERACTIVE):
+        retry_after = max(1, int(llm_scheduler.estimate_wait(Priority.INTERACTIVE)))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many generations in progress. Please try again shortly.",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,69 @@
+"""
+Metrics Middleware - Request latency per route template, method and status
+"""
+import time
+from typing import Callable, Dict, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+
+# Label for requests that matched no route (keeps scanners from creating new series)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing every HTTP request
+
+    The route label is the path template of the matched route, resolved from the
+    endpoint the router stored in the scope. Histogram children are bound once per
+    (route, method, status) and reused, so a request only does two dict lookups.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_paths: Dict[Callable, str] = {}
+        self._children: Dict[Tuple[str, str, int], object] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = self._route_path(scope)
+            key = (route, scope["method"], status_code)
+            child = self._children.get(key)
+            if child is None:
+                child = HTTP_REQUEST_DURATION.labels(route, scope["method"], str(status_code))
+                self._children[key] = child
+            child.observe(time.perf_counter() - started)
+
+    def _route_path(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            path = UNMATCHED_ROUTE
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    break
+            self._route_paths[endpoint] = path
+        return path
@@ -0,0 +1,157 @@
+"""
+Profiling Middleware - On-demand sampling profiles of individual requests
+
+A request is profiled when an admin sends `X-Profile: 1` or when it falls in the
+PROFILE_SAMPLE_RATE share. The whole ASGI call is profiled (dependencies such as
+get_current_user, the service call and serialization) and saved as a speedscope
+file, listed and downloaded through /api/v1/debug/profiles.
+Requests that are not selected only pay for one header lookup; the admin check
+behind `X-Profile` is cached per user for ADMIN_CHECK_TTL_SECONDS.
+"""
+import asyncio
+import logging
+import random
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.core.security import decode_token
+from src.models.user import User, UserRole
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pragma: no cover - optional dependency
+    Profiler = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_HEADER_VALUES = (b"1", b"true")  # Other values (0, empty) do not request a profile
+PROFILE_SUFFIX = ".speedscope.json"
+PROFILE_NAME_PATTERN = re.compile(r"^[\w.-]+\.speedscope\.json$")
+
+# Role lookups behind `X-Profile`, so a client repeating the header costs one query per TTL
+ADMIN_CHECK_TTL_SECONDS = 60.0
+ADMIN_CHECK_CACHE_SIZE = 1024
+_admin_checks: Dict[int, Tuple[bool, float]] = {}
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILE_OUTPUT_DIR)
+
+
+def list_profiles() -> List[Path]:
+    """Saved profiles, newest first"""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda path: path.stat().st_mtime, reverse=True)
+
+
+def get_profile_path(name: str) -> Optional[Path]:
+    """Path of a saved profile, or None if the name is invalid or unknown"""
+    if not PROFILE_NAME_PATTERN.match(name):
+        return None
+    path = profile_dir() / name
+    return path if path.is_file() else None
+
+
+async def is_admin_request(scope: Scope) -> bool:
+    """True if the request carries a valid access token of an admin user"""
+    authorization = Headers(scope=scope).get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "access":
+        return False
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return False
+
+    now = time.monotonic()
+    cached = _admin_checks.get(user_id)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.role).where(User.id == user_id))
+        is_admin = result.scalar_one_or_none() == UserRole.ADMIN
+
+    if len(_admin_checks) >= ADMIN_CHECK_CACHE_SIZE:
+        _admin_checks.clear()
+    _admin_checks[user_id] = (is_admin, now + ADMIN_CHECK_TTL_SECONDS)
+    return is_admin
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling selected requests with pyinstrument
+
+    One profile runs at a time per worker; concurrent selections are skipped.
+    The profile id is returned in the X-Profile-Id response header.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or Profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        requested = any(
+            name == PROFILE_HEADER and value.strip().lower() in PROFILE_HEADER_VALUES
+            for name, value in scope["headers"]
+        )
+        sampled = not requested and self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (requested or sampled) or self._active or (requested and not await is_admin_request(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        stamp = time.strftime("%Y%m%dT%H%M%S") + f"{time.time() % 1:.3f}"[1:]
+        name = f"{stamp}-{scope['method']}-{_slug(scope['path'])}{PROFILE_SUFFIX}"
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and requested:
+                MutableHeaders(raw=message["headers"]).append("X-Profile-Id", name)
+            await send(message)
+
+        profiler = Profiler(interval=settings.PROFILE_INTERVAL_SECONDS, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            self._active = False
+            try:
+                await asyncio.to_thread(_save, session, name)
+            except Exception:
+                logger.exception("Could not save profile %s", name)
+
+
+def _slug(path: str) -> str:
+    return re.sub(r"[^\w-]+", "_", path.strip("/"))[:80] or "root"
+
+
+def _save(session, name: str):
+    """Write a speedscope profile and drop the oldest beyond PROFILE_MAX_FILES"""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / name).write_text(SpeedscopeRenderer().render(session), encoding="utf-8")
+
+    for stale in list_profiles()[settings.PROFILE_MAX_FILES:]:
+        stale.unlink(missing_ok=True)
@@ -0,0 +1,47 @@
+"""
+Query Stats Middleware - SQL statements and DB time per request
+Optionally reported to the client in a Server-Timing header
+"""
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.query_stats import begin_request, end_request, report_request
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware collecting SQL statistics per request
+
+    Server-Timing reflects the statements run before the response started; the
+    session commit of `get_db` runs after it and only shows up in the logs
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = begin_request()
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            if self.server_timing and message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_time * 1000:.1f};desc="{stats.count} queries", '
+                    f"app;dur={(time.perf_counter() - started) * 1000:.1f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request(token)
+            report_request(stats, scope["method"], scope["path"])
@@ -6,6 +6,8 @@ from typing import Dict
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Request, status
 
+from src.core.config import settings
+
 
 class RateLimiter:
     """
@@ -71,6 +73,9 @@ async def rate_limit_login(request: Request):
         async def login(...):
             ...
     """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
     # Get email from request body
     body = await request.json()
     email = body.get("email", "")
@@ -102,6 +107,9 @@ async def rate_limit_register(request: Request):
         async def register(...):
             ...
     """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
     # Get client IP
     client_ip = request.client.host
 
@@ -2,22 +2,38 @@
 SQLAlchemy Models
 Import all models here for Alembic autogenerate
 """
-from src.models.user import User
+from src.models.user import User, UserRole
 from src.models.user_profile import UserProfile, FitnessObjective, ExperienceLevel
 from src.models.exercise import Exercise
-from src.models.workout_plan import WorkoutPlan
+from src.models.workout_plan import WorkoutPlan, WorkoutPlanStatus
+from src.models.weekly_plan import WeeklyPlan
+from src.models.workout_template import WorkoutTemplate
+from src.models.plan_dictionary import PlanDictionary
 from src.models.workout_log import WorkoutLog
 from src.models.nutrition_plan import NutritionPlan
 from src.models.chat_session import ChatSession
+from src.models.chat_summary import ChatSummary
+from src.models.llm_usage import LLMUsageRecord
+from src.models.body_weight_entry import BodyWeightEntry
+from src.models.weight_trend import WeightTrend
 
 __all__ = [
     "User",
+    "UserRole",
     "UserProfile",
     "FitnessObjective",
     "ExperienceLevel",
     "Exercise",
     "WorkoutPlan",
+    "WorkoutPlanStatus",
+    "WeeklyPlan",
+    "WorkoutTemplate",
+    "PlanDictionary",
     "WorkoutLog",
     "NutritionPlan",
     "ChatSession",
+    "ChatSummary",
+    "LLMUsageRecord",
+    "BodyWeightEntry",
+    "WeightTrend",
 ]
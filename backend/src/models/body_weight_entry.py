@@ -0,0 +1,33 @@
+"""
+BodyWeightEntry Model - Append-only body-weight series (one point per user and day)
+"""
+from sqlalchemy import Column, Integer, SmallInteger, Date, ForeignKey
+from sqlalchemy.orm import relationship
+
+from src.core.database import Base
+
+
+class BodyWeightEntry(Base):
+    """
+    Daily body-weight measurement - input of the adaptive TDEE estimator
+    Stored compactly: the (user_id, day) primary key is the only index and
+    values are small integers (re-logging a day replaces that day's value)
+    """
+
+    __tablename__ = "body_weight_entries"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    recorded_on = Column(Date, primary_key=True)
+
+    weight_hg = Column(SmallInteger, nullable=False)  # Tenths of a kg (78.4 kg -> 784)
+    intake_kcal = Column(SmallInteger, nullable=False)  # Calorie target in effect (assumed intake)
+
+    # Relationships
+    user = relationship("User", back_populates="body_weight_entries")
+
+    @property
+    def weight_kg(self) -> float:
+        return self.weight_hg / 10
+
+    def __repr__(self):
+        return f"<BodyWeightEntry(user_id={self.user_id}, day={self.recorded_on}, weight_kg={self.weight_kg})>"
@@ -3,7 +3,7 @@ ChatSession Model - Technical consultation chat history
 """
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from src.core.database import Base
@@ -16,9 +16,11 @@ class ChatSession(Base):
     """
 
     __tablename__ = "chat_sessions"
+    # Serves "latest turns of a user" (chat context) without sorting the user's whole history
+    __table_args__ = (Index("ix_chat_sessions_user_id_id", "user_id", "id"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # Chat content
     question = Column(Text, nullable=False)  # User's question (max 1000 chars enforced in Pydantic)
@@ -0,0 +1,32 @@
+"""
+ChatSummary Model - Rolling summary of a user's older chat turns
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+
+from src.core.database import Base
+
+
+class ChatSummary(Base):
+    """
+    Condensed conversation history sent instead of old turns
+    Covers every ChatSession of the user up to summarized_until_id; newer turns are resent verbatim
+    """
+
+    __tablename__ = "chat_summaries"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    summary = Column(Text, nullable=False)
+    summarized_until_id = Column(Integer, nullable=False)  # Last ChatSession.id folded in
+    turns_summarized = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships
+    user = relationship("User", back_populates="chat_summary")
+
+    def __repr__(self):
+        return f"<ChatSummary(user_id={self.user_id}, until={self.summarized_until_id}, turns={self.turns_summarized})>"
@@ -0,0 +1,47 @@
+"""
+LLMUsageRecord Model - Token usage and cost per LLM call
+"""
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+
+from src.core.database import Base
+
+
+class LLMUsageRecord(Base):
+    """
+    One row per Claude call - used for budgets, billing and capacity planning
+    """
+
+    __tablename__ = "llm_usage"
+    __table_args__ = (Index("ix_llm_usage_user_created", "user_id", "created_at"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # None for system work not made on behalf of a user (template pre-generation)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+
+    # Call context
+    model = Column(String(100), nullable=False)
+    endpoint = Column(String(50), nullable=False)  # "workout_generate", "chat", ...
+
+    # Token accounting
+    input_tokens = Column(Integer, nullable=False, default=0)
+    output_tokens = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+    latency_ms = Column(Integer, nullable=False, default=0)
+
+    # Budget held for a call in progress (UsageService.reserve), zero tokens until settled
+    pending = Column(Boolean, nullable=False, default=False)
+
+    # Timestamp
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    user = relationship("User", back_populates="llm_usage")
+
+    def __repr__(self):
+        return (
+            f"<LLMUsageRecord(id={self.id}, user_id={self.user_id}, "
+            f"tokens={self.input_tokens}+{self.output_tokens})>"
+        )
@@ -3,7 +3,7 @@ NutritionPlan Model - Calculated macros and TDEE
 """
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 
 from src.core.database import Base
@@ -22,6 +22,8 @@ class NutritionPlan(Base):
 
     # Calculated values
     tdee = Column(Float, nullable=False)  # Total Daily Energy Expenditure (kcal)
+    target_calories = Column(Float, nullable=False)  # TDEE adjusted for the objective
+    tdee_source = Column(String(20), nullable=False, default="formula")  # "formula" or "adaptive" (weight trend)
     protein_g = Column(Float, nullable=False)
     carbs_g = Column(Float, nullable=False)
     fat_g = Column(Float, nullable=False)
@@ -34,4 +36,4 @@ class NutritionPlan(Base):
     user = relationship("User", back_populates="nutrition_plans")
 
     def __repr__(self):
-        return f"<NutritionPlan(id={self.id}, user_id={self.user_id}, tdee={self.tdee})>"
+        return f"<NutritionPlan(id={self.id}, user_id={self.user_id}, tdee={self.tdee}, target_calories={self.target_calories})>"
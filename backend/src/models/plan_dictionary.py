@@ -0,0 +1,27 @@
+"""
+PlanDictionary Model - Shared compression dictionaries for stored plans
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, DateTime, LargeBinary
+
+from src.core.database import Base
+
+
+class PlanDictionary(Base):
+    """
+    zlib preset dictionary trained on existing plans (scripts/train_plan_dictionary.py)
+    Append-only: compressed rows reference the dictionary id they were written with
+    """
+
+    __tablename__ = "plan_dictionaries"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    dictionary = Column(LargeBinary, nullable=False)
+    sample_size = Column(Integer, nullable=False)  # Plans used for training
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<PlanDictionary(id={self.id}, bytes={len(self.dictionary or b'')})>"
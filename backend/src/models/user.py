@@ -3,12 +3,21 @@ User Model - Authentication
 """
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
 from sqlalchemy.orm import relationship
+import enum
 
 from src.core.database import Base
 
 
+class UserRole(str, enum.Enum):
+    """Account role for authorization"""
+
+    USER = "user"  # Regular member
+    COACH = "coach"  # Gym partner coach, manages assigned clients
+    ADMIN = "admin"  # Operators (debug/profiling endpoints, all clients)
+
+
 class User(Base):
     """
     User account for authentication
@@ -20,6 +29,10 @@ class User(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
+    role = Column(
+        Enum(UserRole), nullable=False, default=UserRole.USER, server_default=UserRole.USER.name
+    )
+    coach_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
@@ -32,6 +45,9 @@ class User(Base):
     workout_plans = relationship(
         "WorkoutPlan", back_populates="user", cascade="all, delete-orphan"
     )
+    weekly_plans = relationship(
+        "WeeklyPlan", back_populates="user", cascade="all, delete-orphan"
+    )
     workout_logs = relationship(
         "WorkoutLog", back_populates="user", cascade="all, delete-orphan"
     )
@@ -41,6 +57,18 @@ class User(Base):
     chat_sessions = relationship(
         "ChatSession", back_populates="user", cascade="all, delete-orphan"
     )
+    chat_summary = relationship(
+        "ChatSummary", back_populates="user", uselist=False, cascade="all, delete-orphan"
+    )
+    llm_usage = relationship(
+        "LLMUsageRecord", back_populates="user", cascade="all, delete-orphan"
+    )
+    body_weight_entries = relationship(
+        "BodyWeightEntry", back_populates="user", cascade="all, delete-orphan"
+    )
+    weight_trend = relationship(
+        "WeightTrend", back_populates="user", uselist=False, cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
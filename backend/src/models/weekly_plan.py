@@ -0,0 +1,39 @@
+"""
+WeeklyPlan Model - Group of per-day workout plans generated together
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy.orm import relationship
+
+from src.core.database import Base
+
+
+class WeeklyPlan(Base):
+    """
+    Weekly routine (FR-005) - one WorkoutPlan per training day
+    """
+
+    __tablename__ = "weekly_plans"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Split chosen by the local planner
+    split_days = Column(JSON, nullable=False)  # ["push", "pull", "legs"]
+    weekly_volume = Column(JSON, nullable=False)  # {"pecho": 12, "espalda": 14, ...} sets per week
+
+    # Fatigue context
+    fatigue_score_used = Column(Integer, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    user = relationship("User", back_populates="weekly_plans")
+    day_plans = relationship(
+        "WorkoutPlan", back_populates="weekly_plan", order_by="WorkoutPlan.day_index"
+    )
+
+    def __repr__(self):
+        return f"<WeeklyPlan(id={self.id}, user_id={self.user_id}, days={len(self.split_days or [])})>"
@@ -0,0 +1,41 @@
+"""
+WeightTrend Model - Running state of the exponentially weighted weight regression
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+
+from src.core.database import Base
+
+
+class WeightTrend(Base):
+    """
+    Decayed sufficient statistics of the user's body-weight series
+    Updated in O(1) per logged point; rebuilt by scripts/rebuild_weight_trends.py
+    Time t is in days relative to last_day (t <= 0), each point weighted by decay^-t
+    """
+
+    __tablename__ = "weight_trends"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    first_day = Column(Integer, nullable=False)  # date.toordinal()
+    last_day = Column(Integer, nullable=False)
+    points = Column(Integer, nullable=False)
+
+    # Σw, Σw·t, Σw·t², Σw·y, Σw·t·y (y = kg) and Σw·intake (kcal)
+    s0 = Column(Float, nullable=False)
+    st = Column(Float, nullable=False)
+    stt = Column(Float, nullable=False)
+    sy = Column(Float, nullable=False)
+    sty = Column(Float, nullable=False)
+    si = Column(Float, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships
+    user = relationship("User", back_populates="weight_trend")
+
+    def __repr__(self):
+        return f"<WeightTrend(user_id={self.user_id}, points={self.points}, last_day={self.last_day})>"
@@ -3,12 +3,22 @@ WorkoutPlan Model - Generated workout plans from LLM
 """
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON, Enum
 from sqlalchemy.orm import relationship
+import enum
 
+from src.core.compressed_json import CompressedJSON
+from src.core.config import settings
 from src.core.database import Base
 
 
+class WorkoutPlanStatus(str, enum.Enum):
+    """Lifecycle of a stored plan"""
+
+    READY = "ready"  # Visible to the user (history, detail)
+    PENDING = "pending"  # Pre-generated off-peak, waiting to be claimed by /generate
+
+
 class WorkoutPlan(Base):
     """
     LLM-generated workout plan for user
@@ -20,18 +30,39 @@ class WorkoutPlan(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
 
-    # Plan data (structured JSON from LLM response)
-    plan_data = Column(JSON, nullable=False)
-    # Example: {"workout_plan": [{"musculo": "...", "ejercicio": "...", ...}], "disclaimer_medico": "..."}
+    # Plan data (compact JSON referencing catalog exercises, see services/plan_codec.py)
+    # PLAN_STORAGE_COMPRESSED stores it as zlib binary, decoded on first access
+    plan_data = Column(
+        CompressedJSON(count_key="blocks") if settings.PLAN_STORAGE_COMPRESSED else JSON,
+        nullable=False,
+    )
+    # Example: {"format": 2, "f": 50, "blocks": [{"id": 12, "s": 4, "r": "8-12", "rpe": 7, "d": 90}]}
+    # Legacy rows: {"workout_plan": [{"musculo": "...", "ejercicio": "...", ...}], "disclaimer_medico": "..."}
 
     # Fatigue context
     fatigue_score_used = Column(Integer, nullable=False)  # 0-100 score at generation time
 
+    # Plan lifecycle (pending plans come from the nightly prefetch job)
+    status = Column(
+        Enum(WorkoutPlanStatus),
+        nullable=False,
+        default=WorkoutPlanStatus.READY,
+        server_default=WorkoutPlanStatus.READY.name,
+        index=True,
+    )
+
+    # Weekly grouping (null for single-session plans)
+    weekly_plan_id = Column(
+        Integer, ForeignKey("weekly_plans.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+    day_index = Column(Integer, nullable=True)  # 0-based position in the week
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="workout_plans")
+    weekly_plan = relationship("WeeklyPlan", back_populates="day_plans")
 
     def __repr__(self):
         return f"<WorkoutPlan(id={self.id}, user_id={self.user_id}, fatigue={self.fatigue_score_used})>"
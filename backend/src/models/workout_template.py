@@ -0,0 +1,42 @@
+"""
+WorkoutTemplate Model - Pre-generated plans per profile bucket
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, Enum, JSON
+
+from src.core.database import Base
+from src.models.user_profile import FitnessObjective, ExperienceLevel
+
+
+class WorkoutTemplate(Base):
+    """
+    High-quality plan generated offline for a profile bucket
+    (objective x experience x training days x equipment set x fatigue band)
+    Served with deterministic per-user adjustments instead of an LLM call
+    """
+
+    __tablename__ = "workout_templates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    bucket_key = Column(String(255), unique=True, nullable=False, index=True)
+
+    # Bucket dimensions
+    objective = Column(Enum(FitnessObjective), nullable=False)
+    experience_level = Column(Enum(ExperienceLevel), nullable=False)
+    training_days_per_week = Column(Integer, nullable=False)
+    equipment = Column(JSON, nullable=False)  # Sorted, lowercased equipment list
+    fatigue_band = Column(String(20), nullable=False)  # "low", "normal", "moderate", "high"
+    reference_fatigue_score = Column(Integer, nullable=False)
+
+    # Plan data (same shape as WorkoutPlan.plan_data)
+    plan_data = Column(JSON, nullable=False)
+
+    # Number of profiles in the bucket when generated
+    profile_count = Column(Integer, nullable=False, default=0)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<WorkoutTemplate(id={self.id}, bucket={self.bucket_key})>"
@@ -0,0 +1,24 @@
+"""
+Pydantic Schemas for Technical Consultation Chat
+"""
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class ChatRequest(BaseModel):
+    """Question about technique, equipment or training concepts"""
+
+    question: str = Field(..., min_length=1, max_length=1000)
+
+
+class ChatResponse(BaseModel):
+    """One stored chat exchange"""
+
+    id: int
+    question: str
+    response: str
+    question_category: str  # "technique", "equipment", "concept", "injury_caution"
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
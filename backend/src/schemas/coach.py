@@ -0,0 +1,16 @@
+"""
+Pydantic Schemas for Coach Cohort Operations
+"""
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from src.core.config import settings
+
+
+class CohortGenerateRequest(BaseModel):
+    """Generate workout plans for many clients at once"""
+
+    user_ids: List[int] = Field(..., min_items=1, max_items=settings.COACH_BATCH_MAX_USERS)
+    fatigue_score: Optional[int] = Field(
+        default=50, ge=0, le=100, description="Fatigue score for every plan (defaults to 50)"
+    )
@@ -0,0 +1,34 @@
+"""
+Pydantic Schemas for the Exercise Catalog
+"""
+from typing import List
+from pydantic import BaseModel
+
+
+class ExerciseAlternative(BaseModel):
+    """Catalog exercise suggested as a substitute"""
+
+    id: int
+    name: str
+    muscle_groups: List[str]
+    equipment: str
+    similarity: float  # Weighted Jaccard over muscle groups (0-1)
+
+
+class ExerciseAlternativesResponse(BaseModel):
+    """Alternatives for one exercise (FR-024)"""
+
+    exercise_id: int
+    name: str
+    equipment: str
+    alternatives: List[ExerciseAlternative]
+
+
+class ExerciseSearchResult(BaseModel):
+    """Catalog exercise matching a search query"""
+
+    id: int
+    name: str
+    muscle_groups: List[str]
+    equipment: str
+    score: float  # Trigram match score (0-1)
@@ -0,0 +1,41 @@
+"""
+Pydantic Schemas for Nutrition Calculator
+"""
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class NutritionPlanResponse(BaseModel):
+    """Daily TDEE and macro targets for the user's current profile"""
+
+    tdee: float
+    tdee_source: str  # "formula" (Mifflin-St Jeor) or "adaptive" (weight trend)
+    target_calories: float
+    protein_g: float
+    carbs_g: float
+    fat_g: float
+    calculated_at: datetime
+    disclaimer: str
+
+
+class WeightLogRequest(BaseModel):
+    """Log a body-weight measurement (defaults to today)"""
+
+    weight_kg: float = Field(..., gt=0, le=500)
+    recorded_on: Optional[date] = None
+
+
+class WeightEntryResponse(BaseModel):
+    """One day of the body-weight series"""
+
+    recorded_on: date
+    weight_kg: float
+
+
+class WeightHistoryResponse(BaseModel):
+    """Body-weight series with the fitted trend (null until enough weigh-ins)"""
+
+    entries: List[WeightEntryResponse]
+    trend_weight_kg: Optional[float] = None
+    trend_kg_per_week: Optional[float] = None
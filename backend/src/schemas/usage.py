@@ -0,0 +1,20 @@
+"""
+Pydantic Schemas for LLM Usage Accounting
+"""
+from pydantic import BaseModel
+
+
+class UsageSummaryResponse(BaseModel):
+    """User's LLM usage in the rolling window plus lifetime totals"""
+
+    window_hours: int
+    generations_used: int
+    generation_limit: int
+    chat_messages_used: int
+    chat_message_limit: int
+    input_tokens: int
+    output_tokens: int
+    token_limit: int
+    cost_usd: float
+    lifetime_generations: int
+    lifetime_cost_usd: float
@@ -2,7 +2,7 @@
 Pydantic Schemas for Workout Plans
 Based on spec.md Technical Deep Dive
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -73,3 +73,25 @@ class WorkoutPlanDetail(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class WeeklyPlanDay(BaseModel):
+    """One training day of a weekly plan"""
+
+    day_index: int
+    focus: str
+    workout_plan_id: int
+    workout_plan: List[ExerciseBlock]
+    ajuste_aplicado: Optional[str] = None
+
+
+class WeeklyPlanResponse(BaseModel):
+    """Weekly plan (FR-005) with per-day sessions and weekly volume per muscle group"""
+
+    id: int
+    split_days: List[str]
+    weekly_volume: Dict[str, int] = Field(..., description="Sets per muscle group per week")
+    days: List[WeeklyPlanDay]
+    disclaimer_medico: str
+    fatiga_score_usado: int
+    created_at: datetime
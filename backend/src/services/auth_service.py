@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from src.models.user import User
-from src.core.security import hash_password, verify_password, create_access_token, create_refresh_token
+from src.core.security import password_hash_pool, create_access_token, create_refresh_token
 from src.schemas.auth import RegisterRequest, LoginRequest, TokenResponse
 
 
@@ -36,7 +36,7 @@ class AuthService:
             raise ValueError("Email already registered")
 
         # Create new user
-        hashed_password = hash_password(request.password)
+        hashed_password = await password_hash_pool.hash(request.password)
         new_user = User(email=request.email, password_hash=hashed_password)
 
         db.add(new_user)
@@ -65,7 +65,7 @@ class AuthService:
             return None
 
         # Verify password
-        if not verify_password(request.password, user.password_hash):
+        if not await password_hash_pool.verify(request.password, user.password_hash):
             return None
 
         return user
@@ -0,0 +1,189 @@
+"""
+Body Weight Service - Append-only weight series and incremental trend updates
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.body_weight_entry import BodyWeightEntry
+from src.models.user import User
+from src.models.user_profile import UserProfile
+from src.models.weight_trend import WeightTrend
+from src.services.nutrition_service import NutritionService, calculate_targets, profile_inputs
+from src.services.weight_trend import add_point, fit, fit_all
+
+
+class BodyWeightService:
+    """Service for body-weight logging"""
+
+    @staticmethod
+    async def record_entry(
+        db: AsyncSession, profile: UserProfile, weight_kg: float, day: date
+    ) -> BodyWeightEntry:
+        """
+        Store the day's weight and update the trend in place (caller commits)
+
+        Re-logging a day replaces its value: the old point is removed from the
+        trend sums and the new one added, so no rebuild is needed. Concurrent
+        weigh-ins of a user are serialized on the trend row (on the user row
+        before the first one), so no point is lost or counted twice.
+
+        Args:
+            db: Database session
+            profile: User profile (intake assumption for new points)
+            weight_kg: Measured weight
+            day: Measurement day
+
+        Returns:
+            The day's BodyWeightEntry
+        """
+        weight_hg = round(weight_kg * 10)
+        ordinal = day.toordinal()
+        trend = await db.get(WeightTrend, profile.user_id, with_for_update=True)
+        if trend is None:
+            # No trend row to lock yet
+            await db.execute(select(User.id).where(User.id == profile.user_id).with_for_update())
+            trend = await db.get(WeightTrend, profile.user_id, with_for_update=True, populate_existing=True)
+        entry = await db.get(BodyWeightEntry, (profile.user_id, day), populate_existing=True)
+
+        if entry is not None:
+            if entry.weight_hg == weight_hg:
+                return entry
+            if trend is not None:
+                add_point(trend, ordinal, entry.weight_kg, entry.intake_kcal, sign=-1)
+            intake_kcal = entry.intake_kcal
+        else:
+            intake_kcal = await BodyWeightService._current_intake(db, profile)
+
+        upsert = (
+            insert(BodyWeightEntry)
+            .values(user_id=profile.user_id, recorded_on=day, weight_hg=weight_hg, intake_kcal=intake_kcal)
+            .on_conflict_do_update(
+                index_elements=[BodyWeightEntry.user_id, BodyWeightEntry.recorded_on],
+                set_={"weight_hg": weight_hg},
+            )
+            .returning(BodyWeightEntry)
+        )
+        result = await db.execute(
+            select(BodyWeightEntry).from_statement(upsert).execution_options(populate_existing=True)
+        )
+        entry = result.scalar_one()
+
+        if trend is None:
+            # First point, or a trend row that went missing: derive it from the series
+            await BodyWeightService.rebuild_trend(db, profile.user_id)
+        else:
+            add_point(trend, ordinal, entry.weight_kg, entry.intake_kcal)
+        return entry
+
+    @staticmethod
+    async def log_weight(
+        db: AsyncSession, profile: UserProfile, weight_kg: float, day: date
+    ) -> BodyWeightEntry:
+        """
+        Log a past day's weight (today's weight goes through the profile update)
+
+        Args:
+            db: Database session
+            profile: User profile
+            weight_kg: Measured weight
+            day: Measurement day
+
+        Returns:
+            The stored BodyWeightEntry
+
+        Raises:
+            ValueError: If the day is in the future
+        """
+        if day > datetime.utcnow().date():
+            raise ValueError("Weight cannot be logged for a future date")
+
+        entry = await BodyWeightService.record_entry(db, profile, weight_kg, day)
+        await db.commit()
+        return entry
+
+    @staticmethod
+    async def rebuild_trend(db: AsyncSession, user_id: int) -> Optional[WeightTrend]:
+        """
+        Recompute the user's trend state from the full series (caller commits)
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            WeightTrend, or None if the user has no entries
+        """
+        result = await db.execute(
+            select(BodyWeightEntry.recorded_on, BodyWeightEntry.weight_hg, BodyWeightEntry.intake_kcal)
+            .where(BodyWeightEntry.user_id == user_id)
+            .order_by(BodyWeightEntry.recorded_on)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+
+        (state,) = fit_all(
+            [user_id] * len(rows),
+            [row.recorded_on.toordinal() for row in rows],
+            [row.weight_hg / 10 for row in rows],
+            [row.intake_kcal for row in rows],
+        )
+        trend = await db.get(WeightTrend, user_id)
+        if trend is None:
+            trend = WeightTrend(user_id=user_id)
+            db.add(trend)
+        for field, value in state.items():
+            setattr(trend, field, value)
+        return trend
+
+    @staticmethod
+    async def get_history(db: AsyncSession, user_id: int, days: int) -> List[BodyWeightEntry]:
+        """
+        Get the user's weight entries of the last `days` days, oldest first
+
+        Args:
+            db: Database session
+            user_id: User ID
+            days: Window size
+
+        Returns:
+            List of BodyWeightEntry
+        """
+        since = datetime.utcnow().date() - timedelta(days=days)
+        result = await db.execute(
+            select(BodyWeightEntry)
+            .where(BodyWeightEntry.user_id == user_id, BodyWeightEntry.recorded_on >= since)
+            .order_by(BodyWeightEntry.recorded_on)
+        )
+        return list(result.scalars())
+
+    @staticmethod
+    async def get_trend(db: AsyncSession, user_id: int) -> Optional[Tuple[float, float]]:
+        """
+        Get the fitted weight trend
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            (trend weight in kg, change in kg per week), or None until the series is long enough
+        """
+        trend = await db.get(WeightTrend, user_id)
+        fitted = fit(trend) if trend is not None else None
+        if fitted is None:
+            return None
+        level, slope, _ = fitted
+        return level, slope * 7
+
+    @staticmethod
+    async def _current_intake(db: AsyncSession, profile: UserProfile) -> int:
+        """Calorie target in effect (latest plan, else the formula target)"""
+        plan = await NutritionService.get_latest_plan(db, profile.user_id)
+        if plan is not None:
+            return round(plan.target_calories)
+        return round(calculate_targets(*profile_inputs(profile)).target_calories)
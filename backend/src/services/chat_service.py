@@ -0,0 +1,413 @@
+"""
+Chat Service - Technical consultation chat (FR-022 to FR-027)
+
+Answers are streamed from Claude chunk by chunk. Conversational context is bounded:
+the most recent turns that fit CHAT_CONTEXT_TOKEN_BUDGET are resent verbatim and
+everything older is represented by a stored rolling summary (ChatSummary), updated in
+the background as turns fall out of the window. Prompt size, and with it latency
+and cost per turn, therefore does not grow with the length of a user's history.
+"""
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.core.metrics import CHAT_PROMPT_TOKENS
+from src.core.text import normalize_text
+from src.models.chat_session import ChatSession
+from src.models.chat_summary import ChatSummary
+from src.models.user import User
+from src.services.llm_scheduler import Priority
+from src.services.llm_service import llm_service
+from src.services.usage_service import CHAT_ENDPOINT, BudgetReservation, LLMUsage, UsageService
+
+logger = logging.getLogger(__name__)
+
+# Keyword rules (matched at word starts of the normalized question), checked in this
+# order: the first matching category wins
+MEDICAL_TERMS = (
+    # Symptoms: answered with MEDICAL_REFUSAL, never sent to Claude
+    "dolor", "duele", "molestia", "cruje", "crujido", "chasquido", "hinchazon", "hinchado", "inflamad",
+    "hormigueo", "entumec", "diagnost", "tendinitis", "hernia",
+    "pain", "hurt", "ache", "crack", "swell", "numbness", "diagnos",
+)
+EQUIPMENT_TERMS = (
+    "sustitu", "alternativ", "reemplaz", "en vez de", "en lugar de", "no tengo", "sin maquina",
+    "equipamiento", "mancuerna", "barra", "polea", "maquina", "banda", "kettlebell",
+    "substitut", "instead of", "replace", "equipment", "dumbbell", "barbell", "cable", "machine",
+)
+CONCEPT_TERMS = (
+    "que es", "que significa", "por que", "para que", "diferencia", "rpe", "sobrecarga", "volumen",
+    "hipertrofia", "descarga", "periodiz", "frecuencia", "fallo muscular",
+    "what is", "what does", "why", "difference", "overload", "deload",
+)
+CATEGORY_PATTERNS = [
+    (category, re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + ")"))
+    for category, terms in (
+        ("injury_caution", MEDICAL_TERMS),
+        ("equipment", EQUIPMENT_TERMS),
+        ("concept", CONCEPT_TERMS),
+    )
+]
+
+MEDICAL_REFUSAL = (
+    "No puedo diagnosticar dolores, lesiones ni otros síntomas. Si notas dolor o molestias al "
+    "entrenar, detén el ejercicio y consulta con un profesional de la salud (médico o "
+    "fisioterapeuta). Cuando te hayan valorado, puedo ayudarte a adaptar tu entrenamiento."
+)
+
+SYSTEM_PROMPT = """Eres un entrenador personal experto que resuelve dudas técnicas de gimnasio.
+
+**REGLAS:**
+1. Técnica de ejercicios: instrucciones paso a paso (máximo 20 palabras por frase), errores comunes y señales visuales
+2. Sustituciones de equipamiento: alternativas basadas en evidencia que trabajen el mismo patrón y músculos
+3. Conceptos de entrenamiento: lenguaje sencillo con referencia al principio científico (sobrecarga progresiva, especificidad, recuperación)
+4. Nunca diagnostiques dolor, lesiones ni síntomas: recomienda consultar con un profesional de la salud
+5. Lenguaje apto para principiantes, sin jerga innecesaria
+6. Responde de forma breve y en el idioma de la pregunta"""
+
+SUMMARY_PROMPT = """Resume la conversación entre un usuario y su entrenador personal para usarla como contexto en respuestas futuras.
+
+{previous}**NUEVOS INTERCAMBIOS:**
+{turns}
+
+**INSTRUCCIONES:**
+1. Conserva solo lo útil para futuras respuestas: ejercicios, equipamiento, objetivos, limitaciones y dudas recurrentes
+2. Integra el resumen anterior, si existe, en un único resumen
+3. Máximo {max_words} palabras, en prosa, sin encabezados
+
+Resumen:"""
+
+TURN_OVERHEAD_TOKENS = 8  # Role markers per message
+
+# Background summarizations (strong references) and users being summarized in this process
+_summary_tasks: Set[asyncio.Task] = set()
+_summarizing: Set[int] = set()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for context budgeting"""
+    return len(text) // 4 + 1
+
+
+def turn_tokens(turn: ChatSession) -> int:
+    return estimate_tokens(turn.question) + estimate_tokens(turn.response) + 2 * TURN_OVERHEAD_TOKENS
+
+
+def select_recent_turns(turns_newest_first: List[ChatSession]) -> List[ChatSession]:
+    """
+    Newest turns that fit CHAT_CONTEXT_TOKEN_BUDGET, oldest first
+
+    Args:
+        turns_newest_first: Candidate turns ordered by id descending
+
+    Returns:
+        Turns to resend verbatim, in conversation order
+    """
+    selected = []
+    used = 0
+    for turn in turns_newest_first:
+        cost = turn_tokens(turn)
+        if used + cost > settings.CHAT_CONTEXT_TOKEN_BUDGET:
+            break
+        selected.append(turn)
+        used += cost
+    return selected[::-1]
+
+
+class ChatService:
+    """Service for technical consultation chat"""
+
+    @staticmethod
+    def classify_question(question: str) -> str:
+        """
+        Categorize a question with keyword rules (no LLM call)
+
+        Args:
+            question: User's question
+
+        Returns:
+            "injury_caution", "equipment", "concept" or "technique"
+        """
+        text = normalize_text(question)
+        for category, pattern in CATEGORY_PATTERNS:
+            if pattern.search(text):
+                return category
+        return "technique"
+
+    @staticmethod
+    def needs_llm(category: str) -> bool:
+        """False for categories answered with a canned text (medical referral)"""
+        return category != "injury_caution"
+
+    @staticmethod
+    async def load_context(
+        db: AsyncSession, user_id: int
+    ) -> Tuple[Optional[ChatSummary], List[ChatSession], bool]:
+        """
+        Load the rolling summary and the recent turns that fit the context budget
+
+        Reads at most CHAT_CONTEXT_MAX_TURNS rows, however long the history is.
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            Tuple of (summary or None, recent turns oldest first, True if unsummarized
+            turns were left out of the window)
+        """
+        summary = await db.get(ChatSummary, user_id)
+        since = summary.summarized_until_id if summary else 0
+        result = await db.execute(
+            select(ChatSession)
+            .where(ChatSession.user_id == user_id, ChatSession.id > since)
+            .order_by(ChatSession.id.desc())
+            .limit(settings.CHAT_CONTEXT_MAX_TURNS)
+        )
+        rows = [turn for turn in result.scalars() if turn.response]
+        recent = select_recent_turns(rows)
+        overflow = len(recent) < len(rows) or len(rows) == settings.CHAT_CONTEXT_MAX_TURNS
+        return summary, recent, overflow
+
+    @staticmethod
+    def build_messages(
+        summary: Optional[ChatSummary], recent: List[ChatSession], question: str
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        Build the system prompt and alternating message list for Claude
+
+        Args:
+            summary: Rolling summary of older turns
+            recent: Recent turns, oldest first
+            question: New question
+
+        Returns:
+            Tuple of (system prompt, messages)
+        """
+        system = SYSTEM_PROMPT
+        if summary is not None:
+            system += f"\n\n**RESUMEN DE LA CONVERSACIÓN ANTERIOR:**\n{summary.summary}"
+
+        messages = []
+        for turn in recent:
+            messages.append({"role": "user", "content": turn.question})
+            messages.append({"role": "assistant", "content": turn.response})
+        messages.append({"role": "user", "content": question})
+        return system, messages
+
+    @staticmethod
+    async def stream_answer(
+        db: AsyncSession, user: User, question: str, category: Optional[str] = None
+    ) -> AsyncIterator[dict]:
+        """
+        Answer a question, streaming the text as it is generated
+
+        Medical questions get the standard refusal without calling Claude (FR-026).
+        Other answers are billed to the user's chat budget (reserved before the
+        call). The exchange is stored once the answer is complete; a client that
+        disconnects mid-answer cancels the call and nothing is stored, but the
+        part already generated is billed all the same.
+
+        Args:
+            db: Database session (context loading, before the first event)
+            user: Current user
+            question: User's question
+            category: classify_question(question), if already known
+
+        Yields:
+            {"type": "delta", "text"} events, then one {"type": "done", ...} event with
+            the stored exchange's id, question_category and created_at
+
+        Raises:
+            BudgetExceededError: If the chat budget is used up (before the first event)
+            LLMOverloadedError: If the scheduler sheds the call (before the first event)
+        """
+        if category is None:
+            category = ChatService.classify_question(question)
+        reservation = None
+        unbilled: Optional[LLMUsage] = None
+        overflow = False
+
+        try:
+            if not ChatService.needs_llm(category):
+                answer = MEDICAL_REFUSAL
+                yield {"type": "delta", "text": answer}
+            else:
+                reservation = await UsageService.reserve(user.id, CHAT_ENDPOINT)
+                summary, recent, overflow = await ChatService.load_context(db, user.id)
+                system, messages = ChatService.build_messages(summary, recent, question)
+                prompt_tokens = estimate_tokens(system) + sum(
+                    estimate_tokens(m["content"]) + TURN_OVERHEAD_TOKENS for m in messages
+                )
+                CHAT_PROMPT_TOKENS.observe(prompt_tokens)
+
+                stream = llm_service.stream_message(messages, system=system, max_tokens=settings.CHAT_MAX_TOKENS)
+                chunks = []
+                try:
+                    async for text in stream:
+                        chunks.append(text)
+                        yield {"type": "delta", "text": text}
+                finally:
+                    await stream.aclose()
+                    unbilled = stream.usage
+                    if unbilled is None and chunks:
+                        # Failed or abandoned mid-answer: estimate what was generated so far
+                        unbilled = LLMUsage(
+                            model=settings.LLM_MODEL,
+                            input_tokens=prompt_tokens,
+                            output_tokens=estimate_tokens("".join(chunks)),
+                        )
+                answer = "".join(chunks)
+
+                # The new turn may push older ones out of the window
+                used = sum(turn_tokens(turn) for turn in recent)
+                new_turn = estimate_tokens(question) + estimate_tokens(answer) + 2 * TURN_OVERHEAD_TOKENS
+                overflow = (
+                    overflow
+                    or used + new_turn > settings.CHAT_CONTEXT_TOKEN_BUDGET
+                    or len(recent) + 1 > settings.CHAT_CONTEXT_MAX_TURNS
+                )
+
+            # The request's session may already be closed while the response streams
+            async with AsyncSessionLocal() as session:
+                turn = ChatSession(user_id=user.id, question=question, response=answer, question_category=category)
+                session.add(turn)
+                if unbilled is not None:
+                    await UsageService.settle(session, reservation, unbilled)
+                await session.commit()
+                unbilled = None
+                await session.refresh(turn)
+        finally:
+            if reservation is not None:
+                # Shielded: a disconnect cancels this generator, the billing must still finish
+                await asyncio.shield(ChatService._close_reservation(reservation, unbilled))
+
+        if overflow:
+            ChatService.schedule_summary(user.id)
+
+        yield {
+            "type": "done",
+            "id": turn.id,
+            "question_category": category,
+            "created_at": turn.created_at.isoformat(),
+        }
+
+    @staticmethod
+    async def _close_reservation(reservation: BudgetReservation, unbilled: Optional[LLMUsage]):
+        """Bill tokens spent on an answer that was not stored, then drop the held call"""
+        if unbilled is not None:
+            async with AsyncSessionLocal() as session:
+                await UsageService.settle(session, reservation, unbilled)
+                await session.commit()
+        await UsageService.release(reservation)
+
+    @staticmethod
+    async def get_history(db: AsyncSession, user: User, limit: int = 100) -> List[ChatSession]:
+        """
+        Get user's chat exchanges of the last CHAT_HISTORY_DAYS days, newest first
+
+        Args:
+            db: Database session
+            user: Current user
+            limit: Max number of exchanges
+
+        Returns:
+            List of ChatSession
+        """
+        since = datetime.utcnow() - timedelta(days=settings.CHAT_HISTORY_DAYS)
+        result = await db.execute(
+            select(ChatSession)
+            .where(ChatSession.user_id == user.id, ChatSession.created_at >= since)
+            .order_by(ChatSession.id.desc())
+            .limit(limit)
+        )
+        return list(result.scalars())
+
+    @staticmethod
+    def schedule_summary(user_id: int):
+        """Fold turns that left the context window into the summary, in the background"""
+        if user_id in _summarizing:
+            return
+        task = asyncio.create_task(ChatService.summarize_older_turns(user_id))
+        _summary_tasks.add(task)
+        task.add_done_callback(_summary_tasks.discard)
+
+    @staticmethod
+    async def summarize_older_turns(user_id: int) -> bool:
+        """
+        Fold up to CHAT_SUMMARY_BATCH_TURNS turns older than the context window into
+        the user's rolling summary (one Claude call)
+
+        Concurrent summarizations of the same user (other workers) are detected by
+        the summarized_until_id they started from; the loser's result is discarded.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            True if the summary was updated
+        """
+        if user_id in _summarizing:
+            return False
+        _summarizing.add(user_id)
+        try:
+            async with AsyncSessionLocal() as db:
+                summary, recent, _ = await ChatService.load_context(db, user_id)
+                since = summary.summarized_until_id if summary else 0
+
+                query = select(ChatSession).where(ChatSession.user_id == user_id, ChatSession.id > since)
+                if recent:
+                    query = query.where(ChatSession.id < recent[0].id)
+                result = await db.execute(query.order_by(ChatSession.id).limit(settings.CHAT_SUMMARY_BATCH_TURNS))
+                older = result.scalars().all()
+                if not older:
+                    return False
+
+                previous = f"**RESUMEN ANTERIOR:**\n{summary.summary}\n\n" if summary else ""
+                turns = "\n".join(f"- Usuario: {turn.question}\n  Entrenador: {turn.response}" for turn in older)
+                prompt = SUMMARY_PROMPT.format(
+                    previous=previous, turns=turns, max_words=settings.CHAT_SUMMARY_MAX_TOKENS * 3 // 4
+                )
+                text, usage = await llm_service.create_message(
+                    prompt, priority=Priority.PREFETCH, max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS, temperature=0.2
+                )
+
+                # Tokens are spent whether or not the summary below wins the race
+                UsageService.record_usage(db, user_id, usage, endpoint="chat_summary")
+                await db.commit()
+
+                values = {
+                    "summary": text.strip(),
+                    "summarized_until_id": older[-1].id,
+                    "turns_summarized": (summary.turns_summarized if summary else 0) + len(older),
+                }
+                if summary is None:
+                    db.add(ChatSummary(user_id=user_id, **values))
+                else:
+                    result = await db.execute(
+                        update(ChatSummary)
+                        .where(ChatSummary.user_id == user_id, ChatSummary.summarized_until_id == since)
+                        .values(**values, updated_at=datetime.utcnow())
+                    )
+                    if result.rowcount == 0:
+                        await db.rollback()
+                        return False
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    await db.rollback()
+                    return False
+                return True
+        except Exception as e:
+            logger.warning("Chat summary for user %s failed: %s", user_id, e)
+            return False
+        finally:
+            _summarizing.discard(user_id)
@@ -0,0 +1,202 @@
+"""
+Coach Service - Cohort workout generation for gym partner coaches
+Generates plans for many clients with one profile query, deduplicated prompts and bulk inserts
+"""
+import asyncio
+from typing import AsyncIterator, Dict, List, Tuple
+
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.response_cache import response_cache
+from src.core.database import AsyncSessionLocal
+from src.models.exercise import Exercise
+from src.models.user import User, UserRole
+from src.models.user_profile import UserProfile
+from src.models.workout_plan import WorkoutPlan
+from src.services.llm_scheduler import LLMOverloadedError, Priority
+from src.services.exercise_catalog import exercise_catalog
+from src.services.llm_service import llm_service
+from src.services.plan_codec import compact_plan_data
+from src.services.usage_service import BudgetExceededError, BudgetReservation, LLMUsage, UsageService
+from src.services.workout_service import WorkoutService
+
+
+class CoachService:
+    """Service for coach cohort operations"""
+
+    @staticmethod
+    async def load_client_profiles(
+        db: AsyncSession, coach: User, user_ids: List[int]
+    ) -> Dict[int, UserProfile]:
+        """
+        Load profiles of the requested users the coach is allowed to manage (one query)
+
+        Args:
+            db: Database session
+            coach: Authenticated coach or admin
+            user_ids: Requested client ids
+
+        Returns:
+            Dict of user_id -> UserProfile (users without access or profile are omitted)
+        """
+        query = select(UserProfile).join(User, User.id == UserProfile.user_id).where(
+            UserProfile.user_id.in_(user_ids)
+        )
+        if coach.role != UserRole.ADMIN:
+            query = query.where(User.coach_id == coach.id)
+
+        result = await db.execute(query)
+        return {profile.user_id: profile for profile in result.scalars().all()}
+
+    @staticmethod
+    async def generate_cohort(
+        coach: User, user_ids: List[int], fatigue_score: int
+    ) -> AsyncIterator[dict]:
+        """
+        Generate plans for a cohort, yielding progress events as they complete
+
+        Every client's plan counts against that client's own budget; clients over
+        budget are skipped. Identical prompts (same profile inputs) share one LLM
+        call, whose tokens are split across the group. Plans are bulk-inserted
+        every COACH_BATCH_INSERT_CHUNK results, each chunk in its own short
+        session: no connection is held while Claude generates.
+
+        Args:
+            coach: Authenticated coach or admin
+            user_ids: Client ids (duplicates ignored)
+            fatigue_score: Fatigue score used for every plan
+
+        Yields:
+            Per-user events ({"user_id", "status", "workout_plan_id" | "detail"})
+            followed by one summary event ({"status": "done", ...})
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        stats = {"requested": len(user_ids), "generated": 0, "failed": 0, "llm_calls": 0}
+
+        async with AsyncSessionLocal() as db:
+            profiles = await CoachService.load_client_profiles(db, coach, user_ids)
+            result = await db.execute(select(Exercise))
+            exercises = result.scalars().all()
+            if exercises:
+                await exercise_catalog.ensure_loaded(db)
+
+        for user_id in user_ids:
+            if user_id not in profiles:
+                stats["failed"] += 1
+                yield {"user_id": user_id, "status": "error", "detail": "Client not found or has no profile"}
+
+        if not profiles:
+            yield {"status": "done", **stats}
+            return
+
+        if not exercises:
+            stats["failed"] += len(profiles)
+            yield {"status": "done", "detail": "No exercises available in database", **stats}
+            return
+
+        reservations: Dict[int, BudgetReservation] = {}
+        tasks: List[asyncio.Task] = []
+        try:
+            for user_id in profiles:
+                try:
+                    reservations[user_id] = await UsageService.reserve(user_id, "coach_batch")
+                except BudgetExceededError as e:
+                    stats["failed"] += 1
+                    yield {"user_id": user_id, "status": "error", "detail": str(e)}
+
+            # Deduplicate identical prompt inputs
+            groups: Dict[str, List[int]] = {}
+            for user_id in reservations:
+                profile = profiles[user_id]
+                available = WorkoutService.filter_exercises(profile, exercises)
+                prompt = llm_service.build_llm_prompt(profile, fatigue_score, available)
+                groups.setdefault(prompt, []).append(user_id)
+            stats["llm_calls"] = len(groups)
+
+            semaphore = asyncio.Semaphore(settings.COACH_BATCH_CONCURRENCY)
+
+            async def _generate(prompt: str):
+                async with semaphore:
+                    try:
+                        text, usage = await llm_service.create_message(prompt, priority=Priority.BATCH)
+                    except LLMOverloadedError as e:
+                        return prompt, None, None, str(e)
+                    except Exception as e:
+                        return prompt, None, None, f"Error calling Claude API: {e}"
+                    try:
+                        return prompt, llm_service.parse_workout_plan(text), usage, None
+                    except Exception as e:
+                        return prompt, None, usage, f"Invalid plan returned by Claude: {e}"
+
+            tasks = [asyncio.create_task(_generate(prompt)) for prompt in groups]
+            pending_rows: List[dict] = []
+            pending_usage: List[Tuple[BudgetReservation, LLMUsage]] = []
+
+            for next_result in asyncio.as_completed(tasks):
+                prompt, plan, usage, error = await next_result
+                members = groups[prompt]
+
+                if usage is not None:
+                    # Tokens were spent once for the whole group: each member pays a share
+                    shares = usage.split(len(members))
+                    pending_usage.extend(
+                        (reservations[user_id], share) for user_id, share in zip(members, shares)
+                    )
+
+                if error:
+                    stats["failed"] += len(members)
+                    for user_id in members:
+                        yield {"user_id": user_id, "status": "error", "detail": error}
+                    continue
+
+                plan_data = compact_plan_data(plan)
+                pending_rows.extend(
+                    {"user_id": user_id, "plan_data": plan_data, "fatigue_score_used": fatigue_score}
+                    for user_id in members
+                )
+
+                if len(pending_rows) >= settings.COACH_BATCH_INSERT_CHUNK:
+                    for event in await CoachService._flush(pending_rows, pending_usage):
+                        stats["generated"] += 1
+                        yield event
+                    pending_rows, pending_usage = [], []
+
+            for event in await CoachService._flush(pending_rows, pending_usage):
+                stats["generated"] += 1
+                yield event
+        finally:
+            # Client disconnected or error: stop outstanding LLM calls, free unused budget
+            for task in tasks:
+                task.cancel()
+            await UsageService.release(*reservations.values())
+
+        yield {"status": "done", **stats}
+
+    @staticmethod
+    async def _flush(
+        rows: List[dict], usage: List[Tuple[BudgetReservation, LLMUsage]]
+    ) -> List[dict]:
+        """Bulk-insert plan rows and settle usage shares (one short session) and build success events"""
+        if not rows and not usage:
+            return []
+
+        async with AsyncSessionLocal() as db:
+            inserted = []
+            if rows:
+                result = await db.execute(
+                    insert(WorkoutPlan).returning(WorkoutPlan.id, WorkoutPlan.user_id), rows
+                )
+                inserted = result.all()
+            for reservation, share in usage:
+                await UsageService.settle(db, reservation, share)
+            await db.commit()
+
+        for _plan_id, user_id in inserted:
+            response_cache.invalidate("history", user_id)
+
+        return [
+            {"user_id": user_id, "status": "ok", "workout_plan_id": plan_id}
+            for plan_id, user_id in inserted
+        ]
@@ -0,0 +1,145 @@
+"""
+Exercise Catalog - In-memory snapshot of the exercise library
+Shared by the substitution engine and other catalog-derived indexes
+"""
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.text import normalize_text
+from src.models.exercise import Exercise
+
+# Equipment inferred from the (Spanish) exercise name, first match wins
+EQUIPMENT_KEYWORDS = [
+    ("barbell", ("barra", "peso muerto", "press frances")),
+    ("dumbbells", ("mancuerna", "martillo")),
+    ("cables", ("polea", "cable")),
+    ("machines", ("maquina", "prensa", "jalon", "leg extension", "leg curl", "curl femoral")),
+]
+DEFAULT_EQUIPMENT = "bodyweight"
+
+
+def infer_equipment(name: str) -> str:
+    """
+    Infer the equipment an exercise needs from its name
+
+    Returns:
+        One of the profile equipment values ("barbell", "dumbbells", "cables", "machines", "bodyweight")
+    """
+    normalized = normalize_text(name)
+    for equipment, keywords in EQUIPMENT_KEYWORDS:
+        if any(keyword in normalized for keyword in keywords):
+            return equipment
+    return DEFAULT_EQUIPMENT
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Immutable view of one exercise"""
+
+    id: int
+    name: str
+    normalized_name: str
+    muscle_groups: Tuple[str, ...]
+    equipment: str
+    safety_notes: str
+    technique_cues: Tuple[str, ...]
+    volume_guidelines: Dict[str, str]
+
+
+class ExerciseCatalog:
+    """
+    Cached exercise catalog (per worker)
+
+    The catalog is reloaded at most every EXERCISE_CATALOG_REFRESH_SECONDS; `version`
+    only changes when the content changes, so dependent indexes can rebuild lazily
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, CatalogEntry] = {}
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    @property
+    def entries(self) -> List[CatalogEntry]:
+        return list(self._entries.values())
+
+    def get(self, exercise_id: int) -> Optional[CatalogEntry]:
+        return self._entries.get(exercise_id)
+
+    async def ensure_loaded(self, db: AsyncSession, force: bool = False) -> str:
+        """
+        Load or refresh the catalog if the refresh interval has elapsed
+
+        Args:
+            db: Database session
+            force: Reload regardless of the refresh interval
+
+        Returns:
+            Current catalog version
+        """
+        if not force and self._is_fresh():
+            return self._version
+
+        async with self._lock:
+            if not force and self._is_fresh():
+                return self._version
+
+            result = await db.execute(select(Exercise).order_by(Exercise.id))
+            exercises = result.scalars().all()
+            self.replace(exercises)
+            return self._version
+
+    def _is_fresh(self) -> bool:
+        age = time.monotonic() - self._checked_at
+        return self._version is not None and age < settings.EXERCISE_CATALOG_REFRESH_SECONDS
+
+    def replace(self, exercises: List[Exercise]):
+        """Swap in a new snapshot (version unchanged if the content is identical)"""
+        entries = {
+            ex.id: CatalogEntry(
+                id=ex.id,
+                name=ex.name,
+                normalized_name=normalize_text(ex.name),
+                muscle_groups=tuple(ex.muscle_groups or []),
+                equipment=infer_equipment(ex.name),
+                safety_notes=ex.safety_notes,
+                technique_cues=tuple(ex.technique_cues or []),
+                volume_guidelines=dict(ex.volume_guidelines_json or {}),
+            )
+            for ex in exercises
+        }
+        fingerprint = json.dumps(
+            [
+                [e.id, e.name, e.muscle_groups, e.safety_notes, e.technique_cues, e.volume_guidelines]
+                for e in entries.values()
+            ],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        version = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:12]
+
+        if version != self._version:
+            self._entries = entries
+            self._version = version
+        self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        """Force a reload on the next access (e.g. after seeding)"""
+        self._checked_at = 0.0
+
+
+# Global catalog instance
+exercise_catalog = ExerciseCatalog()
@@ -0,0 +1,122 @@
+"""
+Fake LLM - Local stand-in for the Anthropic client (LLM_MODE=fake)
+Answers workout prompts with a valid plan built from the prompt's exercise library (other
+prompts with a canned answer) after a fixed latency, so load tests exercise the whole
+pipeline without API calls or cost
+"""
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+from typing import Optional, Union
+
+# Exercise library section of LLMService.build_prompt_context (up to the next blank line)
+LIBRARY_SECTION = re.compile(
+    r"^\*\*BIBLIOTECA DE EJERCICIOS DISPONIBLES:\*\*\n(.*?)(?:\n\n|\Z)", re.MULTILINE | re.DOTALL
+)
+# "- Name (muscle, muscle): safety notes" lines of that section
+LIBRARY_LINE = re.compile(r"^- (.+?) \(([^)]*)\): (.+)$", re.MULTILINE)
+FATIGUE_LINE = re.compile(r"Score de fatiga: (\d+)/100")
+
+FAKE_BLOCKS = 6
+FALLBACK_NOTES = "Mantén una técnica controlada en todo el recorrido."
+FAKE_ANSWER = (
+    "Buena pregunta. Empieza con un peso que puedas controlar. Mantén la espalda neutra. "
+    "Baja despacio y sube con fuerza. Error común: rebotar al final del recorrido. "
+    "Señal visual: las rodillas siguen la dirección de los pies."
+)
+STREAM_CHUNK_CHARS = 16
+
+
+def make_message(text: str, input_tokens: int, output_tokens: int, model: str, stop_reason: Optional[str]):
+    """Response object with the fields LLMService reads from an Anthropic message"""
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+        model=model,
+        stop_reason=stop_reason,
+    )
+
+
+class StaticMessageStream:
+    """
+    Replays a complete message through the `messages.stream()` interface
+    (async context manager with `text_stream` and `get_final_message()`)
+    """
+
+    def __init__(self, final_message, duration: float):
+        self.final_message = final_message
+        self.duration = duration
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    async def text_stream(self):
+        text = self.final_message.content[0].text
+        chunks = [text[i : i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)]
+        delay = self.duration / max(len(chunks), 1)
+        for chunk in chunks:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    async def get_final_message(self):
+        return self.final_message
+
+
+class _FakeMessages:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def create(self, model: str, max_tokens: int, temperature: float, messages: list, **kwargs):
+        """Same signature and response shape as AsyncAnthropic().messages.create"""
+        await asyncio.sleep(self.latency)
+        return self._respond(model, messages, kwargs.get("system"))
+
+    def stream(self, model: str, max_tokens: int, temperature: float, messages: list, **kwargs):
+        """Same interface as AsyncAnthropic().messages.stream, latency spread over the chunks"""
+        return StaticMessageStream(self._respond(model, messages, kwargs.get("system")), self.latency)
+
+    @staticmethod
+    def _respond(model: str, messages: list, system: Optional[Union[str, list]] = None):
+        if isinstance(system, list):
+            system = "\n\n".join(block["text"] for block in system)
+        # Weekly day prompts keep the library and fatigue context in the (cached) system prompt
+        prompt = f"{system}\n\n{messages[-1]['content']}" if system else messages[-1]["content"]
+        section = LIBRARY_SECTION.search(prompt)
+        library = LIBRARY_LINE.findall(section.group(1)) if section else []
+        if not library:
+            return make_message(FAKE_ANSWER, len(prompt) // 4, len(FAKE_ANSWER) // 4, model, "end_turn")
+
+        fatigue = FATIGUE_LINE.search(prompt)
+
+        blocks = [
+            {
+                "musculo": (muscles.split(",")[0].strip() or "General")[:50],
+                "ejercicio": name[:100],
+                "series": 3 + index % 2,
+                "repeticiones": "8-12",
+                "rpe_objetivo": 7,
+                "descanso_segundos": 90,
+                "notas_seguridad": (notes if len(notes) >= 10 else FALLBACK_NOTES)[:500],
+            }
+            for index, (name, muscles, notes) in enumerate(library[:FAKE_BLOCKS])
+        ]
+        plan = {
+            "workout_plan": blocks,
+            "fatiga_score_usado": int(fatigue.group(1)) if fatigue else 50,
+            "ajuste_aplicado": None,
+        }
+        text = f"```json\n{json.dumps(plan, ensure_ascii=False)}\n```"
+        return make_message(text, len(prompt) // 4, len(text) // 4, model, "end_turn")
+
+
+class FakeAnthropicClient:
+    """Drop-in for AsyncAnthropic exposing `messages.create` and `messages.stream`"""
+
+    def __init__(self, latency: float):
+        self.messages = _FakeMessages(latency)
@@ -0,0 +1,192 @@
+"""
+LLM Cassettes - Record/replay of Claude API interactions (LLM_MODE=record / replay)
+
+Recording wraps the real client and stores each call (prompt, model parameters, raw
+response text, token usage and latency) as one JSON file keyed by a hash of the request.
+Replay serves the stored response for an identical request, optionally waiting the
+recorded latency scaled by LLM_REPLAY_TIMING_SCALE, so prompt or model changes can be
+compared on the same inputs (see scripts/replay_llm_cassettes.py)
+"""
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from src.services.fake_llm import StaticMessageStream, make_message
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when no cassette matches the request"""
+
+
+def cassette_key(
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    messages: list,
+    system: Optional[Union[str, list]] = None,
+) -> str:
+    """Stable hash of everything that determines the response"""
+    request = {"model": model, "max_tokens": max_tokens, "temperature": temperature, "messages": messages}
+    if system is not None:
+        request["system"] = system
+    encoded = json.dumps(request, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CassetteStore:
+    """Directory of cassettes, one JSON file per request key"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self.directory / f"{key}.json"
+        if not path.is_file():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def put(self, cassette: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{cassette['key']}.json"
+        path.write_text(json.dumps(cassette, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def __iter__(self) -> Iterator[dict]:
+        if not self.directory.is_dir():
+            return
+        for path in sorted(self.directory.glob("*.json")):
+            yield json.loads(path.read_text(encoding="utf-8"))
+
+
+class _RecordingMessages:
+    def __init__(self, inner, store: CassetteStore):
+        self.inner = inner
+        self.store = store
+
+    async def create(self, model: str, max_tokens: int, temperature: float, messages: list, **kwargs):
+        started = time.perf_counter()
+        message = await self.inner.messages.create(
+            model=model, max_tokens=max_tokens, temperature=temperature, messages=messages, **kwargs
+        )
+        await self.save(model, max_tokens, temperature, messages, kwargs, message, time.perf_counter() - started)
+        return message
+
+    def stream(self, model: str, max_tokens: int, temperature: float, messages: list, **kwargs):
+        return _RecordingStream(self, model, max_tokens, temperature, messages, kwargs)
+
+    async def save(
+        self, model: str, max_tokens: int, temperature: float, messages: list, kwargs: dict, message, latency: float
+    ):
+        system = kwargs.get("system")
+        request = {"model": model, "max_tokens": max_tokens, "temperature": temperature, "messages": messages}
+        if system is not None:
+            request["system"] = system
+
+        cassette = {
+            "key": cassette_key(model, max_tokens, temperature, messages, system),
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "request": request,
+            "response": {
+                "text": message.content[0].text,
+                "model": getattr(message, "model", model),
+                "stop_reason": getattr(message, "stop_reason", None),
+            },
+            "usage": {
+                "input_tokens": message.usage.input_tokens,
+                "output_tokens": message.usage.output_tokens,
+            },
+            "latency_seconds": round(latency, 4),
+        }
+        await asyncio.to_thread(self.store.put, cassette)
+
+
+class _RecordingStream:
+    """Wraps the inner `messages.stream()` and saves the final message on completion"""
+
+    def __init__(self, recorder: _RecordingMessages, model, max_tokens, temperature, messages, kwargs):
+        self.recorder = recorder
+        self.request = (model, max_tokens, temperature, messages, kwargs)
+        self.inner = recorder.inner.messages.stream(
+            model=model, max_tokens=max_tokens, temperature=temperature, messages=messages, **kwargs
+        )
+
+    async def __aenter__(self):
+        self.started = time.perf_counter()
+        self.stream = await self.inner.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self.inner.__aexit__(*exc_info)
+
+    @property
+    def text_stream(self):
+        return self.stream.text_stream
+
+    async def get_final_message(self):
+        message = await self.stream.get_final_message()
+        await self.recorder.save(*self.request, message, time.perf_counter() - self.started)
+        return message
+
+
+class _ReplayMessages:
+    def __init__(self, store: CassetteStore, timing_scale: float):
+        self.store = store
+        self.timing_scale = timing_scale
+
+    async def create(self, model: str, max_tokens: int, temperature: float, messages: list, **kwargs):
+        cassette = await self._load(model, max_tokens, temperature, messages, kwargs.get("system"))
+        if self.timing_scale > 0:
+            await asyncio.sleep(cassette["latency_seconds"] * self.timing_scale)
+        return self._message(cassette)
+
+    def stream(self, model: str, max_tokens: int, temperature: float, messages: list, **kwargs):
+        return _ReplayStream(self, (model, max_tokens, temperature, messages, kwargs.get("system")))
+
+    async def _load(self, model, max_tokens, temperature, messages, system) -> dict:
+        key = cassette_key(model, max_tokens, temperature, messages, system)
+        cassette = await asyncio.to_thread(self.store.get, key)
+        if cassette is None:
+            raise CassetteMissError(f"No cassette for request {key[:12]} in {self.store.directory}")
+        return cassette
+
+    @staticmethod
+    def _message(cassette: dict):
+        return make_message(
+            cassette["response"]["text"],
+            cassette["usage"]["input_tokens"],
+            cassette["usage"]["output_tokens"],
+            cassette["response"]["model"],
+            cassette["response"]["stop_reason"],
+        )
+
+
+class _ReplayStream(StaticMessageStream):
+    """Cassette lookup happens on enter, like the API request of a real stream"""
+
+    def __init__(self, replay: _ReplayMessages, request: tuple):
+        super().__init__(None, 0.0)
+        self.replay = replay
+        self.request = request
+
+    async def __aenter__(self):
+        cassette = await self.replay._load(*self.request)
+        self.final_message = self.replay._message(cassette)
+        self.duration = cassette["latency_seconds"] * self.replay.timing_scale
+        return self
+
+
+class RecordingClient:
+    """Wraps an Anthropic client and stores every `messages.create` / `messages.stream` call"""
+
+    def __init__(self, inner, store: CassetteStore):
+        self.messages = _RecordingMessages(inner, store)
+
+
+class ReplayClient:
+    """Serves `messages.create` / `messages.stream` from recorded cassettes (no network)"""
+
+    def __init__(self, store: CassetteStore, timing_scale: float = 1.0):
+        self.messages = _ReplayMessages(store, timing_scale)
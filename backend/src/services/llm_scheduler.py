@@ -0,0 +1,298 @@
+"""
+LLM Scheduler - Admission control and priority scheduling for Claude calls
+Bounded queue per priority class, weighted fair dequeueing and deadline-aware shedding
+"""
+import asyncio
+import enum
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from src.core.config import settings
+
+T = TypeVar("T")
+
+
+class Priority(str, enum.Enum):
+    """Priority class of LLM-bound work"""
+
+    INTERACTIVE = "interactive"  # User is waiting on the response
+    PREFETCH = "prefetch"  # Speculative/precomputed work a user will likely need soon
+    BATCH = "batch"  # Offline jobs (cohorts, templates, nightly runs)
+
+
+@dataclass(frozen=True)
+class PriorityClassConfig:
+    """Scheduling parameters for one priority class"""
+
+    weight: int  # Share of dispatches when several classes are queued
+    max_queue: int  # Bounded queue length, beyond this requests are shed
+    deadline_seconds: float  # Default time budget from enqueue to completion
+
+
+class LLMOverloadedError(Exception):
+    """Raised when a request is shed because it would miss its deadline or the queue is full"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    """Queued request waiting for a concurrency slot"""
+
+    __slots__ = ("future", "enqueued_at", "deadline")
+
+    def __init__(self, future: asyncio.Future, enqueued_at: float, deadline: float):
+        self.future = future
+        self.enqueued_at = enqueued_at
+        self.deadline = deadline
+
+
+class LLMScheduler:
+    """
+    Global concurrency limiter for LLM calls with priority classes
+    Slots are handed directly from a finishing call to the next waiter (no thundering herd)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        classes: Dict[Priority, PriorityClassConfig],
+        initial_service_time: float = 8.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.classes = classes
+        self.in_flight = 0
+
+        self._queues: Dict[Priority, Deque[_Waiter]] = {p: deque() for p in classes}
+        self._wrr_current: Dict[Priority, int] = {p: 0 for p in classes}
+
+        # Exponentially weighted moving averages (seconds)
+        self._service_time = initial_service_time
+        self._wait_time: Dict[Priority, float] = {p: 0.0 for p in classes}
+        self.shed_total: Dict[Priority, int] = {p: 0 for p in classes}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def run(
+        self,
+        priority: Priority,
+        call: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """
+        Run an LLM call once a slot is available for its priority class
+
+        Args:
+            priority: Priority class of the request
+            call: Zero-argument coroutine factory performing the LLM call
+            timeout: Optional deadline in seconds (defaults to the class deadline)
+
+        Returns:
+            Result of the call
+
+        Raises:
+            LLMOverloadedError: If the request is shed before running
+        """
+        config = self.classes[priority]
+        now = time.monotonic()
+        deadline = now + (timeout if timeout is not None else config.deadline_seconds)
+
+        if self.in_flight < self.max_concurrency and not self.queue_depth():
+            self.in_flight += 1
+            self._observe_wait(priority, 0.0)
+        else:
+            await self._wait_for_slot(priority, now, deadline)
+
+        started = time.monotonic()
+        try:
+            return await call()
+        finally:
+            self._observe_service_time(time.monotonic() - started)
+            self._release()
+
+    def queue_depth(self, priority: Optional[Priority] = None) -> int:
+        """Number of queued requests (for one class or all classes)"""
+        if priority is not None:
+            return len(self._queues[priority])
+        return sum(len(q) for q in self._queues.values())
+
+    def is_saturated(self, priority: Priority) -> bool:
+        """True if a new request of this class would be rejected right now"""
+        if self.in_flight < self.max_concurrency and not self.queue_depth():
+            return False
+        return len(self._queues[priority]) >= self.classes[priority].max_queue
+
+    def estimate_wait(self, priority: Priority) -> float:
+        """
+        Estimate queueing time for a new request of this class
+
+        Counts the requests that weighted fair dequeueing would dispatch ahead of it
+        and divides by the concurrency limit
+        """
+        own_ahead = len(self._queues[priority]) + 1
+        weight = self.classes[priority].weight
+        ahead = 0
+        for p, queue in self._queues.items():
+            if p == priority:
+                ahead += own_ahead
+            else:
+                share = math.ceil(own_ahead * self.classes[p].weight / weight)
+                ahead += min(len(queue), share)
+
+        free = self.max_concurrency - self.in_flight
+        if ahead <= free:
+            return 0.0
+        return (ahead - free) / self.max_concurrency * self._service_time
+
+    def stats(self) -> dict:
+        """Queue depth and wait-time gauges for monitoring"""
+        now = time.monotonic()
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "service_time_ewma_seconds": round(self._service_time, 3),
+            "classes": {
+                p.value: {
+                    "queue_depth": len(queue),
+                    "max_queue": self.classes[p].max_queue,
+                    "wait_time_ewma_seconds": round(self._wait_time[p], 3),
+                    "oldest_wait_seconds": round(now - queue[0].enqueued_at, 3) if queue else 0.0,
+                    "shed_total": self.shed_total[p],
+                }
+                for p, queue in self._queues.items()
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _wait_for_slot(self, priority: Priority, now: float, deadline: float):
+        """Enqueue the request and wait until a slot is handed over"""
+        queue = self._queues[priority]
+        if len(queue) >= self.classes[priority].max_queue:
+            self._shed(priority, "LLM queue is full")
+
+        expected_wait = self.estimate_wait(priority)
+        if now + expected_wait + self._service_time > deadline:
+            self._shed(priority, "LLM queue would exceed request deadline", expected_wait)
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop.create_future(), now, deadline)
+        queue.append(waiter)
+        self._dispatch()
+
+        # Shed while still queued once the call could no longer finish in time,
+        # even if no slot frees up to run the dispatch-time check
+        expiry = loop.call_later(
+            max(0.0, deadline - self._service_time - time.monotonic()), self._expire, priority, waiter
+        )
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                # Slot was handed over just before cancellation, give it back
+                self._release()
+            elif waiter in queue:
+                queue.remove(waiter)
+            raise
+        finally:
+            expiry.cancel()
+
+        self._observe_wait(priority, time.monotonic() - now)
+
+    def _expire(self, priority: Priority, waiter: _Waiter):
+        """Shed a waiter that is still queued at its deadline"""
+        queue = self._queues[priority]
+        if waiter.future.done() or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self.shed_total[priority] += 1
+        waiter.future.set_exception(
+            LLMOverloadedError("LLM request missed its deadline while queued", self._retry_after())
+        )
+
+    def _release(self):
+        """Free a slot and hand it to the next eligible waiter"""
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Hand free slots to waiters using smooth weighted round-robin across classes"""
+        while self.in_flight < self.max_concurrency:
+            priority = self._next_class()
+            if priority is None:
+                return
+
+            waiter = self._queues[priority].popleft()
+            if waiter.future.done():
+                continue
+
+            # Queue-time-aware shedding: drop requests that can no longer finish in time
+            if time.monotonic() + self._service_time > waiter.deadline:
+                self.shed_total[priority] += 1
+                waiter.future.set_exception(
+                    LLMOverloadedError("LLM request missed its deadline while queued", self._retry_after())
+                )
+                continue
+
+            self.in_flight += 1
+            waiter.future.set_result(None)
+
+    def _next_class(self) -> Optional[Priority]:
+        """Pick the next non-empty class (smooth weighted round-robin)"""
+        active = [p for p, queue in self._queues.items() if queue]
+        if not active:
+            return None
+
+        total = 0
+        for p in active:
+            weight = self.classes[p].weight
+            self._wrr_current[p] += weight
+            total += weight
+
+        best = max(active, key=lambda p: self._wrr_current[p])
+        self._wrr_current[best] -= total
+        return best
+
+    def _shed(self, priority: Priority, reason: str, expected_wait: float = 0.0):
+        self.shed_total[priority] += 1
+        raise LLMOverloadedError(reason, self._retry_after(expected_wait))
+
+    def _retry_after(self, expected_wait: float = 0.0) -> int:
+        return max(1, int(math.ceil(expected_wait or self._service_time)))
+
+    def _observe_service_time(self, seconds: float, alpha: float = 0.2):
+        self._service_time = (1 - alpha) * self._service_time + alpha * seconds
+
+    def _observe_wait(self, priority: Priority, seconds: float, alpha: float = 0.2):
+        self._wait_time[priority] = (1 - alpha) * self._wait_time[priority] + alpha * seconds
+
+
+# Global LLM scheduler instance
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    classes={
+        Priority.INTERACTIVE: PriorityClassConfig(
+            weight=6,
+            max_queue=settings.LLM_QUEUE_INTERACTIVE,
+            deadline_seconds=settings.LLM_DEADLINE_INTERACTIVE_SECONDS,
+        ),
+        Priority.PREFETCH: PriorityClassConfig(
+            weight=3,
+            max_queue=settings.LLM_QUEUE_PREFETCH,
+            deadline_seconds=settings.LLM_DEADLINE_PREFETCH_SECONDS,
+        ),
+        Priority.BATCH: PriorityClassConfig(
+            weight=1,
+            max_queue=settings.LLM_QUEUE_BATCH,
+            deadline_seconds=settings.LLM_DEADLINE_BATCH_SECONDS,
+        ),
+    },
+)
@@ -1,31 +1,137 @@
 """
 LLM Service - Anthropic Claude API Integration
-Generates workout plans based on user profile and fatigue score
+Generates workout plans based on user profile and fatigue score, streams chat answers
 """
+import asyncio
 import json
-from typing import Dict, List
-from anthropic import Anthropic
+import time
+from typing import Dict, List, Optional, Tuple
+from anthropic import APITimeoutError, AsyncAnthropic
 
 from src.core.config import settings
+from src.core.metrics import LLM_REQUEST_DURATION, LLM_TIME_TO_FIRST_TOKEN, LLM_TOKENS
 from src.models.user_profile import UserProfile, FitnessObjective, ExperienceLevel
 from src.models.exercise import Exercise
 from src.schemas.workout import ExerciseBlock, WorkoutPlanResponse
+from src.services.fake_llm import FakeAnthropicClient
+from src.services.llm_cassettes import CassetteStore, RecordingClient, ReplayClient
+from src.services.llm_scheduler import LLMOverloadedError, Priority, llm_scheduler
+from src.services.split_planner import SplitDay
+from src.services.usage_service import LLMUsage
+
+
+# Fatigue guidance per band (FR-017b)
+FATIGUE_GUIDANCE = {
+    "high": "⚠️ FATIGA ALTA (>80): Reduce volumen 30%. RPE -2 puntos. Considera semana de descarga.",
+    "moderate": "⚠️ FATIGA MODERADA-ALTA (60-80): Reduce volumen 15%. Mantén RPE pero reduce series.",
+    "low": "✅ FATIGA BAJA (<40): Usuario está fresco. Puedes aumentar intensidad +5-10%.",
+    "normal": "✅ FATIGA NORMAL (40-60): Mantén volumen e intensidad estándar.",
+}
+
+
+def fatigue_band(fatigue_score: int) -> str:
+    """
+    Map a fatigue score to its FR-017b band
+
+    Plans generated within the same band receive the same prompt guidance
+    """
+    if fatigue_score > 80:
+        return "high"
+    if fatigue_score > 60:
+        return "moderate"
+    if fatigue_score < 40:
+        return "low"
+    return "normal"
+
+
+def call_outcome(error: BaseException) -> str:
+    """LLM_REQUEST_DURATION outcome label of a failed call"""
+    if isinstance(error, asyncio.CancelledError):
+        return "cancelled"  # Client went away, deadline hit by the caller, speculative plan replaced
+    if isinstance(error, (APITimeoutError, asyncio.TimeoutError)):
+        return "timeout"
+    return "error"
+
+
+def input_tokens(usage) -> int:
+    """Input tokens of a response, including prompt-cache writes and reads (billed as input)"""
+    return (
+        usage.input_tokens
+        + (getattr(usage, "cache_creation_input_tokens", None) or 0)
+        + (getattr(usage, "cache_read_input_tokens", None) or 0)
+    )
+
+
+class InvalidPlanError(ValueError):
+    """Raised when Claude answered but its plan could not be parsed (the call's tokens were spent)"""
+
+    def __init__(self, message: str, usage: LLMUsage):
+        super().__init__(message)
+        self.usage = usage
+
+
+class LLMStream:
+    """
+    Text chunks of a streamed Claude response, produced by a task holding a scheduler slot
+
+    Iterate with `async for`; `usage` is set once the stream is exhausted. Errors of
+    the call (including LLMOverloadedError when shed) are raised by the iteration.
+    Closing the stream early cancels the call.
+    """
+
+    _END = object()
+
+    def __init__(self):
+        self.usage: Optional[LLMUsage] = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        chunk = await self._queue.get()
+        if chunk is self._END:
+            self.usage = await self._task
+            raise StopAsyncIteration
+        return chunk
+
+    async def aclose(self):
+        """Cancel the call if it is still running (client went away)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
 
 
 class LLMService:
     """Service for Claude AI interactions"""
 
     def __init__(self):
-        self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        if settings.LLM_MODE == "fake":
+            self.client = FakeAnthropicClient(latency=settings.LLM_FAKE_LATENCY_SECONDS)
+        elif settings.LLM_MODE == "replay":
+            self.client = ReplayClient(
+                CassetteStore(settings.LLM_CASSETTE_DIR), timing_scale=settings.LLM_REPLAY_TIMING_SCALE
+            )
+        else:
+            self.client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+            if settings.LLM_MODE == "record":
+                self.client = RecordingClient(self.client, CassetteStore(settings.LLM_CASSETTE_DIR))
 
-    def build_llm_prompt(
+    def build_prompt_context(
         self,
         profile: UserProfile,
         fatigue_score: int,
         available_exercises: List[Exercise],
     ) -> str:
         """
-        Build prompt for Claude with user profile and fatigue context
+        Build the profile, fatigue and exercise library sections of the prompt
+
+        Shared verbatim by every prompt generated for the same request
+        (single session or all days of a weekly plan)
 
         Args:
             profile: User's fitness profile
@@ -33,7 +139,7 @@ class LLMService:
             available_exercises: List of exercises from database
 
         Returns:
-            Formatted prompt string
+            Prompt context string
         """
         # Map objective to Spanish
         objective_map = {
@@ -58,19 +164,9 @@ class LLMService:
         )
 
         # Fatigue adjustment guidance
-        fatigue_guidance = ""
-        if fatigue_score > 80:
-            fatigue_guidance = "⚠️ FATIGA ALTA (>80): Reduce volumen 30%. RPE -2 puntos. Considera semana de descarga."
-        elif fatigue_score > 60:
-            fatigue_guidance = "⚠️ FATIGA MODERADA-ALTA (60-80): Reduce volumen 15%. Mantén RPE pero reduce series."
-        elif fatigue_score < 40:
-            fatigue_guidance = "✅ FATIGA BAJA (<40): Usuario está fresco. Puedes aumentar intensidad +5-10%."
-        else:
-            fatigue_guidance = "✅ FATIGA NORMAL (40-60): Mantén volumen e intensidad estándar."
+        fatigue_guidance = FATIGUE_GUIDANCE[fatigue_band(fatigue_score)]
 
-        prompt = f"""Eres un entrenador personal experto. Genera un plan de entrenamiento personalizado para hoy.
-
-**PERFIL DEL USUARIO:**
+        return f"""**PERFIL DEL USUARIO:**
 - Edad: {profile.age} años
 - Peso: {profile.weight_kg} kg, Altura: {profile.height_cm} cm
 - Objetivo: {objective_map[profile.objective]}
@@ -84,18 +180,12 @@ class LLMService:
 - {fatigue_guidance}
 
 **BIBLIOTECA DE EJERCICIOS DISPONIBLES:**
-{exercises_text}
-
-**INSTRUCCIONES:**
-1. Diseña un entreno COMPLETO para hoy (todo el cuerpo o split según experiencia)
-2. Selecciona 6-12 ejercicios de la biblioteca
-3. Ajusta volumen e intensidad según el score de fatiga
-4. Para principiantes: enfoque en ejercicios básicos, técnica, RPE 6-7
-5. Para avanzados: ejercicios complejos, mayor volumen, RPE 7-9
-6. Respeta las contraindicaciones de lesiones
-7. Usa solo equipamiento disponible
+{exercises_text}"""
 
-**FORMATO DE RESPUESTA (JSON estricto):**
+    @staticmethod
+    def _response_format(fatigue_score: int) -> str:
+        """JSON response format section shared by all workout prompts"""
+        return f"""**FORMATO DE RESPUESTA (JSON estricto):**
 {{
   "workout_plan": [
     {{
@@ -111,15 +201,263 @@ class LLMService:
   "disclaimer_medico": "Consulta con un profesional de la salud antes de iniciar cualquier programa de ejercicio. Detente inmediatamente si experimentas dolor.",
   "fatiga_score_usado": {fatigue_score},
   "ajuste_aplicado": "Descripción breve del ajuste hecho por fatiga (o null si no aplica)"
-}}
+}}"""
+
+    def build_llm_prompt(
+        self,
+        profile: UserProfile,
+        fatigue_score: int,
+        available_exercises: List[Exercise],
+    ) -> str:
+        """
+        Build prompt for Claude with user profile and fatigue context
+
+        Args:
+            profile: User's fitness profile
+            fatigue_score: Current fatigue score (0-100)
+            available_exercises: List of exercises from database
+
+        Returns:
+            Formatted prompt string
+        """
+        context = self.build_prompt_context(profile, fatigue_score, available_exercises)
+
+        prompt = f"""Eres un entrenador personal experto. Genera un plan de entrenamiento personalizado para hoy.
+
+{context}
+
+**INSTRUCCIONES:**
+1. Diseña un entreno COMPLETO para hoy (todo el cuerpo o split según experiencia)
+2. Selecciona 6-12 ejercicios de la biblioteca
+3. Ajusta volumen e intensidad según el score de fatiga
+4. Para principiantes: enfoque en ejercicios básicos, técnica, RPE 6-7
+5. Para avanzados: ejercicios complejos, mayor volumen, RPE 7-9
+6. Respeta las contraindicaciones de lesiones
+7. Usa solo equipamiento disponible
+
+{self._response_format(fatigue_score)}
 
 Genera el plan ahora en formato JSON válido:"""
 
         return prompt
 
+    def build_weekly_shared_prompt(self, context: str, fatigue_score: int) -> str:
+        """
+        Build the part of the weekly day prompts that is identical for every day
+
+        Sent as a cached system prompt, so the N concurrent day calls reuse one prefix
+
+        Args:
+            context: Shared prompt context from build_prompt_context
+            fatigue_score: Fatigue score (0-100)
+
+        Returns:
+            Formatted system prompt string
+        """
+        return f"""Eres un entrenador personal experto. Generas, una a una, las sesiones de un plan semanal personalizado.
+
+{context}
+
+{self._response_format(fatigue_score)}"""
+
+    def build_weekly_day_prompt(self, day: SplitDay, total_days: int) -> str:
+        """
+        Build the day-specific prompt for one day of a weekly plan (follows the shared prompt)
+
+        Args:
+            day: Split day (focus regions and set budget)
+            total_days: Number of training days in the week
+
+        Returns:
+            Formatted prompt string
+        """
+        return f"""Genera la sesión {day.day_index + 1} de {total_days} del plan semanal.
+
+**SESIÓN DEL DÍA {day.day_index + 1}: {day.label}**
+- Grupos musculares: {', '.join(day.regions)}
+- Máximo {day.set_budget} series por grupo muscular en esta sesión (el volumen semanal se reparte entre días)
+
+**INSTRUCCIONES:**
+1. Trabaja SOLO los grupos musculares de esta sesión
+2. Selecciona 4-8 ejercicios de la biblioteca
+3. Ajusta volumen e intensidad según el score de fatiga
+4. Para principiantes: enfoque en ejercicios básicos, técnica, RPE 6-7
+5. Para avanzados: ejercicios complejos, mayor volumen, RPE 7-9
+6. Respeta las contraindicaciones de lesiones
+7. Usa solo equipamiento disponible
+
+Genera la sesión ahora en formato JSON válido:"""
+
+    @staticmethod
+    def parse_workout_plan(response_text: str) -> WorkoutPlanResponse:
+        """
+        Extract and validate the JSON workout plan from a Claude response
+
+        Args:
+            response_text: Raw response text
+
+        Returns:
+            Validated WorkoutPlanResponse
+
+        Raises:
+            json.JSONDecodeError: If no valid JSON is found
+            pydantic.ValidationError: If the plan does not match the schema
+        """
+        # Parse JSON
+        response_data = json.loads(LLMService.extract_json_text(response_text))
+
+        # Validate with Pydantic
+        return WorkoutPlanResponse(**response_data)
+
+    @staticmethod
+    def extract_json_text(response_text: str) -> str:
+        """JSON payload of a Claude response (contents of the first code block, if any)"""
+        if "```json" in response_text:
+            json_start = response_text.find("```json") + 7
+            json_end = response_text.find("```", json_start)
+            return response_text[json_start:json_end].strip()
+        if "```" in response_text:
+            json_start = response_text.find("```") + 3
+            json_end = response_text.find("```", json_start)
+            return response_text[json_start:json_end].strip()
+        return response_text
+
+    async def create_message(
+        self,
+        prompt: str,
+        priority: Priority = Priority.INTERACTIVE,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        cached_system: Optional[str] = None,
+    ) -> Tuple[str, LLMUsage]:
+        """
+        Send a single-turn prompt to Claude through the LLM scheduler
+
+        Args:
+            prompt: User prompt
+            priority: Scheduling class (interactive, prefetch, batch)
+            max_tokens: Maximum output tokens
+            temperature: Sampling temperature
+            timeout: Optional deadline in seconds (defaults to the class deadline)
+            cached_system: Optional system prompt shared by several calls, marked for prompt caching
+
+        Returns:
+            Tuple of (response text, token usage of the call)
+
+        Raises:
+            LLMOverloadedError: If the scheduler sheds the request
+        """
+        extra = {}
+        if cached_system is not None:
+            extra["system"] = [{"type": "text", "text": cached_system, "cache_control": {"type": "ephemeral"}}]
+
+        async def _call():
+            started = time.perf_counter()
+            try:
+                message = await self.client.messages.create(
+                    model=settings.LLM_MODEL,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    messages=[{"role": "user", "content": prompt}],
+                    **extra,
+                )
+            except BaseException as e:
+                LLM_REQUEST_DURATION.labels(settings.LLM_MODEL, call_outcome(e)).observe(time.perf_counter() - started)
+                raise
+
+            elapsed = time.perf_counter() - started
+            usage = LLMUsage(
+                model=settings.LLM_MODEL,
+                input_tokens=input_tokens(message.usage),
+                output_tokens=message.usage.output_tokens,
+                latency_ms=int(elapsed * 1000),
+            )
+            LLM_REQUEST_DURATION.labels(usage.model, "ok").observe(elapsed)
+            LLM_TOKENS.labels(usage.model, "input").inc(usage.input_tokens)
+            LLM_TOKENS.labels(usage.model, "output").inc(usage.output_tokens)
+            return message.content[0].text, usage
+
+        return await llm_scheduler.run(priority, _call, timeout=timeout)
+
+    def stream_message(
+        self,
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+    ) -> LLMStream:
+        """
+        Stream a multi-turn conversation's next answer through the LLM scheduler
+
+        The scheduler slot is held until the stream ends, so streamed calls count
+        against LLM_MAX_CONCURRENCY like any other call.
+
+        Args:
+            messages: Alternating user/assistant turns, ending with the user turn
+            system: Optional system prompt
+            priority: Scheduling class (interactive, prefetch, batch)
+            max_tokens: Maximum output tokens
+            temperature: Sampling temperature
+            timeout: Optional deadline in seconds for getting a slot (defaults to the class deadline)
+
+        Returns:
+            LLMStream of text chunks
+        """
+        stream = LLMStream()
+        extra = {"system": system} if system is not None else {}
+
+        async def _call():
+            started = time.perf_counter()
+            first_chunk = True
+            try:
+                async with self.client.messages.stream(
+                    model=settings.LLM_MODEL,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    messages=messages,
+                    **extra,
+                ) as response:
+                    async for text in response.text_stream:
+                        if first_chunk:
+                            LLM_TIME_TO_FIRST_TOKEN.labels(settings.LLM_MODEL).observe(time.perf_counter() - started)
+                            first_chunk = False
+                        stream._queue.put_nowait(text)
+                    message = await response.get_final_message()
+            except BaseException as e:
+                LLM_REQUEST_DURATION.labels(settings.LLM_MODEL, call_outcome(e)).observe(time.perf_counter() - started)
+                raise
+
+            elapsed = time.perf_counter() - started
+            usage = LLMUsage(
+                model=settings.LLM_MODEL,
+                input_tokens=input_tokens(message.usage),
+                output_tokens=message.usage.output_tokens,
+                latency_ms=int(elapsed * 1000),
+            )
+            LLM_REQUEST_DURATION.labels(usage.model, "ok").observe(elapsed)
+            LLM_TOKENS.labels(usage.model, "input").inc(usage.input_tokens)
+            LLM_TOKENS.labels(usage.model, "output").inc(usage.output_tokens)
+            return usage
+
+        async def _produce():
+            try:
+                return await llm_scheduler.run(priority, _call, timeout=timeout)
+            finally:
+                stream._queue.put_nowait(LLMStream._END)
+
+        stream._task = asyncio.create_task(_produce())
+        return stream
+
     async def call_anthropic_claude(
-        self, profile: UserProfile, fatigue_score: int, available_exercises: List[Exercise]
-    ) -> WorkoutPlanResponse:
+        self,
+        profile: UserProfile,
+        fatigue_score: int,
+        available_exercises: List[Exercise],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Tuple[WorkoutPlanResponse, LLMUsage]:
         """
         Call Claude API to generate workout plan
 
@@ -127,50 +465,79 @@ Genera el plan ahora en formato JSON válido:"""
             profile: User profile
             fatigue_score: Fatigue score (0-100)
             available_exercises: Available exercises from DB
+            priority: Scheduling class for the LLM call
 
         Returns:
-            WorkoutPlanResponse with validated plan
+            Tuple of (WorkoutPlanResponse with validated plan, token usage of the call)
 
         Raises:
-            ValueError: If response parsing fails
+            ValueError: If the Claude API call fails
+            InvalidPlanError: If response parsing fails (carries the usage to bill)
+            LLMOverloadedError: If the scheduler sheds the request
         """
         prompt = self.build_llm_prompt(profile, fatigue_score, available_exercises)
 
         try:
             # Call Claude API
-            message = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4000,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}],
-            )
+            response_text, usage = await self.create_message(prompt, priority=priority)
+        except LLMOverloadedError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error calling Claude API: {e}")
+
+        try:
+            return self.parse_workout_plan(response_text), usage
+        except json.JSONDecodeError as e:
+            raise InvalidPlanError(f"Failed to parse Claude response as JSON: {e}", usage)
+        except Exception as e:
+            raise InvalidPlanError(f"Invalid plan returned by Claude: {e}", usage)
 
-            # Extract response text
-            response_text = message.content[0].text
+    async def generate_weekly_day(
+        self,
+        context: str,
+        day: SplitDay,
+        total_days: int,
+        fatigue_score: int,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Tuple[WorkoutPlanResponse, LLMUsage]:
+        """
+        Generate one day of a weekly plan
 
-            # Parse JSON response
-            # Try to find JSON in code blocks first
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
+        Args:
+            context: Shared prompt context from build_prompt_context
+            day: Split day to generate
+            total_days: Number of training days in the week
+            fatigue_score: Fatigue score (0-100)
+            priority: Scheduling class for the LLM call
 
-            # Parse JSON
-            response_data = json.loads(response_text)
+        Returns:
+            Tuple of (validated day plan, token usage of the call)
 
-            # Validate with Pydantic
-            workout_plan = WorkoutPlanResponse(**response_data)
+        Raises:
+            ValueError: If the Claude API call fails
+            InvalidPlanError: If response parsing fails (carries the usage to bill)
+            LLMOverloadedError: If the scheduler sheds the request
+        """
+        shared_prompt = self.build_weekly_shared_prompt(context, fatigue_score)
+        prompt = self.build_weekly_day_prompt(day, total_days)
 
-            return workout_plan
+        try:
+            response_text, usage = await self.create_message(
+                prompt, priority=priority, cached_system=shared_prompt
+            )
+        except LLMOverloadedError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error calling Claude API for day {day.day_index + 1}: {e}")
 
+        try:
+            return self.parse_workout_plan(response_text), usage
         except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse Claude response as JSON: {e}")
+            raise InvalidPlanError(
+                f"Failed to parse Claude response for day {day.day_index + 1} as JSON: {e}", usage
+            )
         except Exception as e:
-            raise ValueError(f"Error calling Claude API: {e}")
+            raise InvalidPlanError(f"Invalid plan returned by Claude for day {day.day_index + 1}: {e}", usage)
 
 
 # Global LLM service instance
@@ -0,0 +1,85 @@
+"""
+Metrics Service - Periodic sampling of in-process state into Prometheus gauges
+Scheduler queues, response cache and rate limiter live in each worker's memory; a
+background task copies them into metrics every METRICS_SAMPLE_INTERVAL_SECONDS so the
+hot paths stay free of instrumentation and multi-worker scrapes see every worker
+"""
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from src.core.config import settings
+from src.core.metrics import (
+    LLM_IN_FLIGHT,
+    LLM_QUEUE_DEPTH,
+    LLM_SHED,
+    RATE_LIMITER_KEYS,
+    RESPONSE_CACHE_BYTES,
+    RESPONSE_CACHE_ENTRIES,
+    RESPONSE_CACHE_EVICTIONS,
+    RESPONSE_CACHE_REQUESTS,
+)
+from src.core.response_cache import response_cache
+from src.middleware.rate_limit import rate_limiter
+from src.services.llm_scheduler import llm_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsSampler:
+    """Background task refreshing sampled gauges (one per worker)"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        # Last cumulative values, to turn in-process totals into counter increments
+        self._last: Dict[str, int] = {}
+
+    def sample(self):
+        """Copy current in-process state into the gauges"""
+        LLM_IN_FLIGHT.set(llm_scheduler.in_flight)
+        for priority in llm_scheduler.classes:
+            LLM_QUEUE_DEPTH.labels(priority.value).set(llm_scheduler.queue_depth(priority))
+            self._advance(
+                LLM_SHED.labels(priority.value), f"shed:{priority.value}", llm_scheduler.shed_total[priority]
+            )
+
+        stats = response_cache.stats()
+        RESPONSE_CACHE_ENTRIES.set(stats["entries"])
+        RESPONSE_CACHE_BYTES.set(stats["bytes"])
+        self._advance(RESPONSE_CACHE_REQUESTS.labels("hit"), "cache:hit", stats["hits"])
+        self._advance(RESPONSE_CACHE_REQUESTS.labels("miss"), "cache:miss", stats["misses"])
+        self._advance(RESPONSE_CACHE_EVICTIONS, "cache:evictions", stats["evictions"])
+
+        RATE_LIMITER_KEYS.set(len(rate_limiter.requests))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception:
+                logger.exception("Metrics sampling failed")
+            await asyncio.sleep(self.interval)
+
+    def _advance(self, counter, name: str, total: int):
+        delta = total - self._last.get(name, 0)
+        if delta > 0:
+            counter.inc(delta)
+        self._last[name] = total
+
+
+# Global metrics sampler instance
+metrics_sampler = MetricsSampler(interval=settings.METRICS_SAMPLE_INTERVAL_SECONDS)
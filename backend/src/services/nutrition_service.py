@@ -0,0 +1,260 @@
+"""
+Nutrition Service - TDEE and macro targets (FR-018 to FR-021)
+
+Targets are a pure function of the profile fields that matter (weight, height, age,
+objective, training days) and, once enough weigh-ins exist, the adaptive TDEE from
+the body-weight trend; memoized per distinct input. A NutritionPlan row is only
+written when the rounded targets differ from the user's latest plan, so repeated
+calculations and profile edits that don't affect nutrition cost no writes.
+"""
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.models.nutrition_plan import NutritionPlan
+from src.models.user_profile import FitnessObjective, UserProfile
+from src.models.weight_trend import WeightTrend
+from src.services.weight_trend import adaptive_tdee
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - bulk recompute falls back to the memoized scalar path
+    numpy = None
+
+DISCLAIMER = (
+    "These are general guidelines. Consult a registered dietitian for personalized nutrition advice."
+)
+
+# Mifflin-St Jeor: 10·kg + 6.25·cm − 5·years + s, with s = +5 (men) / −161 (women).
+# Profiles don't record sex, so the midpoint of both constants is used.
+MIFFLIN_SEX_OFFSET = (5 - 161) / 2
+
+# Activity multiplier (1.2-1.9) indexed by training days per week
+ACTIVITY_FACTORS = (1.2, 1.375, 1.375, 1.55, 1.55, 1.725, 1.725, 1.9)
+
+# Objective -> (calorie adjustment over TDEE, protein g/kg), midpoints of the FR-019 ranges
+OBJECTIVE_TARGETS = {
+    FitnessObjective.HYPERTROPHY: (0.15, 1.9),  # +10-20%, 1.6-2.2 g/kg
+    FitnessObjective.CUTTING: (-0.20, 2.2),  # -15-25%, 2.0-2.4 g/kg
+    FitnessObjective.STRENGTH: (0.075, 1.9),  # +5-10%, 1.8-2.0 g/kg
+    FitnessObjective.RECOMPOSITION: (0.0, 2.1),  # Maintenance, 2.0-2.2 g/kg
+}
+
+FAT_CALORIE_SHARE = 0.25  # Of target calories; what protein and fat leave goes to carbs
+
+
+class NutritionTargets(NamedTuple):
+    """Rounded daily targets (kcal and grams)"""
+
+    tdee: float
+    target_calories: float
+    protein_g: float
+    carbs_g: float
+    fat_g: float
+
+
+def _formula_tdee(weight_kg, height_cm, age, activity_factor):
+    """Unrounded Mifflin-St Jeor TDEE; element-wise on floats and numpy arrays alike"""
+    return (10 * weight_kg + 6.25 * height_cm - 5 * age + MIFFLIN_SEX_OFFSET) * activity_factor
+
+
+def _macros(tdee, weight_kg, calorie_adjustment, protein_per_kg):
+    """Unrounded calorie and macro targets from a TDEE; element-wise like _formula_tdee"""
+    target_calories = tdee * (1 + calorie_adjustment)
+    protein_g = protein_per_kg * weight_kg
+    fat_g = target_calories * FAT_CALORIE_SHARE / 9
+    carbs_g = (target_calories - 4 * protein_g - 9 * fat_g) / 4
+    return tdee, target_calories, protein_g, carbs_g, fat_g
+
+
+@lru_cache(maxsize=settings.NUTRITION_CACHE_SIZE)
+def calculate_targets(
+    weight_kg: float,
+    height_cm: float,
+    age: int,
+    objective: FitnessObjective,
+    training_days: int,
+    measured_tdee: Optional[float] = None,
+) -> NutritionTargets:
+    """
+    TDEE (Mifflin-St Jeor × activity) and macro targets for the objective
+
+    Args:
+        weight_kg: Body weight
+        height_cm: Height
+        age: Age in years
+        objective: Fitness objective (calorie adjustment and protein per kg)
+        training_days: Training days per week (activity multiplier)
+        measured_tdee: Adaptive TDEE from the weight trend, replaces the formula if given
+            (pass it rounded so the memoization key stays small)
+
+    Returns:
+        NutritionTargets rounded to whole kcal and grams
+    """
+    calorie_adjustment, protein_per_kg = OBJECTIVE_TARGETS[FitnessObjective(objective)]
+    tdee = measured_tdee
+    if tdee is None:
+        tdee = _formula_tdee(weight_kg, height_cm, age, ACTIVITY_FACTORS[training_days])
+    tdee, target_calories, protein_g, carbs_g, fat_g = _macros(
+        tdee, weight_kg, calorie_adjustment, protein_per_kg
+    )
+    return NutritionTargets(
+        float(round(tdee)),
+        float(round(target_calories)),
+        float(round(protein_g)),
+        float(max(round(carbs_g), 0)),
+        float(round(fat_g)),
+    )
+
+
+def profile_inputs(profile: UserProfile) -> Tuple[float, float, int, FitnessObjective, int]:
+    """Memoization key: only the fields the targets depend on"""
+    return (
+        round(profile.weight_kg, 1),
+        round(profile.height_cm, 1),
+        profile.age,
+        FitnessObjective(profile.objective),
+        profile.training_days_per_week,
+    )
+
+
+def calculate_targets_bulk(
+    inputs: Sequence[Tuple], measured_tdee: Optional[Sequence[Optional[float]]] = None
+) -> List[NutritionTargets]:
+    """
+    Targets for many profiles at once (formula changes, backfills)
+
+    Computed column-wise with numpy when available, otherwise through the
+    memoized scalar path (distinct inputs are computed once).
+
+    Args:
+        inputs: profile_inputs() tuples
+        measured_tdee: Optional adaptive TDEE per input (None entries use the formula)
+
+    Returns:
+        NutritionTargets in input order
+    """
+    if measured_tdee is None:
+        measured_tdee = [None] * len(inputs)
+    if numpy is None or not inputs:
+        return [calculate_targets(*row, measured) for row, measured in zip(inputs, measured_tdee)]
+
+    weight, height, age, objectives, days = zip(*inputs)
+    adjustments = [OBJECTIVE_TARGETS[FitnessObjective(objective)] for objective in objectives]
+    weight = numpy.asarray(weight, dtype=float)
+    formula_tdee = _formula_tdee(
+        weight,
+        numpy.asarray(height, dtype=float),
+        numpy.asarray(age, dtype=float),
+        numpy.asarray(ACTIVITY_FACTORS)[numpy.asarray(days)],
+    )
+    measured = numpy.asarray([numpy.nan if value is None else value for value in measured_tdee], dtype=float)
+    columns = _macros(
+        numpy.where(numpy.isnan(measured), formula_tdee, measured),
+        weight,
+        numpy.asarray([adjustment for adjustment, _ in adjustments]),
+        numpy.asarray([protein for _, protein in adjustments]),
+    )
+    tdee, target_calories, protein_g, carbs_g, fat_g = (numpy.rint(column) for column in columns)
+    carbs_g = numpy.maximum(carbs_g, 0)
+    return [
+        NutritionTargets(*values)
+        for values in zip(
+            tdee.tolist(), target_calories.tolist(), protein_g.tolist(), carbs_g.tolist(), fat_g.tolist()
+        )
+    ]
+
+
+def plan_targets(plan: NutritionPlan) -> NutritionTargets:
+    """Stored plan values in NutritionTargets form (for change detection)"""
+    return NutritionTargets(plan.tdee, plan.target_calories, plan.protein_g, plan.carbs_g, plan.fat_g)
+
+
+class NutritionService:
+    """Service for nutrition plan operations"""
+
+    @staticmethod
+    async def get_latest_plan(db: AsyncSession, user_id: int) -> Optional[NutritionPlan]:
+        """
+        Get the user's most recent nutrition plan
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            NutritionPlan or None if never calculated
+        """
+        result = await db.execute(
+            select(NutritionPlan)
+            .where(NutritionPlan.user_id == user_id)
+            .order_by(NutritionPlan.id.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_latest_plans(db: AsyncSession, user_ids: Sequence[int]) -> dict:
+        """
+        Most recent nutrition plan per user in one query
+
+        Args:
+            db: Database session
+            user_ids: Users to look up
+
+        Returns:
+            Mapping user_id -> NutritionPlan (users without a plan are absent)
+        """
+        latest_ids = (
+            select(func.max(NutritionPlan.id))
+            .where(NutritionPlan.user_id.in_(user_ids))
+            .group_by(NutritionPlan.user_id)
+        )
+        result = await db.execute(select(NutritionPlan).where(NutritionPlan.id.in_(latest_ids)))
+        return {plan.user_id: plan for plan in result.scalars()}
+
+    @staticmethod
+    async def current_targets(db: AsyncSession, profile: UserProfile) -> Tuple[NutritionTargets, str]:
+        """
+        Targets for the profile, from the weight trend when it is usable
+
+        Args:
+            db: Database session
+            profile: User profile
+
+        Returns:
+            (NutritionTargets, TDEE source: "adaptive" or "formula")
+        """
+        inputs = profile_inputs(profile)
+        targets = calculate_targets(*inputs)
+        trend = await db.get(WeightTrend, profile.user_id)
+        measured = adaptive_tdee(trend, targets.tdee)
+        if measured is None:
+            return targets, "formula"
+        return calculate_targets(*inputs, float(round(measured))), "adaptive"
+
+    @staticmethod
+    async def sync_plan(db: AsyncSession, profile: UserProfile) -> NutritionPlan:
+        """
+        Calculate targets for the profile, writing a new plan only if they changed
+
+        Args:
+            db: Database session
+            profile: User profile
+
+        Returns:
+            The user's current NutritionPlan (existing or newly written)
+        """
+        targets, source = await NutritionService.current_targets(db, profile)
+        latest = await NutritionService.get_latest_plan(db, profile.user_id)
+        if latest is not None and plan_targets(latest) == targets:
+            return latest
+
+        plan = NutritionPlan(user_id=profile.user_id, tdee_source=source, **targets._asdict())
+        db.add(plan)
+        await db.commit()
+        await db.refresh(plan)
+        return plan
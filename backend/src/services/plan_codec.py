@@ -0,0 +1,140 @@
+"""
+Plan Codec - Compact storage format for WorkoutPlan.plan_data
+Blocks reference catalog exercises by id; names, muscles and safety notes are rehydrated at read time.
+Only exact catalog names (case and accents aside) become references, and whatever the LLM wrote
+differently from the catalog entry is kept, so expand_plan_data(compact_plan_data(plan)) == plan.
+
+Stored format (format 2):
+    {
+        "format": 2,
+        "f": 55,                      # fatiga_score_usado
+        "a": "...",                   # ajuste_aplicado (optional)
+        "disclaimer": "...",          # only if it differs from the default
+        "blocks": [
+            {"id": 12, "s": 4, "r": "8-12", "rpe": 7, "d": 90},              # catalog exercise
+            {"id": 3, "s": 3, "r": "10", "rpe": 8, "d": 60, "n": "..."},     # + custom notes
+            {"id": 5, "ej": "...", "m": "...", "s": 3, ...},                  # + own spelling, muscle
+            {"ej": "...", "m": "...", "s": 3, "r": "12", "rpe": 6, "d": 60, "n": "..."},  # not in catalog
+        ],
+    }
+
+Rows without "format" are legacy full WorkoutPlanResponse dumps and are returned unchanged.
+"""
+from typing import List
+
+from src.core.compressed_json import LazyJSON
+from src.schemas.workout import WorkoutPlanResponse
+from src.services.exercise_catalog import exercise_catalog
+from src.services.search_service import SearchService
+
+PLAN_FORMAT = 2
+DEFAULT_DISCLAIMER = WorkoutPlanResponse.model_fields["disclaimer_medico"].default
+
+# Used if a referenced exercise was removed from the catalog
+MISSING_EXERCISE_MUSCLE = "general"
+MISSING_EXERCISE_NOTES = "Ejercicio retirado del catálogo. Consulta la técnica con un profesional."
+
+
+def is_compact(plan_data: dict) -> bool:
+    return plan_data.get("format") == PLAN_FORMAT
+
+
+def _catalog_muscle(entry) -> str:
+    return entry.muscle_groups[0] if entry and entry.muscle_groups else MISSING_EXERCISE_MUSCLE
+
+
+def compact_plan_data(plan: WorkoutPlanResponse) -> dict:
+    """
+    Encode a plan in the compact storage format
+
+    Call after `await exercise_catalog.ensure_loaded(db)`; blocks whose exercise
+    is not a catalog name are stored inline.
+
+    Args:
+        plan: Validated plan
+
+    Returns:
+        Compact plan_data dict
+    """
+    blocks: List[dict] = []
+    for block in plan.workout_plan:
+        compact = {
+            "s": block.series,
+            "r": block.repeticiones,
+            "rpe": block.rpe_objetivo,
+            "d": block.descanso_segundos,
+        }
+        entry = SearchService.find_exercise(block.ejercicio)
+        if entry is not None:
+            compact = {"id": entry.id, **compact}
+            if block.ejercicio != entry.name:
+                compact["ej"] = block.ejercicio
+            if block.musculo != _catalog_muscle(entry):
+                compact["m"] = block.musculo
+            if block.notas_seguridad != entry.safety_notes:
+                compact["n"] = block.notas_seguridad
+        else:
+            compact = {"ej": block.ejercicio, "m": block.musculo, **compact, "n": block.notas_seguridad}
+        blocks.append(compact)
+
+    plan_data = {"format": PLAN_FORMAT, "f": plan.fatiga_score_usado, "blocks": blocks}
+    if plan.ajuste_aplicado:
+        plan_data["a"] = plan.ajuste_aplicado
+    if plan.disclaimer_medico != DEFAULT_DISCLAIMER:
+        plan_data["disclaimer"] = plan.disclaimer_medico
+    return plan_data
+
+
+def expand_plan_data(plan_data: dict) -> dict:
+    """
+    Rehydrate stored plan_data into the WorkoutPlanResponse shape
+
+    Call after `await exercise_catalog.ensure_loaded(db)`.
+
+    Args:
+        plan_data: Stored plan_data (compact or legacy)
+
+    Returns:
+        Dict with workout_plan, disclaimer_medico, fatiga_score_usado, ajuste_aplicado
+    """
+    if not is_compact(plan_data):
+        return plan_data
+
+    workout_plan = []
+    for block in plan_data["blocks"]:
+        if "id" in block:
+            entry = exercise_catalog.get(block["id"])
+            ejercicio = block.get("ej") or (entry.name if entry else f"Ejercicio {block['id']}")
+            musculo = block.get("m") or _catalog_muscle(entry)
+            notas = block.get("n") or (entry.safety_notes if entry else MISSING_EXERCISE_NOTES)
+        else:
+            ejercicio, musculo, notas = block["ej"], block["m"], block["n"]
+
+        workout_plan.append(
+            {
+                "musculo": musculo,
+                "ejercicio": ejercicio,
+                "series": block["s"],
+                "repeticiones": block["r"],
+                "rpe_objetivo": block["rpe"],
+                "descanso_segundos": block["d"],
+                "notas_seguridad": notas,
+            }
+        )
+
+    return {
+        "workout_plan": workout_plan,
+        "disclaimer_medico": plan_data.get("disclaimer", DEFAULT_DISCLAIMER),
+        "fatiga_score_usado": plan_data["f"],
+        "ajuste_aplicado": plan_data.get("a"),
+    }
+
+
+def plan_exercise_count(plan_data: dict) -> int:
+    """Number of blocks, without rehydrating (or decompressing)"""
+    if isinstance(plan_data, LazyJSON) and not plan_data.decoded and plan_data.item_count is not None:
+        return plan_data.item_count
+    if is_compact(plan_data):
+        return len(plan_data["blocks"])
+    return len(plan_data.get("workout_plan", []))
+
@@ -0,0 +1,125 @@
+"""
+Plan Compression Service - Train and load shared dictionaries for compressed plan storage
+"""
+import json
+import re
+from collections import Counter
+from typing import List, Mapping
+
+from sqlalchemy import select, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.compressed_json import compression_dictionaries
+from src.core.config import settings
+from src.models.plan_dictionary import PlanDictionary
+from src.models.workout_plan import WorkoutPlan
+
+# JSON tokens: strings, numbers, punctuation and literals
+_JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?|[{}\[\]:,]|true|false|null')
+MAX_NGRAM_TOKENS = 6
+MIN_FRAGMENT_LENGTH = 4
+
+
+def train_dictionary(samples: List[Mapping], size: int) -> bytes:
+    """
+    Build a zlib preset dictionary from sample plans
+
+    Fragments (runs of up to MAX_NGRAM_TOKENS JSON tokens) are ranked by how many
+    bytes they would save across the samples (document frequency x length) and
+    packed greedily; the most valuable fragments go last, closest to the data.
+
+    Args:
+        samples: Stored plan_data values
+        size: Maximum dictionary size in bytes
+
+    Returns:
+        Dictionary bytes
+    """
+    frequency: Counter = Counter()
+    for sample in samples:
+        raw = json.dumps(dict(sample), separators=(",", ":"), ensure_ascii=False)
+        tokens = _JSON_TOKEN.findall(raw)
+        fragments = set()
+        for n in range(1, MAX_NGRAM_TOKENS + 1):
+            for i in range(len(tokens) - n + 1):
+                fragment = "".join(tokens[i:i + n])
+                if len(fragment) >= MIN_FRAGMENT_LENGTH:
+                    fragments.add(fragment)
+        frequency.update(fragments)
+
+    ranked = sorted(
+        (
+            (count * len(fragment.encode("utf-8")), fragment)
+            for fragment, count in frequency.items()
+            if count >= 2
+        ),
+        reverse=True,
+    )
+
+    chosen: List[str] = []
+    packed = ""
+    total = 0
+    for _score, fragment in ranked:
+        length = len(fragment.encode("utf-8"))
+        if total + length > size or fragment in packed:
+            continue
+        chosen.append(fragment)
+        packed += fragment
+        total += length
+        if size - total < MIN_FRAGMENT_LENGTH:
+            break
+
+    return "".join(reversed(chosen)).encode("utf-8")
+
+
+class PlanCompressionService:
+    """Service for plan compression dictionaries"""
+
+    @staticmethod
+    async def load_dictionaries(db: AsyncSession) -> int:
+        """
+        Register all stored dictionaries (newest becomes current for writes)
+
+        Workers must be restarted to write with a newly trained dictionary
+
+        Returns:
+            Number of dictionaries loaded
+        """
+        result = await db.execute(select(PlanDictionary).order_by(PlanDictionary.id))
+        dictionaries = result.scalars().all()
+        for dictionary in dictionaries:
+            compression_dictionaries.register(dictionary.id, dictionary.dictionary)
+        return len(dictionaries)
+
+    @staticmethod
+    async def create_dictionary(
+        db: AsyncSession, sample_size: int = 2000, size: int = settings.PLAN_DICTIONARY_SIZE
+    ) -> PlanDictionary:
+        """
+        Train a dictionary on the most recent plans and store it
+
+        Args:
+            db: Database session
+            sample_size: Number of recent plans to train on
+            size: Maximum dictionary size in bytes
+
+        Returns:
+            Stored PlanDictionary
+
+        Raises:
+            ValueError: If there are not enough plans to train on
+        """
+        result = await db.execute(
+            select(WorkoutPlan.plan_data).order_by(desc(WorkoutPlan.id)).limit(sample_size)
+        )
+        samples = result.scalars().all()
+        if len(samples) < 10:
+            raise ValueError("Not enough stored plans to train a dictionary (need at least 10)")
+
+        dictionary = PlanDictionary(
+            dictionary=train_dictionary(samples, size), sample_size=len(samples)
+        )
+        db.add(dictionary)
+        await db.commit()
+        await db.refresh(dictionary)
+        return dictionary
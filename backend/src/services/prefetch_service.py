@@ -0,0 +1,250 @@
+"""
+Prefetch Service - Off-peak pre-generation of next-day workout plans
+Moves the morning /workouts/generate peak to idle hours
+"""
+import asyncio
+import logging
+import statistics
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, delete, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.models.user_profile import UserProfile
+from src.models.workout_log import WorkoutLog
+from src.models.workout_plan import WorkoutPlan, WorkoutPlanStatus
+from src.services.exercise_catalog import exercise_catalog
+from src.services.llm_scheduler import LLMOverloadedError, Priority
+from src.services.llm_service import InvalidPlanError, llm_service
+from src.services.plan_codec import compact_plan_data
+from src.services.usage_service import BudgetExceededError, UsageService
+from src.services.workout_service import DEFAULT_FATIGUE_SCORE, WorkoutService
+
+logger = logging.getLogger(__name__)
+
+# Users without a plan or log in this window are considered inactive
+ACTIVITY_LOOKBACK = timedelta(days=14)
+
+# Fatigue score used for prefetched plans (same default as WorkoutGenerateRequest)
+PREFETCH_FATIGUE_SCORE = DEFAULT_FATIGUE_SCORE
+
+
+def expected_gap_days(activity_dates: List[date], training_days_per_week: int) -> int:
+    """
+    Expected days between two sessions
+
+    Uses the median interval of recent activity when there is enough history,
+    otherwise the nominal cadence from training_days_per_week
+
+    Args:
+        activity_dates: Sorted distinct dates with a generated plan or workout log
+        training_days_per_week: Profile's planned training frequency
+
+    Returns:
+        Gap in days (1-7)
+    """
+    if len(activity_dates) >= 3:
+        intervals = [
+            (later - earlier).days for earlier, later in zip(activity_dates, activity_dates[1:])
+        ]
+        gap = statistics.median(intervals)
+    else:
+        gap = 7 / max(1, training_days_per_week)
+    return min(7, max(1, round(gap)))
+
+
+class PrefetchService:
+    """Service for the nightly workout prefetch job"""
+
+    @staticmethod
+    async def find_users_due(db: AsyncSession, target_date: date) -> List[UserProfile]:
+        """
+        Find active users whose next training day is target_date
+
+        Args:
+            db: Database session
+            target_date: Day the plans are generated for (usually tomorrow)
+
+        Returns:
+            Profiles of users due on target_date without a valid pending plan
+        """
+        now = datetime.utcnow()
+        since = now - ACTIVITY_LOOKBACK
+
+        # Recent activity (plans received + workouts logged) in one round trip
+        activity = union_all(
+            select(WorkoutPlan.user_id, WorkoutPlan.created_at).where(
+                WorkoutPlan.created_at >= since, WorkoutPlan.status == WorkoutPlanStatus.READY
+            ),
+            select(WorkoutLog.user_id, WorkoutLog.created_at).where(WorkoutLog.created_at >= since),
+        )
+        result = await db.execute(activity)
+
+        activity_by_user: Dict[int, set] = {}
+        for user_id, created_at in result.all():
+            activity_by_user.setdefault(user_id, set()).add(created_at.date())
+
+        if not activity_by_user:
+            return []
+
+        # Users that already have a plan waiting
+        result = await db.execute(
+            select(WorkoutPlan.user_id)
+            .where(
+                WorkoutPlan.status == WorkoutPlanStatus.PENDING,
+                WorkoutPlan.created_at >= now - timedelta(hours=settings.WORKOUT_PREFETCH_MAX_AGE_HOURS),
+            )
+            .distinct()
+        )
+        already_pending = set(result.scalars().all())
+
+        result = await db.execute(
+            select(UserProfile).where(UserProfile.user_id.in_(list(activity_by_user)))
+        )
+
+        due = []
+        for profile in result.scalars().all():
+            if profile.user_id in already_pending:
+                continue
+
+            dates = sorted(activity_by_user[profile.user_id])
+            gap = expected_gap_days(dates, profile.training_days_per_week)
+            if (target_date - dates[-1]).days >= gap:
+                due.append(profile)
+
+        return due
+
+    @staticmethod
+    async def prefetch_for_user(
+        user_id: int,
+        fatigue_score: int = PREFETCH_FATIGUE_SCORE,
+        endpoint: str = "workout_prefetch",
+    ) -> bool:
+        """
+        Generate and store a pending plan for one user (own sessions, safe to run concurrently)
+
+        The profile and exercises are loaded in one short session and the plan
+        stored in another: no pooled connection is held while Claude generates.
+
+        Args:
+            user_id: User to generate for
+            fatigue_score: Fatigue score to generate with
+            endpoint: Usage accounting label
+
+        Returns:
+            True if a pending plan was stored, False if skipped (no profile or over budget)
+        """
+        # Dated when the profile was read, so a profile update during generation
+        # makes the plan unclaimable (see WorkoutService.claim_pending_plan)
+        started_at = datetime.utcnow()
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(UserProfile).where(UserProfile.user_id == user_id))
+            profile = result.scalar_one_or_none()
+            if not profile:
+                return False
+
+            available_exercises = await WorkoutService.get_available_exercises(db, profile)
+            await exercise_catalog.ensure_loaded(db)
+
+        # Prefetch must not consume budget the user no longer has
+        try:
+            reservation = await UsageService.reserve(user_id, endpoint)
+        except BudgetExceededError:
+            return False
+
+        try:
+            try:
+                workout_plan_response, usage = await llm_service.call_anthropic_claude(
+                    profile=profile,
+                    fatigue_score=fatigue_score,
+                    available_exercises=available_exercises,
+                    priority=Priority.PREFETCH,
+                )
+            except InvalidPlanError as e:
+                async with AsyncSessionLocal() as db:
+                    await UsageService.settle(db, reservation, e.usage)
+                    await db.commit()
+                raise
+
+            async with AsyncSessionLocal() as db:
+                db.add(
+                    WorkoutPlan(
+                        user_id=user_id,
+                        plan_data=compact_plan_data(workout_plan_response),
+                        fatigue_score_used=fatigue_score,
+                        status=WorkoutPlanStatus.PENDING,
+                        created_at=started_at,
+                    )
+                )
+                await UsageService.settle(db, reservation, usage)
+                await db.commit()
+        finally:
+            await UsageService.release(reservation)
+        return True
+
+    @staticmethod
+    async def purge_expired(db: AsyncSession) -> int:
+        """
+        Delete pending plans that can no longer be claimed
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of deleted plans
+        """
+        cutoff = datetime.utcnow() - timedelta(hours=settings.WORKOUT_PREFETCH_MAX_AGE_HOURS)
+        result = await db.execute(
+            delete(WorkoutPlan).where(
+                WorkoutPlan.status == WorkoutPlanStatus.PENDING, WorkoutPlan.created_at < cutoff
+            )
+        )
+        await db.commit()
+        return result.rowcount or 0
+
+    @staticmethod
+    async def run(
+        target_date: Optional[date] = None,
+        concurrency: Optional[int] = None,
+        dry_run: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Run the prefetch job
+
+        Args:
+            target_date: Training day to prefetch for (defaults to tomorrow, UTC)
+            concurrency: Maximum concurrent generations (defaults to WORKOUT_PREFETCH_CONCURRENCY)
+            dry_run: Only count due users, do not call the LLM
+
+        Returns:
+            Counters: due, generated, skipped, failed, purged
+        """
+        target_date = target_date or (datetime.utcnow().date() + timedelta(days=1))
+        concurrency = concurrency or settings.WORKOUT_PREFETCH_CONCURRENCY
+
+        async with AsyncSessionLocal() as db:
+            purged = 0 if dry_run else await PrefetchService.purge_expired(db)
+            due_profiles = await PrefetchService.find_users_due(db, target_date)
+            user_ids = [profile.user_id for profile in due_profiles]
+
+        stats = {"due": len(user_ids), "generated": 0, "skipped": 0, "failed": 0, "purged": purged}
+        if dry_run:
+            return stats
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _prefetch(user_id: int):
+            async with semaphore:
+                try:
+                    stored = await PrefetchService.prefetch_for_user(user_id)
+                    stats["generated" if stored else "skipped"] += 1
+                except (ValueError, LLMOverloadedError) as e:
+                    stats["failed"] += 1
+                    logger.warning("Prefetch failed for user %s: %s", user_id, e)
+
+        await asyncio.gather(*(_prefetch(user_id) for user_id in user_ids))
+        return stats
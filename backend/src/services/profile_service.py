@@ -1,13 +1,20 @@
 """
 Profile Service - User profile management
 """
+from datetime import datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from src.core.config import settings
+from src.core.response_cache import response_cache
 from src.models.user import User
 from src.models.user_profile import UserProfile
 from src.schemas.profile import UserProfileCreate, UserProfileUpdate, UserProfileResponse
+from src.services.body_weight_service import BodyWeightService
+from src.services.nutrition_service import NutritionService, profile_inputs
+from src.services.prefetch_service import PrefetchService
+from src.services.speculative_service import speculative_generations
 
 
 class ProfileService:
@@ -28,9 +35,29 @@ class ProfileService:
         result = await db.execute(select(UserProfile).where(UserProfile.user_id == user.id))
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_profile_updated_at(db: AsyncSession, user: User) -> Optional[datetime]:
+        """
+        Get the profile's last modification time without loading the row
+
+        Args:
+            db: Database session
+            user: Current user
+
+        Returns:
+            updated_at or None if the user has no profile
+        """
+        result = await db.execute(
+            select(UserProfile.updated_at).where(UserProfile.user_id == user.id)
+        )
+        return result.scalar_one_or_none()
+
     @staticmethod
     async def create_user_profile(
-        db: AsyncSession, user: User, request: UserProfileCreate
+        db: AsyncSession,
+        user: User,
+        request: UserProfileCreate,
+        speculative_plan: bool = True,
     ) -> UserProfile:
         """
         Create user profile (onboarding)
@@ -39,6 +66,8 @@ class ProfileService:
             db: Database session
             user: Current user
             request: Profile creation request
+            speculative_plan: Start generating the first workout plan in background (SC-001),
+                if enabled by SPECULATIVE_FIRST_PLAN
 
         Returns:
             Created UserProfile
@@ -55,9 +84,19 @@ class ProfileService:
         profile = UserProfile(user_id=user.id, **request.model_dump())
 
         db.add(profile)
+        # First point of the body-weight series
+        await BodyWeightService.record_entry(db, profile, profile.weight_kg, datetime.utcnow().date())
         await db.commit()
         await db.refresh(profile)
 
+        # First /workouts/generate attaches to this instead of starting a new LLM call
+        if speculative_plan and settings.SPECULATIVE_FIRST_PLAN:
+            user_id = user.id
+            speculative_generations.start(
+                user_id,
+                lambda: PrefetchService.prefetch_for_user(user_id, endpoint="workout_speculative"),
+            )
+
         return profile
 
     @staticmethod
@@ -83,12 +122,28 @@ class ProfileService:
         if not profile:
             raise ValueError("User profile not found. Use POST /create first.")
 
+        nutrition_inputs = profile_inputs(profile)
+
         # Update fields (only non-None values)
         update_data = request.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(profile, field, value)
 
+        # Every submitted weight is a point of the series, even if unchanged
+        weight_logged = update_data.get("weight_kg") is not None
+        if weight_logged:
+            await BodyWeightService.record_entry(db, profile, profile.weight_kg, datetime.utcnow().date())
+
         await db.commit()
         await db.refresh(profile)
 
+        # FR-020: recalculate nutrition when weight, height, age, objective or training days
+        # change, or a weigh-in moved the adaptive TDEE trend
+        if weight_logged or profile_inputs(profile) != nutrition_inputs:
+            await NutritionService.sync_plan(db, profile)
+
+        # A plan generated from the old profile must not be served
+        speculative_generations.cancel(user.id)
+        response_cache.invalidate("profile", user.id)
+
         return profile
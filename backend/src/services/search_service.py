@@ -0,0 +1,192 @@
+"""
+Search Service - Accent-insensitive fuzzy exercise search
+In-memory trigram index over the cached catalog, plus exact name lookup (LLM exercise names to catalog ids)
+"""
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.core.text import normalize_text
+from src.services.exercise_catalog import CatalogEntry, exercise_catalog
+
+# Ranking: share of the query found in the name (partial words) vs. overall closeness (typos, length)
+CONTAINMENT_WEIGHT = 0.6
+JACCARD_WEIGHT = 0.4
+MUSCLE_MATCH_FACTOR = 0.5  # Matches on muscle groups rank below name matches
+MIN_SEARCH_SCORE = 0.3
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Connectors that appear in most Spanish names ("Remo con Barra", "Curl de Bíceps")
+STOPWORDS = {"con", "de", "del", "en", "al", "a", "la", "el", "los", "las", "y"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized words without connectors ("Curl de Bíceps" -> ["curl", "biceps"])"""
+    return [word for word in _NON_ALNUM.split(normalize_text(text)) if word and word not in STOPWORDS]
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Word trigrams with pg_trgm-style padding ("  sen", " se", ... "la ")
+
+    The leading padding makes word prefixes ("sent") share trigrams with full words
+    """
+    grams: Set[str] = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class ExerciseSearchIndex:
+    """
+    Trigram inverted index over exercise names and muscle groups
+
+    `sync` diffs the catalog against the indexed entries, so a new catalog
+    version only re-indexes the exercises that were added, changed or removed
+    """
+
+    def __init__(self):
+        self.version: Optional[str] = None
+        self.entries: Dict[int, CatalogEntry] = {}
+        self._keys: Dict[int, Tuple[str, Tuple[str, ...]]] = {}
+        self._by_name: Dict[str, int] = {}
+        self._name_grams: Dict[int, Set[str]] = {}
+        self._muscle_grams: Dict[int, Set[str]] = {}
+        self._name_postings: Dict[str, Set[int]] = {}
+        self._muscle_postings: Dict[str, Set[int]] = {}
+
+    def sync(self, entries: List[CatalogEntry], version: Optional[str] = None) -> int:
+        """
+        Bring the index in line with a catalog snapshot
+
+        Args:
+            entries: Catalog entries
+            version: Catalog version (no-op if already indexed)
+
+        Returns:
+            Number of exercises (re)indexed or removed
+        """
+        if version is not None and version == self.version:
+            return 0
+
+        incoming = {entry.id: entry for entry in entries}
+        changes = 0
+
+        for exercise_id in list(self.entries):
+            entry = incoming.get(exercise_id)
+            if entry is None or self._key(entry) != self._keys[exercise_id]:
+                self._remove(exercise_id)
+                changes += 1
+
+        for exercise_id, entry in incoming.items():
+            if exercise_id not in self.entries:
+                self._add(entry)
+                changes += 1
+            else:
+                self.entries[exercise_id] = entry  # Refresh non-indexed fields
+
+        self.version = version
+        return changes
+
+    @staticmethod
+    def _key(entry: CatalogEntry) -> Tuple[str, Tuple[str, ...]]:
+        return entry.normalized_name, entry.muscle_groups
+
+    def _add(self, entry: CatalogEntry):
+        self.entries[entry.id] = entry
+        self._keys[entry.id] = self._key(entry)
+        self._by_name[entry.normalized_name] = entry.id
+        self._name_grams[entry.id] = trigrams(entry.name)
+        self._muscle_grams[entry.id] = trigrams(" ".join(entry.muscle_groups))
+        for gram in self._name_grams[entry.id]:
+            self._name_postings.setdefault(gram, set()).add(entry.id)
+        for gram in self._muscle_grams[entry.id]:
+            self._muscle_postings.setdefault(gram, set()).add(entry.id)
+
+    def _remove(self, exercise_id: int):
+        for gram in self._name_grams.pop(exercise_id, ()):
+            self._name_postings[gram].discard(exercise_id)
+        for gram in self._muscle_grams.pop(exercise_id, ()):
+            self._muscle_postings[gram].discard(exercise_id)
+        entry = self.entries.pop(exercise_id, None)
+        if entry is not None and self._by_name.get(entry.normalized_name) == exercise_id:
+            del self._by_name[entry.normalized_name]
+        self._keys.pop(exercise_id, None)
+
+    @staticmethod
+    def _count(query: Set[str], postings: Dict[str, Set[int]]) -> Dict[int, int]:
+        shared: Dict[int, int] = {}
+        for gram in query:
+            for exercise_id in postings.get(gram, ()):
+                shared[exercise_id] = shared.get(exercise_id, 0) + 1
+        return shared
+
+    def search(
+        self, query: str, limit: int = 10, min_score: float = MIN_SEARCH_SCORE
+    ) -> List[Tuple[CatalogEntry, float]]:
+        """
+        Rank exercises for a free-text query
+
+        Args:
+            query: Search text (typos, accents and partial words allowed)
+            limit: Maximum number of results
+            min_score: Drop results below this score (0-1)
+
+        Returns:
+            List of (entry, score) ordered by score
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        scores: Dict[int, float] = {}
+        for exercise_id, shared in self._count(query_grams, self._name_postings).items():
+            grams = self._name_grams[exercise_id]
+            containment = shared / len(query_grams)
+            jaccard = shared / (len(query_grams) + len(grams) - shared)
+            scores[exercise_id] = CONTAINMENT_WEIGHT * containment + JACCARD_WEIGHT * jaccard
+
+        for exercise_id, shared in self._count(query_grams, self._muscle_postings).items():
+            score = MUSCLE_MATCH_FACTOR * shared / len(query_grams)
+            if score > scores.get(exercise_id, 0.0):
+                scores[exercise_id] = score
+
+        ranked = sorted(
+            ((exercise_id, score) for exercise_id, score in scores.items() if score >= min_score),
+            key=lambda item: (-item[1], self.entries[item[0]].name),
+        )
+        return [(self.entries[exercise_id], score) for exercise_id, score in ranked[:limit]]
+
+    def lookup(self, name: str) -> Optional[CatalogEntry]:
+        """Catalog entry with exactly this name, ignoring case and accents (None if unknown)"""
+        exercise_id = self._by_name.get(normalize_text(name))
+        return self.entries[exercise_id] if exercise_id is not None else None
+
+
+class SearchService:
+    """Service for exercise search over the cached catalog"""
+
+    _index = ExerciseSearchIndex()
+
+    @staticmethod
+    def get_index() -> ExerciseSearchIndex:
+        """
+        Search index synced to the current catalog version
+
+        Callers load the catalog first with `await exercise_catalog.ensure_loaded(db)`
+        """
+        index = SearchService._index
+        if index.version != exercise_catalog.version:
+            index.sync(exercise_catalog.entries, exercise_catalog.version)
+        return index
+
+    @staticmethod
+    def search(query: str, limit: int = 10) -> List[Tuple[CatalogEntry, float]]:
+        """Rank catalog exercises for a free-text query"""
+        return SearchService.get_index().search(query, limit)
+
+    @staticmethod
+    def find_exercise(name: str) -> Optional[CatalogEntry]:
+        """Catalog entry with exactly this name, ignoring case and accents (None if unknown)"""
+        return SearchService.get_index().lookup(name)
@@ -0,0 +1,83 @@
+"""
+Speculative Generation Registry - Background plan generations per user
+Lets a /workouts/generate request attach to a generation that is already running
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeGenerationRegistry:
+    """
+    In-process registry of speculative generation tasks (one per user)
+    Production with several workers: a request landing on another worker simply
+    finds the stored pending plan once the task completes
+    """
+
+    def __init__(self):
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def start(self, user_id: int, generate: Callable[[], Awaitable[object]]) -> asyncio.Task:
+        """
+        Start a background generation for a user, replacing any previous one
+
+        Args:
+            user_id: User the plan is generated for
+            generate: Zero-argument coroutine factory that generates and stores the plan
+
+        Returns:
+            The background task
+        """
+        self.cancel(user_id)
+
+        task = asyncio.create_task(generate())
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda t: self._on_done(user_id, t))
+        return task
+
+    def cancel(self, user_id: int) -> bool:
+        """
+        Cancel the user's in-flight generation (e.g. profile changed)
+
+        Returns:
+            True if a running task was cancelled
+        """
+        task = self._tasks.pop(user_id, None)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def is_running(self, user_id: int) -> bool:
+        task = self._tasks.get(user_id)
+        return task is not None and not task.done()
+
+    async def wait(self, user_id: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the user's in-flight generation without cancelling it on timeout
+
+        Args:
+            user_id: User to wait for
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a generation finished successfully while waiting
+        """
+        task = self._tasks.get(user_id)
+        if task is None:
+            return False
+
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        return bool(done) and not task.cancelled() and task.exception() is None
+
+    def _on_done(self, user_id: int, task: asyncio.Task):
+        if self._tasks.get(user_id) is task:
+            del self._tasks[user_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Speculative generation failed for user %s: %s", user_id, task.exception())
+
+
+# Global registry instance
+speculative_generations = SpeculativeGenerationRegistry()
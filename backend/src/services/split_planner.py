@@ -0,0 +1,169 @@
+"""
+Split Planner - Local weekly split selection and volume balancing
+Decides which muscle regions each training day covers and enforces weekly set caps
+"""
+from dataclasses import dataclass
+from typing import Dict, List
+
+from src.core.text import normalize_text
+from src.models.user_profile import ExperienceLevel
+from src.schemas.workout import WorkoutPlanResponse
+
+# Coarse muscle regions used for weekly volume accounting
+REGION_KEYWORDS = {
+    "pecho": ("pectoral", "pecho"),
+    "espalda": ("dorsal", "espalda", "trapecio", "romboide", "erector", "lumbar"),
+    "hombros": ("deltoide", "hombro"),
+    "brazos": ("bicep", "tricep", "braquial", "antebrazo"),
+    "piernas": ("cuadricep", "isquio", "gluteo", "gemelo", "gastrocnemio", "soleo", "pierna", "femoral"),
+    "core": ("abdominal", "oblicuo", "core", "transverso", "flexores de cadera"),
+}
+
+# Regions covered by each day type
+DAY_FOCUS = {
+    "full_body": ["pecho", "espalda", "piernas", "hombros", "core"],
+    "upper": ["pecho", "espalda", "hombros", "brazos"],
+    "lower": ["piernas", "core"],
+    "push": ["pecho", "hombros", "brazos"],
+    "pull": ["espalda", "brazos"],
+    "legs": ["piernas", "core"],
+}
+
+DAY_LABELS = {
+    "full_body": "Cuerpo completo",
+    "upper": "Tren superior",
+    "lower": "Tren inferior",
+    "push": "Empuje (pecho, hombros, tríceps)",
+    "pull": "Tirón (espalda, bíceps)",
+    "legs": "Piernas y core",
+}
+
+# Weekly split per training days (beginners stay on full body up to 3 days)
+SPLITS = {
+    1: ["full_body"],
+    2: ["full_body", "full_body"],
+    3: ["push", "pull", "legs"],
+    4: ["upper", "lower", "upper", "lower"],
+    5: ["push", "pull", "legs", "upper", "lower"],
+    6: ["push", "pull", "legs", "push", "pull", "legs"],
+    7: ["push", "pull", "legs", "push", "pull", "legs", "full_body"],
+}
+
+# Maximum hard sets per region per week
+WEEKLY_SET_CAPS = {
+    ExperienceLevel.BEGINNER: 10,
+    ExperienceLevel.INTERMEDIATE: 16,
+    ExperienceLevel.ADVANCED: 20,
+}
+
+
+@dataclass(frozen=True)
+class SplitDay:
+    """One training day of a weekly split"""
+
+    day_index: int
+    focus: str
+    regions: List[str]
+    set_budget: int  # Max sets per focus region on this day
+
+    @property
+    def label(self) -> str:
+        return DAY_LABELS[self.focus]
+
+
+def muscle_region(muscle: str) -> str:
+    """
+    Map a free-text muscle name (LLM `musculo` or catalog muscle group) to a region
+
+    Returns:
+        Region key, or "otros" if no keyword matches
+    """
+    normalized = normalize_text(muscle)
+    for region, keywords in REGION_KEYWORDS.items():
+        if any(keyword in normalized for keyword in keywords):
+            return region
+    return "otros"
+
+
+def plan_weekly_split(training_days_per_week: int, experience_level: ExperienceLevel) -> List[SplitDay]:
+    """
+    Choose the weekly split and per-day set budgets
+
+    Args:
+        training_days_per_week: Profile's training frequency (1-7)
+        experience_level: Profile's experience level
+
+    Returns:
+        Ordered list of SplitDay
+    """
+    days = max(1, min(7, training_days_per_week))
+    if experience_level == ExperienceLevel.BEGINNER and days <= 3:
+        focuses = ["full_body"] * days
+    else:
+        focuses = SPLITS[days]
+
+    cap = WEEKLY_SET_CAPS[experience_level]
+    frequency: Dict[str, int] = {}
+    for focus in focuses:
+        for region in DAY_FOCUS[focus]:
+            frequency[region] = frequency.get(region, 0) + 1
+
+    return [
+        SplitDay(
+            day_index=index,
+            focus=focus,
+            regions=DAY_FOCUS[focus],
+            set_budget=max(2, min(cap // frequency[region] for region in DAY_FOCUS[focus])),
+        )
+        for index, focus in enumerate(focuses)
+    ]
+
+
+def weekly_volume(day_plans: List[WorkoutPlanResponse]) -> Dict[str, int]:
+    """Total sets per region across the week"""
+    volume: Dict[str, int] = {}
+    for plan in day_plans:
+        for block in plan.workout_plan:
+            region = muscle_region(block.musculo)
+            volume[region] = volume.get(region, 0) + block.series
+    return volume
+
+
+def balance_weekly_volume(
+    day_plans: List[WorkoutPlanResponse], experience_level: ExperienceLevel
+) -> Dict[str, int]:
+    """
+    Trim sets so no region exceeds the weekly cap (in place)
+
+    Sets are removed one at a time from the largest block of the region,
+    so high-volume days give up volume first. Blocks keep at least one set.
+
+    Args:
+        day_plans: Per-day plans returned by the LLM
+        experience_level: Profile's experience level
+
+    Returns:
+        Weekly sets per region after balancing
+    """
+    cap = WEEKLY_SET_CAPS[experience_level]
+    volume = weekly_volume(day_plans)
+
+    for region, total in volume.items():
+        if region == "otros" or total <= cap:
+            continue
+
+        blocks = [
+            block
+            for plan in day_plans
+            for block in plan.workout_plan
+            if muscle_region(block.musculo) == region
+        ]
+        while total > cap:
+            largest = max(blocks, key=lambda block: block.series)
+            if largest.series <= 1:
+                break
+            largest.series -= 1
+            total -= 1
+        volume[region] = total
+
+    return volume
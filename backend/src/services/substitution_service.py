@@ -0,0 +1,233 @@
+"""
+Substitution Service - Local exercise alternatives (FR-024)
+Precomputes a pairwise similarity matrix over the catalog so alternatives need no LLM call
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.core.text import normalize_text
+from src.services.exercise_catalog import CatalogEntry, DEFAULT_EQUIPMENT, exercise_catalog
+from src.services.search_service import SearchService
+from src.services.split_planner import muscle_region
+
+# Feature weights for the weighted Jaccard similarity
+PRIMARY_MUSCLE_WEIGHT = 1.0  # First entry of Exercise.muscle_groups
+SECONDARY_MUSCLE_WEIGHT = 0.5
+REGION_WEIGHT = 0.3  # Coarse region, lets "pectoral" and "pectoral superior" overlap
+SUBSTITUTE_MIN_SIMILARITY = 0.3  # Automatic swaps below this are dropped instead
+
+# Injury keyword -> normalized keywords of muscles/exercises that stress the area
+INJURY_EXCLUSIONS = {
+    ("hombro", "shoulder", "manguito", "rotator"): (
+        "deltoide", "hombro", "press militar", "elevaciones laterales", "elevaciones frontales",
+        "remo al menton", "fondos",
+    ),
+    ("espalda baja", "lumbar", "lower back", "hernia"): (
+        "lumbar", "erector", "peso muerto", "remo con barra", "sentadilla con barra",
+    ),
+    ("rodilla", "knee", "menisco", "ligamento"): (
+        "cuadricep", "sentadilla", "zancada", "prensa", "extension de cuadriceps",
+    ),
+    ("codo", "elbow", "epicondil"): ("tricep", "press frances", "fondos"),
+    ("muneca", "wrist"): ("press frances", "flexiones", "curl de biceps con barra"),
+    ("cuello", "neck", "cervical"): ("trapecio superior", "remo al menton"),
+    ("cadera", "hip"): ("flexores de cadera", "zancada", "sentadilla"),
+    ("tobillo", "ankle"): ("gemelo", "gastrocnemio", "soleo", "zancada", "mountain climbers"),
+}
+INJURY_AREAS = list(INJURY_EXCLUSIONS)
+
+EQUIPMENT_BITS = {"bodyweight": 1, "dumbbells": 2, "barbell": 4, "cables": 8, "machines": 16}
+
+
+def excluded_keywords(injury_history: List[str]) -> List[str]:
+    """Keywords of muscles/exercises to avoid for the user's injuries"""
+    mask = injury_mask(injury_history)
+    return [
+        keyword
+        for bit, area in enumerate(INJURY_AREAS)
+        if mask & (1 << bit)
+        for keyword in INJURY_EXCLUSIONS[area]
+    ]
+
+
+def injury_mask(injury_history: Optional[List[str]]) -> int:
+    """Bitmask of injured areas (bit i = INJURY_AREAS[i])"""
+    mask = 0
+    for injury in injury_history or []:
+        normalized = normalize_text(injury)
+        for bit, triggers in enumerate(INJURY_AREAS):
+            if any(trigger in normalized for trigger in triggers):
+                mask |= 1 << bit
+    return mask
+
+
+def contraindication_mask(text: str) -> int:
+    """Bitmask of injured areas an exercise (name + muscles) is contraindicated for"""
+    normalized = normalize_text(text)
+    mask = 0
+    for bit, area in enumerate(INJURY_AREAS):
+        if any(keyword in normalized for keyword in INJURY_EXCLUSIONS[area]):
+            mask |= 1 << bit
+    return mask
+
+
+def equipment_mask(equipment: Optional[Iterable[str]]) -> Optional[int]:
+    """Bitmask of available equipment (bodyweight always included); None means no filter"""
+    if equipment is None:
+        return None
+    mask = EQUIPMENT_BITS[DEFAULT_EQUIPMENT]
+    for item in equipment:
+        mask |= EQUIPMENT_BITS.get(item.strip().lower(), 0)
+    return mask
+
+
+class SubstitutionIndex:
+    """
+    Similarity matrix for one catalog version
+
+    Each exercise is a sparse weighted feature vector (primary/secondary muscles
+    and regions). Pairwise weighted Jaccard sum(min)/sum(max) is computed in one
+    pass over an inverted index, so only pairs sharing a feature are visited.
+    Neighbours are stored pre-sorted, so a query is a filtered scan of a short list.
+    """
+
+    def __init__(self, entries: List[CatalogEntry], version: Optional[str] = None):
+        self.version = version
+        self.entries = {entry.id: entry for entry in entries}
+        self.equipment_bits = {e.id: EQUIPMENT_BITS[e.equipment] for e in entries}
+        self.contraindications = {
+            e.id: contraindication_mask(f"{e.name} {' '.join(e.muscle_groups)}") for e in entries
+        }
+        self.neighbours = self._build(entries)
+
+    @staticmethod
+    def _features(entry: CatalogEntry) -> Dict[str, float]:
+        features: Dict[str, float] = {}
+        for position, muscle in enumerate(entry.muscle_groups):
+            weight = PRIMARY_MUSCLE_WEIGHT if position == 0 else SECONDARY_MUSCLE_WEIGHT
+            muscle_key = f"m:{normalize_text(muscle).strip()}"
+            region_key = f"r:{muscle_region(muscle)}"
+            features[muscle_key] = max(features.get(muscle_key, 0.0), weight)
+            features[region_key] = max(features.get(region_key, 0.0), REGION_WEIGHT * weight)
+        return features
+
+    def _build(self, entries: List[CatalogEntry]) -> Dict[int, List[Tuple[int, float]]]:
+        vectors = {entry.id: self._features(entry) for entry in entries}
+        totals = {exercise_id: sum(vector.values()) for exercise_id, vector in vectors.items()}
+
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for exercise_id, vector in vectors.items():
+            for feature, weight in vector.items():
+                postings.setdefault(feature, []).append((exercise_id, weight))
+
+        neighbours: Dict[int, List[Tuple[int, float]]] = {}
+        for exercise_id, vector in vectors.items():
+            overlap: Dict[int, float] = {}
+            for feature, weight in vector.items():
+                for other_id, other_weight in postings[feature]:
+                    if other_id != exercise_id:
+                        overlap[other_id] = overlap.get(other_id, 0.0) + min(weight, other_weight)
+
+            scored = [
+                (other_id, shared / (totals[exercise_id] + totals[other_id] - shared))
+                for other_id, shared in overlap.items()
+            ]
+            scored.sort(key=lambda item: (-item[1], self.entries[item[0]].name))
+            neighbours[exercise_id] = scored
+
+        return neighbours
+
+    def alternatives(
+        self,
+        exercise_id: int,
+        equipment: Optional[Iterable[str]] = None,
+        injury_history: Optional[List[str]] = None,
+        limit: int = 5,
+        min_similarity: float = 0.0,
+    ) -> List[Tuple[CatalogEntry, float]]:
+        """
+        Top-k most similar exercises usable with the equipment and injuries
+
+        Args:
+            exercise_id: Exercise to replace
+            equipment: Available equipment (None = no equipment filter)
+            injury_history: Injuries; contraindicated exercises are skipped
+            limit: Maximum number of alternatives
+            min_similarity: Skip alternatives below this similarity
+
+        Returns:
+            List of (entry, similarity) ordered by similarity
+        """
+        allowed_equipment = equipment_mask(equipment)
+        injured = injury_mask(injury_history)
+
+        alternatives = []
+        for other_id, similarity in self.neighbours.get(exercise_id, []):
+            if similarity < min_similarity or len(alternatives) >= limit:
+                break
+            if allowed_equipment is not None and not self.equipment_bits[other_id] & allowed_equipment:
+                continue
+            if self.contraindications[other_id] & injured:
+                continue
+            alternatives.append((self.entries[other_id], similarity))
+        return alternatives
+
+
+class SubstitutionService:
+    """Service for exercise alternatives over the cached catalog"""
+
+    _index: Optional[SubstitutionIndex] = None
+
+    @staticmethod
+    def get_index() -> SubstitutionIndex:
+        """
+        Similarity index for the current catalog version (rebuilt when the version changes)
+
+        Callers load the catalog first with `await exercise_catalog.ensure_loaded(db)`
+        """
+        index = SubstitutionService._index
+        if index is None or index.version != exercise_catalog.version:
+            index = SubstitutionIndex(exercise_catalog.entries, exercise_catalog.version)
+            SubstitutionService._index = index
+        return index
+
+    @staticmethod
+    def alternatives(
+        exercise_id: int,
+        equipment: Optional[Iterable[str]] = None,
+        injury_history: Optional[List[str]] = None,
+        limit: int = 5,
+    ) -> List[Tuple[CatalogEntry, float]]:
+        """
+        Alternatives for a catalog exercise
+
+        Raises:
+            ValueError: If the exercise is not in the catalog
+        """
+        index = SubstitutionService.get_index()
+        if exercise_id not in index.entries:
+            raise ValueError("Exercise not found")
+        return index.alternatives(exercise_id, equipment, injury_history, limit)
+
+    @staticmethod
+    def substitute(
+        exercise_name: str,
+        equipment: Optional[Iterable[str]] = None,
+        injury_history: Optional[List[str]] = None,
+    ) -> Optional[CatalogEntry]:
+        """
+        Best safe replacement for an exercise referenced by name (plan blocks, chat)
+
+        The name must be a catalog name (case and accents aside): a fuzzy match
+        could resolve to another exercise, for another muscle or equipment.
+
+        Returns:
+            Replacement entry, or None if the name is unknown or nothing fits
+        """
+        index = SubstitutionService.get_index()
+        entry = SearchService.find_exercise(exercise_name)
+        if entry is None:
+            return None
+        alternatives = index.alternatives(
+            entry.id, equipment, injury_history, limit=1, min_similarity=SUBSTITUTE_MIN_SIMILARITY
+        )
+        return alternatives[0][0] if alternatives else None
@@ -0,0 +1,320 @@
+"""
+Template Service - Profile bucket templates and deterministic personalization
+Most generations become a template lookup plus local injury/fatigue adjustments
+"""
+import asyncio
+import statistics
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import AsyncSessionLocal
+from src.core.text import normalize_text
+from src.models.exercise import Exercise
+from src.models.user_profile import UserProfile, FitnessObjective, ExperienceLevel
+from src.models.workout_template import WorkoutTemplate
+from src.schemas.workout import WorkoutPlanResponse
+from src.services.llm_scheduler import Priority
+from src.services.exercise_catalog import exercise_catalog
+from src.services.llm_service import InvalidPlanError, llm_service, fatigue_band
+from src.services.substitution_service import SubstitutionService, excluded_keywords
+from src.services.usage_service import UsageService
+
+# Fatigue score each band's template is generated with
+BAND_REFERENCE_SCORES = {"low": 30, "normal": 50, "moderate": 70, "high": 90}
+
+# FR-017b adjustments applied locally when only the "normal" template exists
+FATIGUE_SET_FACTOR = {"low": 1.1, "normal": 1.0, "moderate": 0.85, "high": 0.7}
+FATIGUE_RPE_DELTA = {"low": 0, "normal": 0, "moderate": 0, "high": -2}
+
+# Minimum blocks a personalized plan must keep (WorkoutPlanResponse.workout_plan min_items)
+MIN_BLOCKS = 3
+
+# Usage accounting label of template generations (system usage, not billed to a user)
+TEMPLATE_ENDPOINT = "workout_template"
+
+
+@dataclass(frozen=True)
+class ProfileBucket:
+    """Profile bucket: the prompt-relevant dimensions shared by many users"""
+
+    objective: FitnessObjective
+    experience_level: ExperienceLevel
+    training_days_per_week: int
+    equipment: Tuple[str, ...]
+
+    def key(self, band: str) -> str:
+        return (
+            f"{self.objective.value}:{self.experience_level.value}:"
+            f"{self.training_days_per_week}:{'|'.join(self.equipment)}:{band}"
+        )
+
+
+def equipment_key(equipment: List[str]) -> Tuple[str, ...]:
+    """Canonical equipment set (sorted, lowercased, deduplicated)"""
+    return tuple(sorted({item.strip().lower() for item in equipment or []}))
+
+
+class TemplateService:
+    """Service for pre-generated plan templates"""
+
+    @staticmethod
+    async def find_template(
+        db: AsyncSession, profile: UserProfile, fatigue_score: int
+    ) -> Optional[WorkoutTemplate]:
+        """
+        Find the nearest template for a profile
+
+        Objective and experience must match, the template's equipment must be
+        available to the user, then the closest training days and fatigue band win
+
+        Args:
+            db: Database session
+            profile: User profile
+            fatigue_score: Fatigue score of the request
+
+        Returns:
+            Best WorkoutTemplate or None
+        """
+        band = fatigue_band(fatigue_score)
+        result = await db.execute(
+            select(WorkoutTemplate).where(
+                WorkoutTemplate.objective == profile.objective,
+                WorkoutTemplate.experience_level == profile.experience_level,
+                WorkoutTemplate.fatigue_band.in_({band, "normal"}),
+            )
+        )
+
+        user_equipment = set(equipment_key(profile.equipment_available))
+        best, best_score = None, None
+        for template in result.scalars().all():
+            template_equipment = set(template.equipment)
+            if not template_equipment <= user_equipment:
+                continue
+
+            score = (
+                (0 if template.fatigue_band == band else 100)
+                + abs(template.training_days_per_week - profile.training_days_per_week) * 10
+                - len(template_equipment)
+            )
+            if best_score is None or score < best_score:
+                best, best_score = template, score
+
+        return best
+
+    @staticmethod
+    def personalize(
+        template: WorkoutTemplate, profile: UserProfile, fatigue_score: int
+    ) -> Optional[WorkoutPlanResponse]:
+        """
+        Apply deterministic per-user adjustments to a template
+
+        - Replaces (or drops) blocks that stress injured areas (injury_history)
+        - Applies FR-017b volume/RPE rules when the template is from another fatigue band
+
+        Args:
+            template: Template to personalize
+            profile: User profile
+            fatigue_score: Fatigue score of the request
+
+        Returns:
+            Personalized WorkoutPlanResponse, or None if too few blocks remain
+        """
+        plan = WorkoutPlanResponse(**template.plan_data)
+        adjustments = [plan.ajuste_aplicado] if plan.ajuste_aplicado else []
+
+        # Injuries: swap for a safe catalog alternative, or drop the block
+        keywords = excluded_keywords(profile.injury_history)
+        if keywords:
+            kept, replaced = [], 0
+            names = {normalize_text(block.ejercicio) for block in plan.workout_plan}
+            for block in plan.workout_plan:
+                text = normalize_text(f"{block.musculo} {block.ejercicio}")
+                if not any(keyword in text for keyword in keywords):
+                    kept.append(block)
+                    continue
+
+                replacement = SubstitutionService.substitute(
+                    block.ejercicio, profile.equipment_available, profile.injury_history
+                )
+                if replacement and replacement.normalized_name not in names:
+                    names.add(replacement.normalized_name)
+                    block.ejercicio = replacement.name
+                    block.musculo = replacement.muscle_groups[0][:50]
+                    block.notas_seguridad = replacement.safety_notes
+                    kept.append(block)
+                    replaced += 1
+
+            if len(kept) < MIN_BLOCKS:
+                return None
+            if replaced:
+                adjustments.append(f"Sustituidos {replaced} ejercicios por historial de lesiones")
+            if len(kept) < len(plan.workout_plan):
+                adjustments.append(
+                    f"Excluidos {len(plan.workout_plan) - len(kept)} ejercicios por historial de lesiones"
+                )
+            plan.workout_plan = kept
+
+        # Fatigue
+        band = fatigue_band(fatigue_score)
+        if band != template.fatigue_band:
+            factor = FATIGUE_SET_FACTOR[band] / FATIGUE_SET_FACTOR[template.fatigue_band]
+            rpe_delta = FATIGUE_RPE_DELTA[band] - FATIGUE_RPE_DELTA[template.fatigue_band]
+            for block in plan.workout_plan:
+                block.series = min(10, max(1, round(block.series * factor)))
+                block.rpe_objetivo = min(10, max(1, block.rpe_objetivo + rpe_delta))
+            adjustments.append(f"Volumen ajustado x{factor:.2f} por fatiga {band}")
+
+        plan.fatiga_score_usado = fatigue_score
+        plan.ajuste_aplicado = "; ".join(adjustments) or None
+        return plan
+
+    @staticmethod
+    async def serve_from_template(
+        db: AsyncSession, profile: UserProfile, fatigue_score: int
+    ) -> Optional[WorkoutPlanResponse]:
+        """
+        Build a personalized plan from the nearest template, if any
+
+        Args:
+            db: Database session
+            profile: User profile
+            fatigue_score: Fatigue score of the request
+
+        Returns:
+            WorkoutPlanResponse or None (caller falls back to the LLM)
+        """
+        template = await TemplateService.find_template(db, profile, fatigue_score)
+        if not template:
+            return None
+
+        await exercise_catalog.ensure_loaded(db)
+        return TemplateService.personalize(template, profile, fatigue_score)
+
+    # ------------------------------------------------------------------
+    # Offline generation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def enumerate_buckets(
+        db: AsyncSession, min_profiles: int = 1, limit: Optional[int] = None
+    ) -> List[Tuple[ProfileBucket, List[UserProfile]]]:
+        """
+        Group existing profiles into buckets, most populated first
+
+        Args:
+            db: Database session
+            min_profiles: Skip buckets with fewer profiles
+            limit: Maximum number of buckets
+
+        Returns:
+            List of (bucket, member profiles)
+        """
+        result = await db.execute(select(UserProfile))
+        members: Dict[ProfileBucket, List[UserProfile]] = {}
+        for profile in result.scalars().all():
+            bucket = ProfileBucket(
+                objective=profile.objective,
+                experience_level=profile.experience_level,
+                training_days_per_week=profile.training_days_per_week,
+                equipment=equipment_key(profile.equipment_available),
+            )
+            members.setdefault(bucket, []).append(profile)
+
+        buckets = [(bucket, profiles) for bucket, profiles in members.items() if len(profiles) >= min_profiles]
+        buckets.sort(key=lambda item: len(item[1]), reverse=True)
+        return buckets[:limit] if limit else buckets
+
+    @staticmethod
+    def representative_profile(bucket: ProfileBucket, profiles: List[UserProfile]) -> UserProfile:
+        """Transient profile with the bucket's median biometrics and no injuries"""
+        return UserProfile(
+            age=int(statistics.median(p.age for p in profiles)),
+            weight_kg=round(statistics.median(p.weight_kg for p in profiles), 1),
+            height_cm=round(statistics.median(p.height_cm for p in profiles), 1),
+            objective=bucket.objective,
+            experience_level=bucket.experience_level,
+            training_days_per_week=bucket.training_days_per_week,
+            equipment_available=list(bucket.equipment),
+            injury_history=[],
+        )
+
+    @staticmethod
+    async def generate_templates(
+        min_profiles: int = 1, limit: Optional[int] = None, concurrency: int = 4
+    ) -> Dict[str, int]:
+        """
+        Pre-generate one template per bucket and fatigue band (offline job)
+
+        Args:
+            min_profiles: Skip buckets with fewer profiles
+            limit: Maximum number of buckets
+            concurrency: Maximum concurrent LLM generations
+
+        Returns:
+            Counters: buckets, generated, failed
+        """
+        # Imported here: WorkoutService serves plans through this module
+        from src.services.workout_service import WorkoutService
+
+        async with AsyncSessionLocal() as db:
+            buckets = await TemplateService.enumerate_buckets(db, min_profiles, limit)
+            result = await db.execute(select(Exercise))
+            exercises = result.scalars().all()
+
+        stats = {"buckets": len(buckets), "generated": 0, "failed": 0}
+        if not exercises:
+            return stats
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _generate(bucket: ProfileBucket, profiles: List[UserProfile], band: str):
+            profile = TemplateService.representative_profile(bucket, profiles)
+            available = WorkoutService.filter_exercises(profile, exercises)
+            async with semaphore:
+                try:
+                    plan, usage = await llm_service.call_anthropic_claude(
+                        profile=profile,
+                        fatigue_score=BAND_REFERENCE_SCORES[band],
+                        available_exercises=available,
+                        priority=Priority.BATCH,
+                    )
+                except Exception as e:
+                    stats["failed"] += 1
+                    if isinstance(e, InvalidPlanError):
+                        # Tokens were spent on the unusable answer
+                        async with AsyncSessionLocal() as db:
+                            UsageService.record_usage(db, None, e.usage, endpoint=TEMPLATE_ENDPOINT)
+                            await db.commit()
+                    return
+
+            async with AsyncSessionLocal() as db:
+                key = bucket.key(band)
+                await db.execute(delete(WorkoutTemplate).where(WorkoutTemplate.bucket_key == key))
+                db.add(
+                    WorkoutTemplate(
+                        bucket_key=key,
+                        objective=bucket.objective,
+                        experience_level=bucket.experience_level,
+                        training_days_per_week=bucket.training_days_per_week,
+                        equipment=list(bucket.equipment),
+                        fatigue_band=band,
+                        reference_fatigue_score=BAND_REFERENCE_SCORES[band],
+                        plan_data=plan.model_dump(),
+                        profile_count=len(profiles),
+                    )
+                )
+                UsageService.record_usage(db, None, usage, endpoint=TEMPLATE_ENDPOINT)
+                await db.commit()
+            stats["generated"] += 1
+
+        await asyncio.gather(
+            *(
+                _generate(bucket, profiles, band)
+                for bucket, profiles in buckets
+                for band in BAND_REFERENCE_SCORES
+            )
+        )
+        return stats
@@ -0,0 +1,292 @@
+"""
+Usage Service - LLM token accounting and per-user budgets
+Records every Claude call and reserves budget before calls are made
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, select, func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.models.llm_usage import LLMUsageRecord
+from src.models.user import User
+from src.schemas.usage import UsageSummaryResponse
+
+# Rolling window used for per-user budgets
+USAGE_WINDOW = timedelta(hours=24)
+
+# Budget classes: chat messages count against CHAT_DAILY_MESSAGE_LIMIT, chat upkeep
+# (background summaries) against no call limit, every other endpoint against
+# LLM_DAILY_GENERATION_LIMIT. Tokens of all calls share LLM_DAILY_TOKEN_LIMIT.
+CHAT_ENDPOINT = "chat"
+CHAT_ENDPOINTS = (CHAT_ENDPOINT, "chat_summary")
+
+
+@dataclass
+class LLMUsage:
+    """Token usage reported by a single Claude response"""
+
+    model: str
+    input_tokens: int
+    output_tokens: int
+    latency_ms: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @property
+    def cost_usd(self) -> float:
+        """Cost estimate from the configured per-million-token prices"""
+        return (
+            self.input_tokens * settings.LLM_INPUT_COST_PER_MTOK
+            + self.output_tokens * settings.LLM_OUTPUT_COST_PER_MTOK
+        ) / 1_000_000
+
+    def split(self, parts: int) -> List["LLMUsage"]:
+        """Shares of one call made for several users (tokens split as evenly as possible)"""
+        return [
+            LLMUsage(
+                model=self.model,
+                input_tokens=self.input_tokens // parts + (index < self.input_tokens % parts),
+                output_tokens=self.output_tokens // parts + (index < self.output_tokens % parts),
+                latency_ms=self.latency_ms,
+            )
+            for index in range(parts)
+        ]
+
+
+class BudgetExceededError(Exception):
+    """Raised when a user's rolling budget cannot cover the requested calls"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class BudgetReservation:
+    """Calls held against a user's budget: ids of the pending usage records not settled yet"""
+
+    user_id: int
+    endpoint: str
+    record_ids: List[int] = field(default_factory=list)
+
+
+class UsageService:
+    """Service for LLM usage accounting"""
+
+    @staticmethod
+    def record_usage(
+        db: AsyncSession, user_id: Optional[int], usage: LLMUsage, endpoint: str
+    ) -> LLMUsageRecord:
+        """
+        Add a usage record to the session (committed by the caller's transaction)
+
+        Args:
+            db: Database session
+            user_id: User who triggered the call (None for system work, counted against no budget)
+            usage: Token usage from the LLM response
+            endpoint: Logical endpoint name ("workout_generate", ...)
+
+        Returns:
+            Pending LLMUsageRecord instance
+        """
+        record = LLMUsageRecord(
+            user_id=user_id,
+            model=usage.model,
+            endpoint=endpoint,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cost_usd=usage.cost_usd,
+            latency_ms=usage.latency_ms,
+        )
+        db.add(record)
+        return record
+
+    @staticmethod
+    async def _window_totals(db: AsyncSession, user_id: int, since: Optional[datetime]):
+        """
+        Aggregate calls per budget class, tokens and cost for a user (since a point in time, if given)
+
+        Returns:
+            Row of generations, chat_messages, input_tokens, output_tokens, cost_usd and the
+            oldest record overall (oldest), of a generation (oldest_generation) and of a chat
+            message (oldest_chat_message)
+        """
+        is_generation = LLMUsageRecord.endpoint.notin_(CHAT_ENDPOINTS)
+        is_chat_message = LLMUsageRecord.endpoint == CHAT_ENDPOINT
+        query = select(
+            func.count(LLMUsageRecord.id).filter(is_generation).label("generations"),
+            func.count(LLMUsageRecord.id).filter(is_chat_message).label("chat_messages"),
+            func.coalesce(func.sum(LLMUsageRecord.input_tokens), 0).label("input_tokens"),
+            func.coalesce(func.sum(LLMUsageRecord.output_tokens), 0).label("output_tokens"),
+            func.coalesce(func.sum(LLMUsageRecord.cost_usd), 0.0).label("cost_usd"),
+            func.min(LLMUsageRecord.created_at).label("oldest"),
+            func.min(LLMUsageRecord.created_at).filter(is_generation).label("oldest_generation"),
+            func.min(LLMUsageRecord.created_at).filter(is_chat_message).label("oldest_chat_message"),
+        ).where(
+            LLMUsageRecord.user_id == user_id,
+            # Holds left behind by a crashed worker expire
+            or_(
+                LLMUsageRecord.pending.is_(False),
+                LLMUsageRecord.created_at
+                > datetime.utcnow() - timedelta(seconds=settings.LLM_BUDGET_RESERVATION_TTL_SECONDS),
+            ),
+        )
+        if since is not None:
+            query = query.where(LLMUsageRecord.created_at > since)
+
+        result = await db.execute(query)
+        return result.one()
+
+    @staticmethod
+    async def _retry_after(db: AsyncSession, user_id: int, endpoint: str, calls: int) -> Optional[int]:
+        """
+        Check whether `calls` more calls of an endpoint fit in the user's rolling 24h budget
+
+        Returns:
+            None if they fit, otherwise seconds until budget frees up
+        """
+        now = datetime.utcnow()
+        totals = await UsageService._window_totals(db, user_id, now - USAGE_WINDOW)
+
+        if endpoint == CHAT_ENDPOINT:
+            used, limit = totals.chat_messages, settings.CHAT_DAILY_MESSAGE_LIMIT
+            oldest_call = totals.oldest_chat_message
+        else:
+            used, limit = totals.generations, settings.LLM_DAILY_GENERATION_LIMIT
+            oldest_call = totals.oldest_generation
+
+        # Budget frees up when the oldest counted call in the window expires
+        if used + calls > limit:
+            oldest = oldest_call
+        elif totals.input_tokens + totals.output_tokens >= settings.LLM_DAILY_TOKEN_LIMIT:
+            oldest = totals.oldest
+        else:
+            return None
+
+        if oldest is None:
+            return int(USAGE_WINDOW.total_seconds())
+        return max(1, int((oldest + USAGE_WINDOW - now).total_seconds()))
+
+    @staticmethod
+    async def reserve(user_id: int, endpoint: str, calls: int = 1) -> BudgetReservation:
+        """
+        Check the user's budget and hold `calls` calls of it, atomically
+
+        The user's row is locked while counting, so concurrent requests are
+        serialized instead of all passing at limit - 1. Each held call is a
+        pending usage record (own short transaction, visible to other requests
+        at once) that settle() fills in and release() drops.
+
+        Args:
+            user_id: User the calls are made for
+            endpoint: Logical endpoint name ("workout_generate", "chat", ...); selects the budget class
+            calls: Number of LLM calls about to be made
+
+        Returns:
+            BudgetReservation (pass it to settle() and, in a finally block, release())
+
+        Raises:
+            BudgetExceededError: If the calls do not fit in the budget
+        """
+        async with AsyncSessionLocal() as db:
+            await db.execute(select(User.id).where(User.id == user_id).with_for_update())
+
+            retry_after = await UsageService._retry_after(db, user_id, endpoint, calls)
+            if retry_after is not None:
+                budget = "chat" if endpoint == CHAT_ENDPOINT else "generation"
+                raise BudgetExceededError(
+                    f"Daily {budget} budget exceeded. Please try again later.", retry_after
+                )
+
+            records = [
+                LLMUsageRecord(user_id=user_id, model=settings.LLM_MODEL, endpoint=endpoint, pending=True)
+                for _ in range(calls)
+            ]
+            db.add_all(records)
+            await db.commit()
+
+        return BudgetReservation(user_id, endpoint, [record.id for record in records])
+
+    @staticmethod
+    async def settle(db: AsyncSession, reservation: BudgetReservation, usage: LLMUsage):
+        """
+        Fill one held call in with the call's usage (committed by the caller's transaction)
+
+        Args:
+            db: Database session
+            reservation: Reservation the call was made under
+            usage: Token usage from the LLM response
+        """
+        if not reservation.record_ids:
+            # More calls than reserved (retry): account for them all the same
+            UsageService.record_usage(db, reservation.user_id, usage, endpoint=reservation.endpoint)
+            return
+
+        await db.execute(
+            update(LLMUsageRecord)
+            .where(LLMUsageRecord.id == reservation.record_ids.pop())
+            .values(
+                model=usage.model,
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+                cost_usd=usage.cost_usd,
+                latency_ms=usage.latency_ms,
+                pending=False,
+            )
+        )
+
+    @staticmethod
+    async def release(*reservations: BudgetReservation):
+        """
+        Drop the held calls that were not settled (failure, plan served without a call)
+
+        Uses its own session, so it can run after the caller's transaction failed.
+        """
+        record_ids = [record_id for reservation in reservations for record_id in reservation.record_ids]
+        if not record_ids:
+            return
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                delete(LLMUsageRecord).where(
+                    LLMUsageRecord.id.in_(record_ids), LLMUsageRecord.pending.is_(True)
+                )
+            )
+            await db.commit()
+        for reservation in reservations:
+            reservation.record_ids.clear()
+
+    @staticmethod
+    async def get_usage_summary(db: AsyncSession, user_id: int) -> UsageSummaryResponse:
+        """
+        Get user's usage for the current window and lifetime totals
+
+        Args:
+            db: Database session
+            user_id: User to report
+
+        Returns:
+            UsageSummaryResponse
+        """
+        window = await UsageService._window_totals(db, user_id, datetime.utcnow() - USAGE_WINDOW)
+        lifetime = await UsageService._window_totals(db, user_id, None)
+
+        return UsageSummaryResponse(
+            window_hours=int(USAGE_WINDOW.total_seconds() // 3600),
+            generations_used=window.generations,
+            generation_limit=settings.LLM_DAILY_GENERATION_LIMIT,
+            chat_messages_used=window.chat_messages,
+            chat_message_limit=settings.CHAT_DAILY_MESSAGE_LIMIT,
+            input_tokens=window.input_tokens,
+            output_tokens=window.output_tokens,
+            token_limit=settings.LLM_DAILY_TOKEN_LIMIT,
+            cost_usd=round(float(window.cost_usd), 6),
+            lifetime_generations=lifetime.generations,
+            lifetime_cost_usd=round(float(lifetime.cost_usd), 6),
+        )
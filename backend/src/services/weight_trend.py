@@ -0,0 +1,178 @@
+"""
+Weight Trend - Exponentially weighted linear regression of body weight over time
+
+The state is the decayed sufficient statistics stored in WeightTrend, with time in
+days relative to the last point, so adding (or replacing) a point is O(1) and a full
+rebuild over all users is a single vectorized pass (fit_all).
+
+Adaptive TDEE follows from energy balance: the assumed intake (the calorie target in
+effect when each weight was logged) minus the trend slope converted to energy.
+"""
+from types import SimpleNamespace
+from typing import List, Optional, Sequence, Tuple
+
+from src.core.config import settings
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - fit_all falls back to incremental updates
+    numpy = None
+
+KCAL_PER_KG = 7700  # Energy content of a kg of body-weight change
+
+STAT_FIELDS = ("s0", "st", "stt", "sy", "sty", "si")
+
+
+def decay_per_day() -> float:
+    """Weight multiplier per day of age (ADAPTIVE_TDEE_HALF_LIFE_DAYS)"""
+    return 0.5 ** (1 / settings.ADAPTIVE_TDEE_HALF_LIFE_DAYS)
+
+
+def empty_trend(day: int):
+    """Zeroed state anchored at `day` (attribute-compatible with WeightTrend)"""
+    return SimpleNamespace(first_day=day, last_day=day, points=0, **{field: 0.0 for field in STAT_FIELDS})
+
+
+def add_point(trend, day: int, weight_kg: float, intake_kcal: float, sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) one point, in place
+
+    A point after last_day moves the origin there first (shift and decay of the
+    sums); earlier points are added with their decayed weight.
+
+    Args:
+        trend: WeightTrend or empty_trend()
+        day: date.toordinal() of the point
+        weight_kg: Measured weight
+        intake_kcal: Calorie target in effect on that day
+        sign: 1 to add, -1 to remove a previously added point
+    """
+    decay = decay_per_day()
+    if day > trend.last_day:
+        shift = day - trend.last_day
+        factor = decay**shift
+        trend.stt = factor * (trend.stt - 2 * shift * trend.st + shift * shift * trend.s0)
+        trend.sty = factor * (trend.sty - shift * trend.sy)
+        trend.st = factor * (trend.st - shift * trend.s0)
+        trend.s0 *= factor
+        trend.sy *= factor
+        trend.si *= factor
+        trend.last_day = day
+
+    t = day - trend.last_day
+    weight = sign * decay ** (-t)
+    trend.s0 += weight
+    trend.st += weight * t
+    trend.stt += weight * t * t
+    trend.sy += weight * weight_kg
+    trend.sty += weight * t * weight_kg
+    trend.si += weight * intake_kcal
+    trend.points += sign
+    trend.first_day = min(trend.first_day, day)
+
+
+def fit(trend) -> Optional[Tuple[float, float, float]]:
+    """
+    Weighted least-squares line through the series
+
+    Returns:
+        (trend weight today in kg, slope in kg/day, weighted mean intake in kcal),
+        or None while the series is too short (ADAPTIVE_TDEE_MIN_POINTS / MIN_DAYS)
+    """
+    if trend.points < settings.ADAPTIVE_TDEE_MIN_POINTS:
+        return None
+    if trend.last_day - trend.first_day < settings.ADAPTIVE_TDEE_MIN_DAYS:
+        return None
+    denominator = trend.s0 * trend.stt - trend.st * trend.st
+    if denominator <= 1e-9 or trend.s0 <= 0:
+        return None
+
+    slope = (trend.s0 * trend.sty - trend.st * trend.sy) / denominator
+    level = (trend.sy - slope * trend.st) / trend.s0
+    return level, slope, trend.si / trend.s0
+
+
+def adaptive_tdee(trend, formula_tdee: float) -> Optional[float]:
+    """
+    TDEE observed from the weight trend, blended with the formula estimate
+
+    The observed value is clamped to ±ADAPTIVE_TDEE_MAX_ADJUSTMENT of the formula
+    and phased in linearly until the series spans twice ADAPTIVE_TDEE_MIN_DAYS.
+
+    Returns:
+        Adjusted TDEE in kcal, or None if the trend is not usable yet
+    """
+    if trend is None or not settings.ADAPTIVE_TDEE_ENABLED:
+        return None
+    fitted = fit(trend)
+    if fitted is None:
+        return None
+
+    _, slope, mean_intake = fitted
+    observed = mean_intake - slope * KCAL_PER_KG
+    limit = formula_tdee * settings.ADAPTIVE_TDEE_MAX_ADJUSTMENT
+    observed = min(max(observed, formula_tdee - limit), formula_tdee + limit)
+
+    blend = min(1.0, (trend.last_day - trend.first_day) / (2 * settings.ADAPTIVE_TDEE_MIN_DAYS))
+    return formula_tdee + blend * (observed - formula_tdee)
+
+
+def fit_all(
+    user_ids: Sequence[int], days: Sequence[int], weights: Sequence[float], intakes: Sequence[float]
+) -> List[dict]:
+    """
+    Trend state for many users from their full series in one pass
+
+    Args:
+        user_ids, days, weights, intakes: Parallel columns sorted by (user_id, day)
+
+    Returns:
+        One dict of WeightTrend column values per user, in user order
+    """
+    if not user_ids:
+        return []
+    if numpy is None:
+        return _fit_all_incremental(user_ids, days, weights, intakes)
+
+    users = numpy.asarray(user_ids)
+    day = numpy.asarray(days, dtype=float)
+    y = numpy.asarray(weights, dtype=float)
+    intake = numpy.asarray(intakes, dtype=float)
+
+    starts = numpy.flatnonzero(numpy.r_[True, users[1:] != users[:-1]])
+    counts = numpy.diff(numpy.r_[starts, len(users)])
+    last_day = numpy.maximum.reduceat(day, starts)
+    first_day = numpy.minimum.reduceat(day, starts)
+
+    t = day - numpy.repeat(last_day, counts)
+    w = decay_per_day() ** (-t)
+    sums = {
+        "s0": w,
+        "st": w * t,
+        "stt": w * t * t,
+        "sy": w * y,
+        "sty": w * t * y,
+        "si": w * intake,
+    }
+    sums = {field: numpy.add.reduceat(values, starts).tolist() for field, values in sums.items()}
+
+    return [
+        {
+            "user_id": int(users[start]),
+            "first_day": int(first_day[index]),
+            "last_day": int(last_day[index]),
+            "points": int(counts[index]),
+            **{field: sums[field][index] for field in STAT_FIELDS},
+        }
+        for index, start in enumerate(starts.tolist())
+    ]
+
+
+def _fit_all_incremental(user_ids, days, weights, intakes) -> List[dict]:
+    states = {}
+    for user_id, day, weight_kg, intake_kcal in zip(user_ids, days, weights, intakes):
+        trend = states.get(user_id)
+        if trend is None:
+            trend = states[user_id] = empty_trend(day)
+        add_point(trend, day, weight_kg, intake_kcal)
+    return [{"user_id": user_id, **vars(trend)} for user_id, trend in states.items()]
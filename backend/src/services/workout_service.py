@@ -1,16 +1,31 @@
 """
 Workout Service - Orchestrates workout plan generation
 """
+import asyncio
+from datetime import datetime, timedelta
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
+from sqlalchemy.orm import selectinload
 
+from src.core.config import settings
+from src.core.response_cache import response_cache
 from src.models.user import User
 from src.models.user_profile import UserProfile
-from src.models.workout_plan import WorkoutPlan
+from src.models.workout_plan import WorkoutPlan, WorkoutPlanStatus
+from src.models.weekly_plan import WeeklyPlan
 from src.models.exercise import Exercise
-from src.schemas.workout import WorkoutPlanResponse, WorkoutGenerateRequest, WorkoutHistoryItem
-from src.services.llm_service import llm_service
+from src.schemas.workout import WorkoutGenerateRequest, WorkoutHistoryItem
+from src.services.exercise_catalog import exercise_catalog
+from src.services.llm_service import InvalidPlanError, llm_service, fatigue_band
+from src.services.plan_codec import compact_plan_data, plan_exercise_count
+from src.services.split_planner import plan_weekly_split, balance_weekly_volume
+from src.services.speculative_service import speculative_generations
+from src.services.template_service import TemplateService
+from src.services.usage_service import UsageService
+
+# Fatigue score of plans generated without a request (speculative and prefetched plans)
+DEFAULT_FATIGUE_SCORE = 50
 
 
 class WorkoutService:
@@ -33,6 +48,7 @@ class WorkoutService:
 
         Raises:
             ValueError: If user has no profile or generation fails
+            BudgetExceededError: If a Claude call is needed and the user's budget is spent
         """
         # Get user profile
         result = await db.execute(select(UserProfile).where(UserProfile.user_id == user.id))
@@ -41,13 +57,224 @@ class WorkoutService:
         if not profile:
             raise ValueError("User profile not found. Please create profile first.")
 
-        # Get available exercises
+        fatigue_score = request.fatigue_score
+        if fatigue_score is None:
+            fatigue_score = DEFAULT_FATIGUE_SCORE
+
+        # Attach to a speculative generation started at onboarding, if still running.
+        # Its plan can only be claimed in the same fatigue band, otherwise don't wait
+        same_band = fatigue_band(fatigue_score) == fatigue_band(DEFAULT_FATIGUE_SCORE)
+        if same_band and speculative_generations.is_running(user.id):
+            # End the read transaction: no pooled connection is held while waiting
+            await db.commit()
+            await speculative_generations.wait(
+                user.id, timeout=settings.LLM_DEADLINE_INTERACTIVE_SECONDS
+            )
+
+        # Serve a plan pre-generated off-peak if one is still valid
+        prefetched_plan = await WorkoutService.claim_pending_plan(db, profile, fatigue_score)
+        if prefetched_plan:
+            return prefetched_plan
+
+        # Serve the nearest pre-generated bucket template, personalized locally
+        if settings.WORKOUT_TEMPLATES_ENABLED:
+            template_plan = await TemplateService.serve_from_template(db, profile, fatigue_score)
+            if template_plan:
+                workout_plan = WorkoutPlan(
+                    user_id=user.id,
+                    plan_data=compact_plan_data(template_plan),
+                    fatigue_score_used=fatigue_score,
+                )
+                db.add(workout_plan)
+                await db.commit()
+                await db.refresh(workout_plan)
+                response_cache.invalidate("history", user.id)
+                return workout_plan
+
+        available_exercises = await WorkoutService.get_available_exercises(db, profile)
+
+        reservation = await UsageService.reserve(user.id, "workout_generate")
+        try:
+            # Call LLM to generate plan
+            try:
+                workout_plan_response, usage = await llm_service.call_anthropic_claude(
+                    profile=profile, fatigue_score=fatigue_score, available_exercises=available_exercises
+                )
+            except InvalidPlanError as e:
+                # Tokens were spent on the unusable answer: bill them
+                await UsageService.settle(db, reservation, e.usage)
+                await db.commit()
+                raise
+
+            # Convert Pydantic response to compact JSON for storage
+            await exercise_catalog.ensure_loaded(db)
+            plan_data = compact_plan_data(workout_plan_response)
+
+            # Create WorkoutPlan record
+            workout_plan = WorkoutPlan(
+                user_id=user.id, plan_data=plan_data, fatigue_score_used=fatigue_score
+            )
+
+            db.add(workout_plan)
+            await UsageService.settle(db, reservation, usage)
+            await db.commit()
+        finally:
+            await UsageService.release(reservation)
+
+        await db.refresh(workout_plan)
+        response_cache.invalidate("history", user.id)
+
+        return workout_plan
+
+    @staticmethod
+    async def generate_weekly_plan(
+        db: AsyncSession, user: User, request: WorkoutGenerateRequest
+    ) -> WeeklyPlan:
+        """
+        Generate a weekly plan (FR-005) with one concurrent LLM call per training day
+
+        The split and per-day set budgets come from the local split planner, all
+        day prompts share one cached prompt prefix (profile, exercise library and
+        response format), and weekly sets per muscle group are capped after generation
+
+        Args:
+            db: Database session
+            user: Current user
+            request: Generation request with optional fatigue score
+
+        Returns:
+            Created WeeklyPlan with its day plans
+
+        Raises:
+            ValueError: If user has no profile or any day fails to generate
+            LLMOverloadedError: If the scheduler sheds a day's LLM call
+            BudgetExceededError: If the user's budget cannot cover one call per day
+        """
+        result = await db.execute(select(UserProfile).where(UserProfile.user_id == user.id))
+        profile = result.scalar_one_or_none()
+
+        if not profile:
+            raise ValueError("User profile not found. Please create profile first.")
+
+        fatigue_score = request.fatigue_score
+        if fatigue_score is None:
+            fatigue_score = DEFAULT_FATIGUE_SCORE
+        available_exercises = await WorkoutService.get_available_exercises(db, profile)
+
+        split = plan_weekly_split(profile.training_days_per_week, profile.experience_level)
+        context = llm_service.build_prompt_context(profile, fatigue_score, available_exercises)
+
+        # Every day is a Claude call: the whole week must fit in the budget
+        reservation = await UsageService.reserve(user.id, "workout_weekly", calls=len(split))
+        try:
+            # Days are generated concurrently under the global LLM concurrency limit
+            results = await asyncio.gather(
+                *(
+                    llm_service.generate_weekly_day(context, day, len(split), fatigue_score)
+                    for day in split
+                ),
+                return_exceptions=True,
+            )
+
+            # Tokens were spent even if another day failed or its plan was unusable, keep the usage records
+            errors = [outcome for outcome in results if isinstance(outcome, BaseException)]
+            for outcome in results:
+                if not isinstance(outcome, BaseException):
+                    await UsageService.settle(db, reservation, outcome[1])
+                elif isinstance(outcome, InvalidPlanError):
+                    await UsageService.settle(db, reservation, outcome.usage)
+            if errors:
+                await db.commit()
+                raise errors[0]
+
+            day_plans = [plan for plan, _ in results]
+            volume = balance_weekly_volume(day_plans, profile.experience_level)
+
+            await exercise_catalog.ensure_loaded(db)
+            weekly_plan = WeeklyPlan(
+                user_id=user.id,
+                split_days=[day.focus for day in split],
+                weekly_volume=volume,
+                fatigue_score_used=fatigue_score,
+            )
+            db.add(weekly_plan)
+
+            for day, day_plan in zip(split, day_plans):
+                db.add(
+                    WorkoutPlan(
+                        user_id=user.id,
+                        plan_data=compact_plan_data(day_plan),
+                        fatigue_score_used=fatigue_score,
+                        weekly_plan=weekly_plan,
+                        day_index=day.day_index,
+                    )
+                )
+
+            await db.commit()
+        finally:
+            await UsageService.release(reservation)
+
+        response_cache.invalidate("history", user.id)
+
+        return await WorkoutService.get_weekly_plan_by_id(db, user, weekly_plan.id)
+
+    @staticmethod
+    async def get_weekly_plan_by_id(
+        db: AsyncSession, user: User, weekly_plan_id: int
+    ) -> Optional[WeeklyPlan]:
+        """
+        Get weekly plan with its day plans
+
+        Args:
+            db: Database session
+            user: Current user
+            weekly_plan_id: Weekly plan ID
+
+        Returns:
+            WeeklyPlan or None if not found or not owned by user
+        """
+        result = await db.execute(
+            select(WeeklyPlan)
+            .options(selectinload(WeeklyPlan.day_plans))
+            .where(WeeklyPlan.id == weekly_plan_id, WeeklyPlan.user_id == user.id)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_available_exercises(db: AsyncSession, profile: UserProfile) -> List[Exercise]:
+        """
+        Get exercises usable by the profile's equipment
+
+        Args:
+            db: Database session
+            profile: User profile
+
+        Returns:
+            List of exercises to include in the prompt
+
+        Raises:
+            ValueError: If the exercise library is empty
+        """
         result = await db.execute(select(Exercise))
         exercises = result.scalars().all()
 
         if not exercises:
             raise ValueError("No exercises available in database. Please seed exercises.")
 
+        return WorkoutService.filter_exercises(profile, exercises)
+
+    @staticmethod
+    def filter_exercises(profile: UserProfile, exercises: List[Exercise]) -> List[Exercise]:
+        """
+        Filter an already loaded exercise library for a profile
+
+        Args:
+            profile: User profile
+            exercises: Full exercise library
+
+        Returns:
+            List of exercises to include in the prompt
+        """
         # Filter exercises by available equipment
         available_exercises = [
             ex
@@ -58,32 +285,93 @@ class WorkoutService:
         if not available_exercises:
             available_exercises = list(exercises)  # Fallback to all
 
-        # Call LLM to generate plan
-        fatigue_score = request.fatigue_score if request.fatigue_score is not None else 50
-        workout_plan_response: WorkoutPlanResponse = await llm_service.call_anthropic_claude(
-            profile=profile, fatigue_score=fatigue_score, available_exercises=available_exercises
-        )
+        return available_exercises
 
-        # Convert Pydantic response to JSON for storage
-        plan_data = workout_plan_response.model_dump()
+    @staticmethod
+    async def claim_pending_plan(
+        db: AsyncSession, profile: UserProfile, fatigue_score: int
+    ) -> Optional[WorkoutPlan]:
+        """
+        Claim the user's most recent pre-generated plan
+
+        A pending plan is only served if it is younger than WORKOUT_PREFETCH_MAX_AGE_HOURS,
+        was generated after the last profile change and within the same fatigue band
+
+        Args:
+            db: Database session
+            profile: User profile
+            fatigue_score: Fatigue score of the current request
+
+        Returns:
+            Claimed WorkoutPlan (now READY) or None
+        """
+        not_before = datetime.utcnow() - timedelta(hours=settings.WORKOUT_PREFETCH_MAX_AGE_HOURS)
+        if profile.updated_at and profile.updated_at > not_before:
+            not_before = profile.updated_at
 
-        # Create WorkoutPlan record
-        workout_plan = WorkoutPlan(
-            user_id=user.id, plan_data=plan_data, fatigue_score_used=fatigue_score
+        result = await db.execute(
+            select(WorkoutPlan)
+            .where(
+                WorkoutPlan.user_id == profile.user_id,
+                WorkoutPlan.status == WorkoutPlanStatus.PENDING,
+                WorkoutPlan.created_at >= not_before,
+            )
+            .order_by(desc(WorkoutPlan.created_at))
+            .limit(1)
+            .with_for_update(skip_locked=True)
         )
+        workout_plan = result.scalar_one_or_none()
+
+        if not workout_plan:
+            return None
+        if fatigue_band(workout_plan.fatigue_score_used) != fatigue_band(fatigue_score):
+            return None
+
+        # Becomes a regular plan, dated when the user received it
+        workout_plan.status = WorkoutPlanStatus.READY
+        workout_plan.created_at = datetime.utcnow()
 
-        db.add(workout_plan)
         await db.commit()
         await db.refresh(workout_plan)
+        response_cache.invalidate("history", profile.user_id)
 
         return workout_plan
 
+    @staticmethod
+    def _history_filter(user: User) -> tuple:
+        """Plans listed in the history: ready single plans (weekly days are served with their week)"""
+        return (
+            WorkoutPlan.user_id == user.id,
+            WorkoutPlan.status == WorkoutPlanStatus.READY,
+            WorkoutPlan.weekly_plan_id.is_(None),
+        )
+
+    @staticmethod
+    async def get_history_version(db: AsyncSession, user: User) -> tuple:
+        """
+        Cheap fingerprint of the user's visible plans (changes on new or claimed plans)
+
+        Args:
+            db: Database session
+            user: Current user
+
+        Returns:
+            (ready plan count, newest created_at)
+        """
+        result = await db.execute(
+            select(func.count(WorkoutPlan.id), func.max(WorkoutPlan.created_at)).where(
+                *WorkoutService._history_filter(user)
+            )
+        )
+        count, newest = result.one()
+        return count, newest.isoformat() if newest else None
+
     @staticmethod
     async def get_workout_history(
         db: AsyncSession, user: User, limit: int = 30
     ) -> List[WorkoutHistoryItem]:
         """
-        Get user's workout plan history
+        Get user's workout plan history (single plans; weekly plans are fetched by id)
 
         Args:
             db: Database session
@@ -95,24 +383,46 @@ class WorkoutService:
         """
         result = await db.execute(
             select(WorkoutPlan)
-            .where(WorkoutPlan.user_id == user.id)
+            .where(*WorkoutService._history_filter(user))
             .order_by(desc(WorkoutPlan.created_at))
             .limit(limit)
         )
-        workout_plans = result.scalars().all()
-
-        history = []
-        for plan in workout_plans:
-            history.append(
-                WorkoutHistoryItem(
-                    id=plan.id,
-                    created_at=plan.created_at,
-                    fatigue_score_used=plan.fatigue_score_used,
-                    exercise_count=len(plan.plan_data.get("workout_plan", [])),
-                )
+        return WorkoutService.to_history_items(result.scalars().all())
+
+    @staticmethod
+    def to_history_items(workout_plans: List[WorkoutPlan]) -> List[WorkoutHistoryItem]:
+        """Map plan rows to history items (trusted rows: validation is skipped)"""
+        return [
+            WorkoutHistoryItem.model_construct(
+                id=plan.id,
+                created_at=plan.created_at,
+                fatigue_score_used=plan.fatigue_score_used,
+                exercise_count=plan_exercise_count(plan.plan_data),
             )
+            for plan in workout_plans
+        ]
+
+    @staticmethod
+    async def workout_plan_exists(db: AsyncSession, user: User, workout_plan_id: int) -> bool:
+        """
+        Check plan visibility without loading the row (primary key lookup)
+
+        Args:
+            db: Database session
+            user: Current user
+            workout_plan_id: Workout plan ID
 
-        return history
+        Returns:
+            True if the plan exists, is ready and is owned by user
+        """
+        result = await db.execute(
+            select(WorkoutPlan.id).where(
+                WorkoutPlan.id == workout_plan_id,
+                WorkoutPlan.user_id == user.id,
+                WorkoutPlan.status == WorkoutPlanStatus.READY,
+            )
+        )
+        return result.scalar_one_or_none() is not None
 
     @staticmethod
     async def get_workout_plan_by_id(
@@ -131,7 +441,9 @@ class WorkoutService:
         """
         result = await db.execute(
             select(WorkoutPlan).where(
-                WorkoutPlan.id == workout_plan_id, WorkoutPlan.user_id == user.id
+                WorkoutPlan.id == workout_plan_id,
+                WorkoutPlan.user_id == user.id,
+                WorkoutPlan.status == WorkoutPlanStatus.READY,
             )
         )
         return result.scalar_one_or_none()
@@ -0,0 +1,43 @@
+"""
+Test configuration - settings required at import time and a throwaway database for stateful tests
+
+Tests never touch DATABASE_URL: the database fixture runs against TEST_DATABASE_URL,
+or a SQLite file in a temporary directory when it is not set.
+"""
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db"
+)
+os.environ.setdefault("ANTHROPIC_API_KEY", "test-key")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("DEBUG", "false")
+
+
+@pytest.fixture
+def run_db():
+    """
+    Run a coroutine function against freshly created tables
+
+    The engine is disposed afterwards: pooled connections do not outlive the event loop.
+    """
+    import src.models  # noqa: F401 - registers every table
+    from src.core.database import Base, engine
+
+    def run(scenario):
+        async def _run():
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+                await connection.run_sync(Base.metadata.create_all)
+            try:
+                return await scenario()
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(_run())
+
+    return run
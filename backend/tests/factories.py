@@ -0,0 +1,33 @@
+"""
+Rows shared by the database-backed tests
+"""
+from scripts.seed_exercises import EXERCISES_DATA
+from src.core.database import AsyncSessionLocal
+from src.models.exercise import Exercise
+from src.models.user import User
+from src.models.user_profile import ExperienceLevel, FitnessObjective, UserProfile
+
+
+async def create_user(email: str = "ana@example.com", with_profile: bool = False) -> int:
+    """Store a user (with a profile and the seed exercise library, if asked) and return its id"""
+    async with AsyncSessionLocal() as db:
+        user = User(email=email, password_hash="x")
+        db.add(user)
+        await db.flush()
+        if with_profile:
+            db.add(
+                UserProfile(
+                    user_id=user.id,
+                    age=30,
+                    weight_kg=80.0,
+                    height_cm=180.0,
+                    objective=FitnessObjective.HYPERTROPHY,
+                    experience_level=ExperienceLevel.BEGINNER,
+                    training_days_per_week=3,
+                    equipment_available=["dumbbells"],
+                    injury_history=[],
+                )
+            )
+            db.add_all(Exercise(**data) for data in EXERCISES_DATA)
+        await db.commit()
+        return user.id
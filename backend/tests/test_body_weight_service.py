@@ -0,0 +1,90 @@
+"""
+Weigh-ins: one entry per day, re-logging a day updates the trend in place
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import sqlite
+
+from src.core.database import AsyncSessionLocal, engine
+from src.models.body_weight_entry import BodyWeightEntry
+from src.models.user_profile import UserProfile
+from src.models.weight_trend import WeightTrend
+from src.services import body_weight_service
+from src.services.body_weight_service import BodyWeightService
+from src.services.weight_trend import STAT_FIELDS
+from tests.factories import create_user
+
+FIRST_DAY = date.today() - timedelta(days=20)
+
+
+@pytest.fixture(autouse=True)
+def dialect_insert(monkeypatch):
+    # Same ON CONFLICT DO UPDATE statement, compiled for the SQLite test database
+    if engine.dialect.name == "sqlite":
+        monkeypatch.setattr(body_weight_service, "insert", sqlite.insert)
+
+
+async def trend_state(user_id: int) -> dict:
+    async with AsyncSessionLocal() as db:
+        trend = await db.get(WeightTrend, user_id)
+        return {field: getattr(trend, field) for field in ("first_day", "last_day", "points", *STAT_FIELDS)}
+
+
+async def log_series(user_id: int, days: int = 15):
+    async with AsyncSessionLocal() as db:
+        profile = await db.get(UserProfile, user_id)
+        for index in range(days):
+            await BodyWeightService.log_weight(db, profile, 80 - index * 0.1, FIRST_DAY + timedelta(days=index))
+
+
+def test_relogging_a_day_replaces_its_point(run_db):
+    async def scenario():
+        user_id = await create_user(with_profile=True)
+        await log_series(user_id)
+
+        async with AsyncSessionLocal() as db:
+            profile = await db.get(UserProfile, user_id)
+            entry = await BodyWeightService.log_weight(db, profile, 79.0, FIRST_DAY + timedelta(days=3))
+            assert entry.weight_hg == 790
+            count = await db.scalar(select(func.count()).where(BodyWeightEntry.user_id == user_id))
+            assert count == 15
+
+        incremental = await trend_state(user_id)
+        async with AsyncSessionLocal() as db:
+            await BodyWeightService.rebuild_trend(db, user_id)
+            await db.commit()
+        rebuilt = await trend_state(user_id)
+
+        assert incremental["points"] == rebuilt["points"] == 15
+        for field, value in rebuilt.items():
+            assert incremental[field] == pytest.approx(value, rel=1e-9, abs=1e-9)
+
+    run_db(scenario)
+
+
+def test_relogging_the_same_weight_changes_nothing(run_db):
+    async def scenario():
+        user_id = await create_user(with_profile=True)
+        await log_series(user_id, days=3)
+        before = await trend_state(user_id)
+
+        async with AsyncSessionLocal() as db:
+            profile = await db.get(UserProfile, user_id)
+            await BodyWeightService.log_weight(db, profile, 79.9, FIRST_DAY + timedelta(days=1))
+
+        assert await trend_state(user_id) == before
+
+    run_db(scenario)
+
+
+def test_future_weigh_ins_are_rejected(run_db):
+    async def scenario():
+        user_id = await create_user(with_profile=True)
+        async with AsyncSessionLocal() as db:
+            profile = await db.get(UserProfile, user_id)
+            with pytest.raises(ValueError, match="future"):
+                await BodyWeightService.log_weight(db, profile, 80.0, date.today() + timedelta(days=1))
+
+    run_db(scenario)
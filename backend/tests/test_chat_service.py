@@ -0,0 +1,153 @@
+"""
+Chat: question classification, bounded conversational context and billing of streamed answers
+"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.models.chat_session import ChatSession
+from src.models.llm_usage import LLMUsageRecord
+from src.services import chat_service
+from src.services.chat_service import ChatService, SYSTEM_PROMPT, select_recent_turns, turn_tokens
+from src.services.fake_llm import FakeAnthropicClient
+from tests.factories import create_user
+
+
+def turn(turn_id, question="¿Cómo hago una sentadilla?", response="Espalda neutra y rodillas hacia fuera."):
+    return SimpleNamespace(id=turn_id, question=question, response=response)
+
+
+@pytest.mark.parametrize(
+    "question, category",
+    [
+        ("Me duele la rodilla al hacer sentadillas", "injury_caution"),
+        ("¿Es normal el DOLOR lumbar en peso muerto?", "injury_caution"),
+        ("My shoulder hurts on bench press", "injury_caution"),
+        ("No tengo barra, ¿qué alternativa hay al press banca?", "equipment"),
+        ("¿Puedo usar mancuernas en vez de máquina?", "equipment"),
+        ("¿Qué es el RPE?", "concept"),
+        ("¿Por qué hay que hacer descarga?", "concept"),
+        ("¿Cómo coloco los pies en la sentadilla?", "technique"),
+    ],
+)
+def test_classify_question(question, category):
+    assert ChatService.classify_question(question) == category
+
+
+def test_medical_terms_win_over_other_categories():
+    # Mentions equipment too, but pain questions are never sent to Claude
+    question = "Me duele el hombro con la barra, ¿qué alternativa hay?"
+    assert ChatService.classify_question(question) == "injury_caution"
+    assert not ChatService.needs_llm("injury_caution")
+    assert ChatService.needs_llm("equipment")
+
+
+def test_terms_match_at_word_starts_only():
+    # "machete" contains the medical "ache", but not at a word start
+    assert ChatService.classify_question("¿Cómo hago el golpe de machete?") == "technique"
+    # Prefixes do: "dolor" matches "dolores"
+    assert ChatService.classify_question("Dolores al día siguiente") == "injury_caution"
+
+
+def test_recent_turns_fill_the_budget_newest_first(monkeypatch):
+    turns = [turn(turn_id) for turn_id in range(10, 0, -1)]  # Newest first
+    per_turn = turn_tokens(turns[0])
+    monkeypatch.setattr(settings, "CHAT_CONTEXT_TOKEN_BUDGET", 3 * per_turn + per_turn // 2)
+
+    recent = select_recent_turns(turns)
+    assert [t.id for t in recent] == [8, 9, 10]  # Oldest first
+
+
+def test_a_turn_that_does_not_fit_ends_the_window(monkeypatch):
+    long_answer = "x" * 4000
+    turns = [turn(3), turn(2, response=long_answer), turn(1)]
+    monkeypatch.setattr(settings, "CHAT_CONTEXT_TOKEN_BUDGET", 3 * turn_tokens(turns[0]))
+
+    # Turn 1 would fit, but skipping turn 2 would leave a gap in the conversation
+    assert [t.id for t in select_recent_turns(turns)] == [3]
+
+
+def test_build_messages_alternates_roles_and_adds_the_summary():
+    recent = [turn(1, "q1", "a1"), turn(2, "q2", "a2")]
+    summary = SimpleNamespace(summary="Entrena en casa con mancuernas.")
+
+    system, messages = ChatService.build_messages(summary, recent, "q3")
+    assert system.startswith(SYSTEM_PROMPT)
+    assert "Entrena en casa con mancuernas." in system
+    assert messages == [
+        {"role": "user", "content": "q1"},
+        {"role": "assistant", "content": "a1"},
+        {"role": "user", "content": "q2"},
+        {"role": "assistant", "content": "a2"},
+        {"role": "user", "content": "q3"},
+    ]
+
+    system, messages = ChatService.build_messages(None, [], "q1")
+    assert system == SYSTEM_PROMPT
+    assert messages == [{"role": "user", "content": "q1"}]
+
+
+async def stored_exchange(user_id: int):
+    async with AsyncSessionLocal() as db:
+        turns = (await db.execute(select(ChatSession).where(ChatSession.user_id == user_id))).scalars().all()
+        records = (
+            await db.execute(select(LLMUsageRecord).where(LLMUsageRecord.user_id == user_id))
+        ).scalars().all()
+        return turns, records
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setattr(chat_service.llm_service, "client", FakeAnthropicClient(latency=0))
+
+
+def test_answer_is_stored_and_billed(run_db, fake_llm):
+    async def scenario():
+        user_id = await create_user()
+        async with AsyncSessionLocal() as db:
+            events = [
+                event
+                async for event in ChatService.stream_answer(db, SimpleNamespace(id=user_id), "¿Qué es el RPE?")
+            ]
+
+        assert events[-1]["type"] == "done"
+        turns, records = await stored_exchange(user_id)
+        assert [turn.response for turn in turns] == ["".join(e["text"] for e in events[:-1])]
+        assert [(r.endpoint, r.pending) for r in records] == [("chat", False)]
+        assert records[0].output_tokens > 0
+
+    run_db(scenario)
+
+
+def test_abandoned_answer_is_billed_but_not_stored(run_db, fake_llm):
+    async def scenario():
+        user_id = await create_user()
+        async with AsyncSessionLocal() as db:
+            events = ChatService.stream_answer(db, SimpleNamespace(id=user_id), "¿Qué es el RPE?")
+            first = await events.__anext__()
+            await events.aclose()  # Client went away
+
+        assert first["type"] == "delta"
+        turns, records = await stored_exchange(user_id)
+        assert turns == []
+        assert [(r.endpoint, r.pending) for r in records] == [("chat", False)]
+        assert records[0].input_tokens > 0 and records[0].output_tokens > 0
+
+    run_db(scenario)
+
+
+def test_referrals_are_not_billed(run_db, fake_llm):
+    async def scenario():
+        user_id = await create_user()
+        async with AsyncSessionLocal() as db:
+            async for _ in ChatService.stream_answer(db, SimpleNamespace(id=user_id), "Me duele la rodilla"):
+                pass
+
+        turns, records = await stored_exchange(user_id)
+        assert [turn.question_category for turn in turns] == ["injury_caution"]
+        assert records == []
+
+    run_db(scenario)
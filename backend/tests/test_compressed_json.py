@@ -0,0 +1,94 @@
+"""
+CompressedJSON: lossless round-trips, preset dictionaries and lazy decoding
+"""
+import pytest
+
+from src.core.compressed_json import (
+    CompressedJSON,
+    LazyJSON,
+    compress_json,
+    compression_dictionaries,
+    decompress_json,
+)
+from src.services.plan_codec import plan_exercise_count
+
+PLAN_DATA = {
+    "format": 2,
+    "f": 55,
+    "a": "Volumen reducido un 20% por fatiga moderada",
+    "blocks": [
+        {"id": 12, "s": 4, "r": "8-12", "rpe": 7, "d": 90},
+        {"id": 3, "s": 3, "r": "10", "rpe": 8, "d": 60, "n": "Codos a 45 grados, sin rebotar."},
+        {"ej": "Plancha con toque", "m": "core", "s": 3, "r": "30s", "rpe": 6, "d": 45, "n": "Cadera estable."},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_dictionaries():
+    saved = dict(compression_dictionaries._dictionaries), compression_dictionaries.current_id
+    compression_dictionaries._dictionaries.clear()
+    compression_dictionaries.current_id = 0
+    yield
+    compression_dictionaries._dictionaries.clear()
+    compression_dictionaries._dictionaries.update(saved[0])
+    compression_dictionaries.current_id = saved[1]
+
+
+def test_round_trip_without_dictionary():
+    blob = compress_json(PLAN_DATA, count_key="blocks")
+    assert decompress_json(blob) == PLAN_DATA
+
+
+def test_round_trip_with_dictionary_and_older_rows_stay_readable():
+    old_blob = compress_json(PLAN_DATA)
+    dictionary = b'{"format":2,"f":"blocks":[{"id":"s":"r":"8-12","rpe":"d":90},"n":"ej":"m":'
+    compression_dictionaries.register(1, dictionary)
+
+    blob = compress_json(PLAN_DATA)
+    assert blob != old_blob
+    assert decompress_json(blob) == PLAN_DATA
+    assert decompress_json(old_blob) == PLAN_DATA
+
+
+def test_missing_dictionary_is_an_error():
+    compression_dictionaries.register(7, b'"blocks":[{"id":')
+    blob = compress_json(PLAN_DATA)
+    compression_dictionaries._dictionaries.clear()
+
+    with pytest.raises(LookupError):
+        decompress_json(blob)
+
+
+def test_non_compressed_value_is_rejected():
+    with pytest.raises(ValueError):
+        decompress_json(b'{"format": 2}')
+
+
+def test_lazy_value_decodes_on_first_access():
+    value = LazyJSON(compress_json(PLAN_DATA, count_key="blocks"))
+    assert not value.decoded
+    assert value.item_count == 3
+    assert plan_exercise_count(value) == 3
+    assert not value.decoded
+
+    assert value["f"] == 55
+    assert value.decoded
+    assert dict(value) == PLAN_DATA
+    assert value == PLAN_DATA
+
+
+def test_item_count_is_unknown_without_count_key():
+    assert LazyJSON(compress_json(PLAN_DATA)).item_count is None
+
+
+def test_column_type_round_trip_and_unchanged_values_are_not_recompressed():
+    column = CompressedJSON(count_key="blocks")
+    blob = column.process_bind_param(PLAN_DATA, dialect=None)
+    loaded = column.process_result_value(blob, dialect=None)
+
+    assert isinstance(loaded, LazyJSON)
+    assert loaded == PLAN_DATA
+    assert column.process_bind_param(loaded, dialect=None) is loaded.blob
+    assert column.process_bind_param(None, dialect=None) is None
+    assert column.process_result_value(None, dialect=None) is None
@@ -0,0 +1,107 @@
+"""
+Response compression: Accept-Encoding negotiation and which responses get compressed
+"""
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.middleware.compression import CompressionMiddleware, compressed_cache, negotiate_encoding
+
+SERVER_ORDER = ["br", "zstd", "gzip"]
+BODY = b'{"workout_plan": [' + b'{"ejercicio": "Sentadilla", "series": 4}, ' * 100 + b"{}]}"
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),  # Tie: server preference
+        ("br;q=0.5, gzip;q=0.9", "gzip"),  # Highest q wins
+        ("*", "br"),
+        ("*;q=0.2, gzip;q=0", "br"),
+        ("br;q=0, zstd;q=0, gzip;q=0", None),
+        ("identity", None),
+        ("GZIP ; q=0.8", "gzip"),
+        ("gzip;q=abc", None),  # Malformed weight counts as refused
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header, SERVER_ORDER) == expected
+
+
+def test_negotiate_encoding_only_offers_available_encodings():
+    assert negotiate_encoding("br, zstd", ["gzip"]) is None
+    assert negotiate_encoding("br, gzip;q=0.1", ["gzip"]) == "gzip"
+
+
+async def json_body(request):
+    return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+
+async def small_body(request):
+    return Response(b'{"ok": true}', media_type="application/json")
+
+
+async def image_body(request):
+    return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+
+async def ndjson_stream(request):
+    async def lines():
+        for _ in range(3):
+            yield b'{"type": "delta", "text": "' + b"x" * 600 + b'"}\n'
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[
+            Route("/json", json_body, methods=["GET", "POST"]),
+            Route("/small", small_body),
+            Route("/image", image_body),
+            Route("/stream", ndjson_stream),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    compressed_cache.clear()
+    return TestClient(app)
+
+
+def test_json_is_compressed_and_etag_weakened(client):
+    response = client.get("/json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == BODY  # Decoded by the client
+    assert int(response.headers["content-length"]) == len(gzip.compress(BODY, 5, mtime=0))
+
+
+@pytest.mark.parametrize("path", ["/small", "/image", "/stream"])
+def test_small_binary_and_streamed_bodies_pass_through(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_without_accept_encoding_the_body_is_sent_as_is(client):
+    response = client.get("/json", headers={"Accept-Encoding": ""})
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY
+
+
+def test_only_get_bodies_are_kept_compressed(client):
+    client.post("/json", headers={"Accept-Encoding": "gzip"})
+    assert compressed_cache.stats()["entries"] == 0
+
+    hits = compressed_cache.hits
+    client.get("/json", headers={"Accept-Encoding": "gzip"})
+    client.get("/json", headers={"Accept-Encoding": "gzip"})
+    assert compressed_cache.stats()["entries"] == 1
+    assert compressed_cache.hits == hits + 1
@@ -0,0 +1,177 @@
+"""
+LLM scheduler: weighted fair dequeueing across priority classes and deadline-aware shedding
+"""
+import asyncio
+
+import pytest
+
+from src.services.llm_scheduler import LLMOverloadedError, LLMScheduler, Priority, PriorityClassConfig
+
+
+def make_scheduler(max_concurrency=1, max_queue=100, deadline=60.0, service_time=0.001):
+    return LLMScheduler(
+        max_concurrency=max_concurrency,
+        classes={
+            Priority.INTERACTIVE: PriorityClassConfig(weight=6, max_queue=max_queue, deadline_seconds=deadline),
+            Priority.PREFETCH: PriorityClassConfig(weight=3, max_queue=max_queue, deadline_seconds=deadline),
+            Priority.BATCH: PriorityClassConfig(weight=1, max_queue=max_queue, deadline_seconds=deadline),
+        },
+        initial_service_time=service_time,
+    )
+
+
+async def hold_slot(scheduler, priority=Priority.BATCH):
+    """Occupy a slot until the returned event is set"""
+    release = asyncio.Event()
+    started = asyncio.Event()
+
+    async def _call():
+        started.set()
+        await release.wait()
+
+    task = asyncio.create_task(scheduler.run(priority, _call))
+    await started.wait()
+    return release, task
+
+
+def test_runs_immediately_when_a_slot_is_free():
+    async def scenario():
+        scheduler = make_scheduler(max_concurrency=2)
+
+        async def _call():
+            return "ok"
+
+        assert await scheduler.run(Priority.BATCH, _call) == "ok"
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_queued_classes_are_dispatched_by_weight():
+    async def scenario():
+        scheduler = make_scheduler()
+        release, blocker = await hold_slot(scheduler)
+        order = []
+
+        def record(priority):
+            async def _call():
+                order.append(priority)
+
+            return _call
+
+        tasks = [
+            asyncio.create_task(scheduler.run(priority, record(priority)))
+            for priority in (Priority.INTERACTIVE, Priority.PREFETCH, Priority.BATCH)
+            for _ in range(10)
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth() == 30
+
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+
+        # One weighted round of 6 + 3 + 1 dispatches while all classes are queued
+        first_round = order[:10]
+        assert first_round.count(Priority.INTERACTIVE) == 6
+        assert first_round.count(Priority.PREFETCH) == 3
+        assert first_round.count(Priority.BATCH) == 1
+        assert len(order) == 30
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_is_shed():
+    async def scenario():
+        scheduler = make_scheduler(max_queue=1)
+        release, blocker = await hold_slot(scheduler)
+        queued = asyncio.create_task(scheduler.run(Priority.INTERACTIVE, lambda: asyncio.sleep(0)))
+        await asyncio.sleep(0)
+
+        assert scheduler.is_saturated(Priority.INTERACTIVE)
+        with pytest.raises(LLMOverloadedError, match="queue is full"):
+            await scheduler.run(Priority.INTERACTIVE, lambda: asyncio.sleep(0))
+        assert scheduler.shed_total[Priority.INTERACTIVE] == 1
+
+        queued.cancel()
+        release.set()
+        await blocker
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+    asyncio.run(scenario())
+
+
+def test_request_that_cannot_meet_its_deadline_is_shed_on_arrival():
+    async def scenario():
+        scheduler = make_scheduler(service_time=10.0)
+        release, blocker = await hold_slot(scheduler)
+
+        with pytest.raises(LLMOverloadedError, match="exceed request deadline") as excinfo:
+            await scheduler.run(Priority.INTERACTIVE, lambda: asyncio.sleep(0), timeout=1.0)
+        assert excinfo.value.retry_after >= 1
+        assert scheduler.queue_depth() == 0
+
+        release.set()
+        await blocker
+
+    asyncio.run(scenario())
+
+
+def test_waiter_that_missed_its_deadline_while_queued_is_shed():
+    async def scenario():
+        scheduler = make_scheduler()
+        release, blocker = await hold_slot(scheduler)
+        queued = asyncio.create_task(scheduler.run(Priority.INTERACTIVE, lambda: asyncio.sleep(0), timeout=5.0))
+        await asyncio.sleep(0)
+
+        # Calls turned slow while it was queued: it can no longer finish in time
+        scheduler._service_time = 30.0
+        release.set()
+        await blocker
+
+        with pytest.raises(LLMOverloadedError, match="missed its deadline"):
+            await queued
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        scheduler = make_scheduler()
+        release, blocker = await hold_slot(scheduler)
+        queued = asyncio.create_task(scheduler.run(Priority.PREFETCH, lambda: asyncio.sleep(0)))
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth(Priority.PREFETCH) == 1
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert scheduler.queue_depth() == 0
+
+        release.set()
+        await blocker
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiter_is_shed_at_its_deadline_while_every_slot_is_busy():
+    async def scenario():
+        scheduler = make_scheduler()
+        release, blocker = await hold_slot(scheduler)
+        queued = asyncio.create_task(scheduler.run(Priority.INTERACTIVE, lambda: asyncio.sleep(0), timeout=0.05))
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth() == 1
+
+        # The slot is never freed: the deadline alone sheds the request
+        with pytest.raises(LLMOverloadedError, match="missed its deadline"):
+            await asyncio.wait_for(queued, timeout=1.0)
+        assert scheduler.queue_depth() == 0
+        assert scheduler.shed_total[Priority.INTERACTIVE] == 1
+
+        release.set()
+        await blocker
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
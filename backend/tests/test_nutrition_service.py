@@ -0,0 +1,88 @@
+"""
+Nutrition targets: Mifflin-St Jeor TDEE, macros per objective and bulk (numpy) equivalence
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.user_profile import FitnessObjective
+from src.services import nutrition_service
+from src.services.nutrition_service import calculate_targets, calculate_targets_bulk, profile_inputs
+
+
+def test_targets_for_a_known_profile():
+    targets = calculate_targets(80.0, 180.0, 30, FitnessObjective.HYPERTROPHY, 3)
+
+    # (10·80 + 6.25·180 − 5·30 − 78) × 1.55 = 2630.4; +15% for hypertrophy
+    assert targets.tdee == 2630
+    assert targets.target_calories == 3025
+    assert targets.protein_g == 152  # 1.9 g/kg
+    assert targets.fat_g == 84  # 25% of calories
+    assert targets.carbs_g == 415  # The rest
+
+
+@pytest.mark.parametrize(
+    "objective, more_than_tdee",
+    [
+        (FitnessObjective.HYPERTROPHY, True),
+        (FitnessObjective.STRENGTH, True),
+        (FitnessObjective.CUTTING, False),
+    ],
+)
+def test_objective_moves_calories_off_tdee(objective, more_than_tdee):
+    targets = calculate_targets(70.0, 170.0, 25, objective, 4)
+    assert (targets.target_calories > targets.tdee) == more_than_tdee
+
+
+def test_measured_tdee_replaces_the_formula():
+    targets = calculate_targets(80.0, 180.0, 30, FitnessObjective.RECOMPOSITION, 3, measured_tdee=2900.0)
+    assert targets.tdee == 2900
+    assert targets.target_calories == 2900
+
+
+def test_carbs_are_never_negative():
+    targets = calculate_targets(200.0, 150.0, 70, FitnessObjective.CUTTING, 0, measured_tdee=1200.0)
+    assert targets.carbs_g == 0
+
+
+def test_targets_are_memoized():
+    calculate_targets.cache_clear()
+    calculate_targets(81.0, 175.0, 40, FitnessObjective.STRENGTH, 5)
+    calculate_targets(81.0, 175.0, 40, FitnessObjective.STRENGTH, 5)
+    assert calculate_targets.cache_info().hits == 1
+
+
+def test_profile_inputs_keep_only_what_targets_depend_on():
+    profile = SimpleNamespace(
+        weight_kg=80.04,
+        height_cm=179.96,
+        age=30,
+        objective="hypertrophy",
+        training_days_per_week=3,
+        equipment_available=["barbell"],
+    )
+    assert profile_inputs(profile) == (80.0, 180.0, 30, FitnessObjective.HYPERTROPHY, 3)
+
+
+INPUTS = [
+    (weight, height, age, objective, days)
+    for weight in (55.5, 80.0, 123.4)
+    for height in (160.0, 185.5)
+    for age in (18, 47, 70)
+    for objective in FitnessObjective
+    for days in (0, 3, 7)
+]
+MEASURED = [None if index % 3 else 1800.0 + index for index in range(len(INPUTS))]
+
+
+def test_bulk_matches_scalar_targets():
+    expected = [calculate_targets(*row, measured) for row, measured in zip(INPUTS, MEASURED)]
+    assert calculate_targets_bulk(INPUTS, MEASURED) == expected
+    assert calculate_targets_bulk(INPUTS) == [calculate_targets(*row) for row in INPUTS]
+
+
+def test_bulk_without_numpy_uses_the_scalar_path(monkeypatch):
+    with_numpy = calculate_targets_bulk(INPUTS, MEASURED)
+    monkeypatch.setattr(nutrition_service, "numpy", None)
+    assert calculate_targets_bulk(INPUTS, MEASURED) == with_numpy
+    assert calculate_targets_bulk([]) == []
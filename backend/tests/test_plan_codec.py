@@ -0,0 +1,101 @@
+"""
+Plan codec: compact storage must round-trip exactly what the LLM prescribed
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.seed_exercises import EXERCISES_DATA
+from src.schemas.workout import WorkoutPlanResponse
+from src.services.exercise_catalog import exercise_catalog
+from src.services.plan_codec import compact_plan_data, expand_plan_data, plan_exercise_count
+
+
+@pytest.fixture(autouse=True)
+def seed_catalog():
+    exercise_catalog.replace(
+        [SimpleNamespace(id=index, **data) for index, data in enumerate(EXERCISES_DATA, start=1)]
+    )
+
+
+def block(ejercicio, musculo="pectoral", notas="Controla la bajada y no bloquees los codos."):
+    return {
+        "musculo": musculo,
+        "ejercicio": ejercicio,
+        "series": 3,
+        "repeticiones": "8-12",
+        "rpe_objetivo": 7,
+        "descanso_segundos": 90,
+        "notas_seguridad": notas,
+    }
+
+
+def catalog_block(name):
+    data = next(data for data in EXERCISES_DATA if data["name"] == name)
+    return block(name, data["muscle_groups"][0], data["safety_notes"])
+
+
+def make_plan(*blocks):
+    return WorkoutPlanResponse(workout_plan=list(blocks), fatiga_score_usado=55)
+
+
+def test_catalog_exercise_is_stored_as_reference():
+    plan = make_plan(*(catalog_block(data["name"]) for data in EXERCISES_DATA[:3]))
+
+    compact = compact_plan_data(plan)
+
+    assert [set(stored) for stored in compact["blocks"]] == [{"id", "s", "r", "rpe", "d"}] * 3
+    assert expand_plan_data(compact) == plan.model_dump()
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "Press Militar con Mancuernas",
+        "Press Banca con Mancuernas",
+        "Press Inclinado con Barra",
+        "Elevaciones Laterales con Cable",
+    ],
+)
+def test_near_miss_names_stay_inline(name):
+    plan = make_plan(block(name, "hombro"), *(catalog_block(data["name"]) for data in EXERCISES_DATA[:2]))
+
+    compact = compact_plan_data(plan)
+
+    assert "id" not in compact["blocks"][0]
+    assert expand_plan_data(compact) == plan.model_dump()
+
+
+def test_llm_spelling_muscle_and_notes_are_kept():
+    name = EXERCISES_DATA[0]["name"]
+    plan = make_plan(
+        block(name.upper(), "pecho mayor", "Notas propias del plan, distintas del catálogo."),
+        catalog_block(EXERCISES_DATA[1]["name"]),
+        block("Ejercicio Inventado", "core"),
+    )
+
+    compact = compact_plan_data(plan)
+
+    assert compact["blocks"][0]["id"] == 1
+    assert expand_plan_data(compact) == plan.model_dump()
+
+
+def test_plan_fields_round_trip():
+    plan = WorkoutPlanResponse(
+        workout_plan=[catalog_block(data["name"]) for data in EXERCISES_DATA[:4]],
+        disclaimer_medico="Aviso distinto del predeterminado.",
+        fatiga_score_usado=80,
+        ajuste_aplicado="Volumen reducido un 20%",
+    )
+
+    compact = compact_plan_data(plan)
+
+    assert expand_plan_data(compact) == plan.model_dump()
+    assert plan_exercise_count(compact) == 4
+
+
+def test_legacy_rows_are_returned_unchanged():
+    legacy = make_plan(*(catalog_block(data["name"]) for data in EXERCISES_DATA[:3])).model_dump()
+
+    assert expand_plan_data(legacy) is legacy
+    assert plan_exercise_count(legacy) == 3
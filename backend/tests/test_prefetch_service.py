@@ -0,0 +1,89 @@
+"""
+Prefetched plans: stored pending by the nightly job, claimed once by the next generate request
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.core.database import AsyncSessionLocal
+from src.models.llm_usage import LLMUsageRecord
+from src.models.user_profile import UserProfile
+from src.models.workout_plan import WorkoutPlan, WorkoutPlanStatus
+from src.services import prefetch_service
+from src.services.fake_llm import FakeAnthropicClient
+from src.services.prefetch_service import PrefetchService
+from src.services.workout_service import WorkoutService
+from tests.factories import create_user
+
+
+@pytest.fixture(autouse=True)
+def fake_llm(monkeypatch):
+    monkeypatch.setattr(prefetch_service.llm_service, "client", FakeAnthropicClient(latency=0))
+
+
+async def claim(user_id: int, fatigue_score: int = 50):
+    async with AsyncSessionLocal() as db:
+        profile = await db.get(UserProfile, user_id)
+        return await WorkoutService.claim_pending_plan(db, profile, fatigue_score)
+
+
+async def plan_statuses(user_id: int):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(WorkoutPlan.status).where(WorkoutPlan.user_id == user_id))
+        return result.scalars().all()
+
+
+def test_prefetched_plan_is_billed_and_claimed_once(run_db):
+    async def scenario():
+        user_id = await create_user(with_profile=True)
+        assert await PrefetchService.prefetch_for_user(user_id)
+        assert await plan_statuses(user_id) == [WorkoutPlanStatus.PENDING]
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(LLMUsageRecord).where(LLMUsageRecord.user_id == user_id))
+            records = result.scalars().all()
+        assert [(r.endpoint, r.pending) for r in records] == [("workout_prefetch", False)]
+        assert records[0].output_tokens > 0
+
+        claimed = await claim(user_id)
+        assert claimed.status == WorkoutPlanStatus.READY
+        assert await claim(user_id) is None
+
+    run_db(scenario)
+
+
+def test_plan_is_not_claimed_in_another_fatigue_band(run_db):
+    async def scenario():
+        user_id = await create_user(with_profile=True)
+        await PrefetchService.prefetch_for_user(user_id)
+
+        assert await claim(user_id, fatigue_score=90) is None
+        assert await plan_statuses(user_id) == [WorkoutPlanStatus.PENDING]
+        assert await claim(user_id, fatigue_score=45) is not None
+
+    run_db(scenario)
+
+
+def test_plan_is_not_claimed_after_a_profile_change(run_db):
+    async def scenario():
+        user_id = await create_user(with_profile=True)
+        await PrefetchService.prefetch_for_user(user_id)
+
+        async with AsyncSessionLocal() as db:
+            profile = await db.get(UserProfile, user_id)
+            profile.updated_at = datetime.utcnow() + timedelta(seconds=1)
+            await db.commit()
+
+        assert await claim(user_id) is None
+
+    run_db(scenario)
+
+
+def test_user_without_profile_is_skipped(run_db):
+    async def scenario():
+        user_id = await create_user()
+        assert not await PrefetchService.prefetch_for_user(user_id)
+        assert await plan_statuses(user_id) == []
+
+    run_db(scenario)
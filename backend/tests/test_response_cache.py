@@ -0,0 +1,78 @@
+"""
+Response cache: LRU order, byte cap and per-user invalidation
+"""
+from src.core.response_cache import ENTRY_OVERHEAD_BYTES, ResponseCache
+
+
+def entry_size(body: bytes) -> int:
+    return len(body) + ENTRY_OVERHEAD_BYTES
+
+
+def test_get_counts_hits_and_misses():
+    cache = ResponseCache(max_bytes=10_000)
+    cache.put(("plan", 1, 7), b"{}")
+
+    assert cache.get(("plan", 1, 7)) == b"{}"
+    assert cache.get(("plan", 1, 8)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    body = b"x" * 100
+    cache = ResponseCache(max_bytes=3 * entry_size(body))
+    for plan_id in (1, 2, 3):
+        cache.put(("plan", 1, plan_id), body)
+
+    cache.get(("plan", 1, 1))  # Now most recently used
+    cache.put(("plan", 1, 4), body)
+
+    assert ("plan", 1, 2) not in cache
+    assert all(("plan", 1, plan_id) in cache for plan_id in (1, 3, 4))
+    assert cache.evictions == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_byte_cap_is_kept_and_oversized_bodies_are_not_stored():
+    cache = ResponseCache(max_bytes=1000)
+    cache.put(("history", 1, 1), b"x" * 2000)
+    assert ("history", 1, 1) not in cache
+
+    for version in range(20):
+        cache.put(("history", 1, version), b"x" * 300)
+    assert cache.stats()["bytes"] <= 1000
+    assert cache.stats()["entries"] == 1000 // entry_size(b"x" * 300)
+
+
+def test_replacing_a_key_does_not_count_its_bytes_twice():
+    cache = ResponseCache(max_bytes=10_000)
+    cache.put(("profile", 1, "v1"), b"x" * 100)
+    cache.put(("profile", 1, "v1"), b"x" * 50)
+
+    assert cache.get(("profile", 1, "v1")) == b"x" * 50
+    assert cache.stats()["bytes"] == entry_size(b"x" * 50)
+
+
+def test_invalidate_drops_one_kind_of_one_user():
+    cache = ResponseCache(max_bytes=10_000)
+    cache.put(("history", 1, 3), b"a")
+    cache.put(("history", 1, 4), b"b")
+    cache.put(("history", 2, 4), b"c")
+    cache.put(("plan", 1, 9), b"d")
+
+    assert cache.invalidate("history", 1) == 2
+    assert ("history", 1, 3) not in cache and ("history", 1, 4) not in cache
+    assert ("history", 2, 4) in cache
+    assert ("plan", 1, 9) in cache
+    assert cache.stats()["bytes"] == entry_size(b"c") + entry_size(b"d")
+    assert cache.invalidate("history", 1) == 0
+
+
+def test_evicted_entries_are_not_invalidated_twice():
+    body = b"x" * 100
+    cache = ResponseCache(max_bytes=2 * entry_size(body))
+    cache.put(("history", 1, 1), body)
+    cache.put(("history", 1, 2), body)
+    cache.put(("plan", 1, 1), body)  # Evicts ("history", 1, 1)
+
+    assert cache.invalidate("history", 1) == 1
+    assert cache.stats()["bytes"] == entry_size(body)
@@ -0,0 +1,90 @@
+"""
+Exercise search: trigram scoring, exact name lookup and incremental index sync
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.seed_exercises import EXERCISES_DATA
+from src.services.exercise_catalog import ExerciseCatalog
+from src.services.search_service import MUSCLE_MATCH_FACTOR, ExerciseSearchIndex, tokenize, trigrams
+
+
+def make_catalog(exercises):
+    catalog = ExerciseCatalog()
+    catalog.replace([SimpleNamespace(id=index, **data) for index, data in exercises])
+    return catalog
+
+
+@pytest.fixture
+def catalog():
+    return make_catalog(enumerate(EXERCISES_DATA, start=1))
+
+
+@pytest.fixture
+def index(catalog):
+    index = ExerciseSearchIndex()
+    index.sync(catalog.entries, catalog.version)
+    return index
+
+
+def names(results):
+    return [entry.name for entry, _ in results]
+
+
+def test_tokenize_drops_accents_case_and_connectors():
+    assert tokenize("Curl de Bíceps con Barra") == ["curl", "biceps", "barra"]
+
+
+def test_trigrams_are_padded_like_pg_trgm():
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+    assert trigrams("de la") == set()
+
+
+def test_typos_and_missing_accents_still_match(index):
+    assert names(index.search("sentadila"))[0] == "Sentadilla con Barra (Back Squat)"
+    assert names(index.search("extension triceps"))[0] == "Extensión de Tríceps en Polea Alta"
+
+
+def test_name_matches_rank_above_muscle_matches(index):
+    results = index.search("press banca")
+    assert names(results)[0] == "Press Banca con Barra"
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+    # "gluteo" only appears in muscle groups
+    muscle_only = index.search("gluteo")
+    assert muscle_only
+    assert all(score <= MUSCLE_MATCH_FACTOR for _, score in muscle_only)
+
+
+def test_limit_and_empty_queries(index):
+    assert len(index.search("remo", limit=2)) == 2
+    assert index.search("") == []
+    assert index.search("con de la") == []
+
+
+def test_lookup_is_exact_apart_from_case_and_accents(index):
+    assert index.lookup("curl de biceps con barra").name == "Curl de Bíceps con Barra"
+    assert index.lookup("Curl de Bíceps") is None
+    assert index.lookup("Sentadila con Barra (Back Squat)") is None
+
+
+def test_sync_is_a_no_op_for_an_indexed_version(index, catalog):
+    assert index.sync(catalog.entries, catalog.version) == 0
+
+
+def test_sync_reindexes_only_changed_exercises(index):
+    exercises = list(enumerate(EXERCISES_DATA, start=1))
+    renamed = dict(exercises[0][1], name="Press de Banca Plano")
+    updated = make_catalog([(1, renamed)] + exercises[1:-1])  # Renamed first, dropped last
+
+    # Renamed: removed and re-added; dropped: removed
+    assert index.sync(updated.entries, updated.version) == 3
+    assert index.lookup("Press Banca con Barra") is None
+    assert index.lookup("press de banca plano").id == 1
+    assert "Mountain Climbers" not in names(index.search("mountain climbers"))
+
+    fresh = ExerciseSearchIndex()
+    fresh.sync(updated.entries, updated.version)
+    for query in ("banca", "remo", "curl biceps", "abdominal"):
+        assert index.search(query) == fresh.search(query)
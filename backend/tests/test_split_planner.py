@@ -0,0 +1,110 @@
+"""
+Split planner: weekly split choice, per-day set budgets and weekly volume caps
+"""
+import pytest
+
+from src.models.user_profile import ExperienceLevel
+from src.schemas.workout import WorkoutPlanResponse
+from src.services.split_planner import (
+    DAY_FOCUS,
+    WEEKLY_SET_CAPS,
+    balance_weekly_volume,
+    muscle_region,
+    plan_weekly_split,
+    weekly_volume,
+)
+
+
+def make_plan(*blocks):
+    """Day plan from (musculo, series) pairs"""
+    return WorkoutPlanResponse(
+        workout_plan=[
+            {
+                "musculo": musculo,
+                "ejercicio": f"Ejercicio {index}",
+                "series": series,
+                "repeticiones": "8-12",
+                "rpe_objetivo": 7,
+                "descanso_segundos": 90,
+                "notas_seguridad": "Controla la técnica en todo el recorrido.",
+            }
+            for index, (musculo, series) in enumerate(blocks)
+        ],
+        fatiga_score_usado=50,
+    )
+
+
+@pytest.mark.parametrize(
+    "muscle, region",
+    [
+        ("Pectoral mayor", "pecho"),
+        ("Glúteos", "piernas"),
+        ("TRÍCEPS", "brazos"),
+        ("Deltoides anterior", "hombros"),
+        ("Erectores espinales", "espalda"),
+        ("Oblicuos", "core"),
+        ("Cardio", "otros"),
+    ],
+)
+def test_muscle_region(muscle, region):
+    assert muscle_region(muscle) == region
+
+
+def test_beginners_stay_on_full_body_up_to_three_days():
+    split = plan_weekly_split(3, ExperienceLevel.BEGINNER)
+    assert [day.focus for day in split] == ["full_body"] * 3
+
+    split = plan_weekly_split(3, ExperienceLevel.INTERMEDIATE)
+    assert [day.focus for day in split] == ["push", "pull", "legs"]
+
+
+def test_training_days_are_clamped():
+    assert len(plan_weekly_split(0, ExperienceLevel.ADVANCED)) == 1
+    assert len(plan_weekly_split(12, ExperienceLevel.ADVANCED)) == 7
+
+
+def test_set_budget_is_the_cap_shared_by_the_days_training_a_region():
+    split = plan_weekly_split(4, ExperienceLevel.INTERMEDIATE)
+    assert [day.focus for day in split] == ["upper", "lower", "upper", "lower"]
+    assert [day.day_index for day in split] == [0, 1, 2, 3]
+    # Every region is trained twice a week: 16 sets / 2 days
+    assert all(day.set_budget == 8 for day in split)
+
+
+@pytest.mark.parametrize("level", list(ExperienceLevel))
+@pytest.mark.parametrize("days", range(1, 8))
+def test_day_budgets_never_exceed_the_weekly_cap(days, level):
+    split = plan_weekly_split(days, level)
+    for region in {region for focus in DAY_FOCUS.values() for region in focus}:
+        planned = sum(day.set_budget for day in split if region in day.regions)
+        assert planned <= WEEKLY_SET_CAPS[level]
+
+
+def test_weekly_volume_sums_sets_per_region():
+    plans = [
+        make_plan(("Pectoral", 4), ("Bíceps", 3), ("Cardio", 1)),
+        make_plan(("Pecho superior", 3), ("Cuádriceps", 5), ("Cardio", 1)),
+    ]
+    assert weekly_volume(plans) == {"pecho": 7, "brazos": 3, "piernas": 5, "otros": 2}
+
+
+def test_balance_trims_the_largest_blocks_down_to_the_cap():
+    plans = [
+        make_plan(("Pectoral", 6), ("Pectoral", 3), ("Cardio", 1)),
+        make_plan(("Pectoral", 5), ("Cardio", 10), ("Cardio", 1)),
+    ]
+    volume = balance_weekly_volume(plans, ExperienceLevel.BEGINNER)
+
+    assert volume["pecho"] == WEEKLY_SET_CAPS[ExperienceLevel.BEGINNER]
+    assert [block.series for block in plans[0].workout_plan[:2]] == [3, 3]
+    assert plans[1].workout_plan[0].series == 4
+    # Unmapped muscles are never trimmed
+    assert plans[1].workout_plan[1].series == 10
+
+
+def test_balance_keeps_at_least_one_set_per_block():
+    plans = [make_plan(*[("Pectoral", 1)] * 12)]
+    volume = balance_weekly_volume(plans, ExperienceLevel.BEGINNER)
+
+    assert volume["pecho"] == 12
+    assert all(block.series == 1 for block in plans[0].workout_plan)
@@ -0,0 +1,32 @@
+"""
+Template pre-generation: one template per bucket and fatigue band, usage recorded as system usage
+"""
+from sqlalchemy import select
+
+from src.core.database import AsyncSessionLocal
+from src.models.llm_usage import LLMUsageRecord
+from src.models.workout_template import WorkoutTemplate
+from src.services import template_service
+from src.services.fake_llm import FakeAnthropicClient
+from src.services.template_service import BAND_REFERENCE_SCORES, TEMPLATE_ENDPOINT, TemplateService
+from tests.factories import create_user
+
+
+def test_template_generation_tokens_are_recorded(run_db, monkeypatch):
+    monkeypatch.setattr(template_service.llm_service, "client", FakeAnthropicClient(latency=0))
+
+    async def scenario():
+        await create_user(with_profile=True)
+        stats = await TemplateService.generate_templates()
+        assert stats == {"buckets": 1, "generated": len(BAND_REFERENCE_SCORES), "failed": 0}
+
+        async with AsyncSessionLocal() as db:
+            templates = (await db.execute(select(WorkoutTemplate))).scalars().all()
+            records = (await db.execute(select(LLMUsageRecord))).scalars().all()
+
+        assert len(templates) == len(BAND_REFERENCE_SCORES)
+        assert {(r.user_id, r.endpoint) for r in records} == {(None, TEMPLATE_ENDPOINT)}
+        assert len(records) == len(templates)
+        assert all(r.output_tokens > 0 for r in records)
+
+    run_db(scenario)
@@ -0,0 +1,110 @@
+"""
+Usage accounting: budget holds under reserve/settle/release and billing of unusable plans
+"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.models.llm_usage import LLMUsageRecord
+from src.services import workout_service
+from src.services.llm_service import InvalidPlanError
+from src.services.usage_service import BudgetExceededError, LLMUsage, UsageService
+from src.services.workout_service import WorkoutService
+from tests.factories import create_user
+
+
+async def usage_records(user_id: int):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(LLMUsageRecord).where(LLMUsageRecord.user_id == user_id).order_by(LLMUsageRecord.id)
+        )
+        return result.scalars().all()
+
+
+@pytest.fixture
+def generation_limit(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_DAILY_GENERATION_LIMIT", 3)
+
+
+def test_reserved_calls_count_until_released(run_db, generation_limit):
+    async def scenario():
+        user_id = await create_user()
+        reservation = await UsageService.reserve(user_id, "workout_weekly", calls=2)
+        assert len(reservation.record_ids) == 2
+
+        # Held calls count against the limit before any of them is settled
+        with pytest.raises(BudgetExceededError) as excinfo:
+            await UsageService.reserve(user_id, "workout_generate", calls=2)
+        assert excinfo.value.retry_after > 0
+
+        async with AsyncSessionLocal() as db:
+            await UsageService.settle(db, reservation, LLMUsage("model", 100, 200, 50))
+            await db.commit()
+        await UsageService.release(reservation)
+
+        records = await usage_records(user_id)
+        assert [(r.pending, r.input_tokens, r.output_tokens) for r in records] == [(False, 100, 200)]
+        assert reservation.record_ids == []
+
+        # The released call is available again
+        await UsageService.release(await UsageService.reserve(user_id, "workout_generate", calls=2))
+        async with AsyncSessionLocal() as db:
+            summary = await UsageService.get_usage_summary(db, user_id)
+        assert (summary.generations_used, summary.input_tokens, summary.output_tokens) == (1, 100, 200)
+
+    run_db(scenario)
+
+
+def test_settling_more_calls_than_reserved_records_them_all(run_db):
+    async def scenario():
+        user_id = await create_user()
+        reservation = await UsageService.reserve(user_id, "workout_generate")
+        async with AsyncSessionLocal() as db:
+            await UsageService.settle(db, reservation, LLMUsage("model", 10, 20))
+            await UsageService.settle(db, reservation, LLMUsage("model", 30, 40))  # Retry
+            await db.commit()
+        await UsageService.release(reservation)
+
+        records = await usage_records(user_id)
+        assert [(r.pending, r.input_tokens) for r in records] == [(False, 10), (False, 30)]
+
+    run_db(scenario)
+
+
+def test_chat_messages_have_their_own_limit(run_db, generation_limit, monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_DAILY_MESSAGE_LIMIT", 1)
+
+    async def scenario():
+        user_id = await create_user()
+        await UsageService.reserve(user_id, "workout_weekly", calls=3)
+
+        chat = await UsageService.reserve(user_id, "chat")
+        with pytest.raises(BudgetExceededError, match="chat"):
+            await UsageService.reserve(user_id, "chat")
+        await UsageService.release(chat)
+
+    run_db(scenario)
+
+
+def test_unusable_plan_is_billed(run_db, monkeypatch):
+    usage = LLMUsage("model", 1500, 700)
+
+    async def malformed_plan(**kwargs):
+        raise InvalidPlanError("Invalid plan returned by Claude", usage)
+
+    monkeypatch.setattr(workout_service.llm_service, "call_anthropic_claude", malformed_plan)
+
+    async def scenario():
+        user_id = await create_user(with_profile=True)
+        user = SimpleNamespace(id=user_id)
+        async with AsyncSessionLocal() as db:
+            with pytest.raises(InvalidPlanError):
+                await WorkoutService.generate_workout_plan(db, user, SimpleNamespace(fatigue_score=50))
+
+        records = await usage_records(user_id)
+        assert [(r.pending, r.input_tokens, r.output_tokens) for r in records] == [(False, 1500, 700)]
+
+    run_db(scenario)
@@ -0,0 +1,66 @@
+"""
+Weekly plans: day prompts share one cached prefix, days are generated and stored together
+"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from src.core.database import AsyncSessionLocal
+from src.models.llm_usage import LLMUsageRecord
+from src.models.user_profile import UserProfile
+from src.services import workout_service
+from src.services.fake_llm import FakeAnthropicClient
+from src.services.split_planner import plan_weekly_split
+from src.services.workout_service import WorkoutService
+from tests.factories import create_user
+
+
+class RecordingMessages:
+    """Fake messages API keeping the arguments of every call"""
+
+    def __init__(self):
+        self.fake = FakeAnthropicClient(latency=0).messages
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return await self.fake.create(**kwargs)
+
+
+@pytest.fixture
+def messages(monkeypatch):
+    recording = RecordingMessages()
+    monkeypatch.setattr(workout_service.llm_service, "client", SimpleNamespace(messages=recording))
+    return recording
+
+
+def test_day_prompts_share_the_system_prefix_and_differ_after_it(run_db, messages):
+    async def scenario():
+        user_id = await create_user(with_profile=True)
+        async with AsyncSessionLocal() as db:
+            profile = await db.get(UserProfile, user_id)
+            weekly_plan = await WorkoutService.generate_weekly_plan(
+                db, SimpleNamespace(id=user_id), SimpleNamespace(fatigue_score=50)
+            )
+
+            result = await db.execute(select(LLMUsageRecord).where(LLMUsageRecord.user_id == user_id))
+            records = result.scalars().all()
+
+        split = plan_weekly_split(profile.training_days_per_week, profile.experience_level)
+        assert len(weekly_plan.day_plans) == len(split) == len(messages.calls)
+        assert [(r.endpoint, r.pending) for r in records] == [("workout_weekly", False)] * len(split)
+
+        systems = [call["system"] for call in messages.calls]
+        assert all(system == systems[0] for system in systems)
+        assert systems[0][0]["cache_control"] == {"type": "ephemeral"}
+        assert "**BIBLIOTECA DE EJERCICIOS DISPONIBLES:**" in systems[0][0]["text"]
+
+        # Only the day-specific part is sent after the prefix
+        prompts = sorted(call["messages"][0]["content"] for call in messages.calls)
+        assert len(set(prompts)) == len(split)
+        assert all(prompt.startswith("Genera la sesión") for prompt in prompts)
+        assert all("BIBLIOTECA" not in prompt for prompt in prompts)
+
+    run_db(scenario)
+
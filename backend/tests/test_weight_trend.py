@@ -0,0 +1,122 @@
+"""
+Weight trend: O(1) point updates, fit, adaptive TDEE and bulk (numpy) equivalence
+"""
+import random
+
+import pytest
+
+from src.core.config import settings
+from src.services import weight_trend
+from src.services.weight_trend import STAT_FIELDS, adaptive_tdee, add_point, empty_trend, fit, fit_all
+
+START_DAY = 738000  # date.toordinal() around 2021
+
+
+def linear_series(days=30, start_kg=80.0, kg_per_day=-0.05, intake=2500):
+    return [(START_DAY + i, start_kg + kg_per_day * i, intake) for i in range(days)]
+
+
+def build(series):
+    trend = empty_trend(series[0][0])
+    for day, weight_kg, intake_kcal in series:
+        add_point(trend, day, weight_kg, intake_kcal)
+    return trend
+
+
+def assert_same_state(a, b):
+    assert (a.first_day, a.last_day, a.points) == (b.first_day, b.last_day, b.points)
+    for field in STAT_FIELDS:
+        assert getattr(a, field) == pytest.approx(getattr(b, field), rel=1e-9, abs=1e-9)
+
+
+def test_fit_recovers_a_linear_trend():
+    level, slope, mean_intake = fit(build(linear_series()))
+
+    assert slope == pytest.approx(-0.05)
+    assert level == pytest.approx(80.0 - 0.05 * 29)
+    assert mean_intake == pytest.approx(2500)
+
+
+def test_point_order_does_not_matter():
+    series = linear_series()
+    shuffled = series[:]
+    random.Random(4).shuffle(shuffled)
+
+    trend = empty_trend(shuffled[0][0])
+    for day, weight_kg, intake_kcal in shuffled:
+        add_point(trend, day, weight_kg, intake_kcal)
+    assert_same_state(trend, build(series))
+
+
+def test_removing_a_point_undoes_adding_it():
+    series = linear_series()
+    trend = build(series)
+    day, weight_kg, intake_kcal = series[10]
+
+    add_point(trend, day, weight_kg, intake_kcal, sign=-1)
+    add_point(trend, day, weight_kg + 1.5, intake_kcal)  # Day re-logged
+    expected = build(series[:10] + [(day, weight_kg + 1.5, intake_kcal)] + series[11:])
+    assert_same_state(trend, expected)
+
+
+def test_short_series_has_no_fit():
+    assert fit(build(linear_series(days=settings.ADAPTIVE_TDEE_MIN_POINTS - 1))) is None
+    # Enough points, too short a span
+    assert fit(build(linear_series(days=settings.ADAPTIVE_TDEE_MIN_DAYS))) is None
+
+
+def test_adaptive_tdee_from_energy_balance():
+    trend = build(linear_series(days=2 * settings.ADAPTIVE_TDEE_MIN_DAYS + 1))
+    # Losing 0.05 kg/day on 2500 kcal: spending 2500 + 0.05 × 7700
+    assert adaptive_tdee(trend, formula_tdee=2700) == pytest.approx(2885)
+
+
+def test_adaptive_tdee_is_clamped_and_phased_in():
+    full = build(linear_series(days=2 * settings.ADAPTIVE_TDEE_MIN_DAYS + 1, kg_per_day=-0.2))
+    limit = 1 + settings.ADAPTIVE_TDEE_MAX_ADJUSTMENT
+    assert adaptive_tdee(full, formula_tdee=2000) == pytest.approx(2000 * limit)
+
+    # Span of exactly MIN_DAYS: half way between formula and observed
+    half = build(linear_series(days=settings.ADAPTIVE_TDEE_MIN_DAYS + 1))
+    assert adaptive_tdee(half, formula_tdee=2700) == pytest.approx(2700 + 0.5 * (2885 - 2700))
+
+
+def test_adaptive_tdee_can_be_disabled(monkeypatch):
+    trend = build(linear_series())
+    monkeypatch.setattr(settings, "ADAPTIVE_TDEE_ENABLED", False)
+    assert adaptive_tdee(trend, formula_tdee=2700) is None
+    assert adaptive_tdee(None, formula_tdee=2700) is None
+
+
+def columns():
+    rows = []
+    for user_id, kg_per_day in ((3, -0.05), (8, 0.02), (11, 0.0)):
+        series = linear_series(kg_per_day=kg_per_day)
+        rows += [(user_id, day, weight_kg, intake) for day, weight_kg, intake in series]
+    rows.append((12, START_DAY, 70.0, 2200))  # Single point
+    return [list(column) for column in zip(*rows)]
+
+
+def test_fit_all_matches_incremental_updates():
+    user_ids, days, weights, intakes = columns()
+    states = fit_all(user_ids, days, weights, intakes)
+
+    assert [state["user_id"] for state in states] == [3, 8, 11, 12]
+    for state in states:
+        series = [(d, w, i) for u, d, w, i in zip(user_ids, days, weights, intakes) if u == state["user_id"]]
+        expected = build(series)
+        assert_same_state(type("State", (), state), expected)
+
+
+def test_fit_all_without_numpy(monkeypatch):
+    user_ids, days, weights, intakes = columns()
+    with_numpy = fit_all(user_ids, days, weights, intakes)
+    monkeypatch.setattr(weight_trend, "numpy", None)
+    without = fit_all(user_ids, days, weights, intakes)
+
+    assert [state["user_id"] for state in without] == [3, 8, 11, 12]
+    for a, b in zip(with_numpy, without):
+        assert (a["first_day"], a["last_day"], a["points"]) == (b["first_day"], b["last_day"], b["points"])
+        for field in STAT_FIELDS:
+            assert a[field] == pytest.approx(b[field], rel=1e-9, abs=1e-9)
+    assert fit_all([], [], [], []) == []